@@ -4,22 +4,46 @@ Licensed under the MIT License with Commons Clause.
 See the LICENSE file for details.
 """
 
+import time
+
+# Referencia del informe de arranque (--tiempos-inicio): incluye importar pygame
+_INICIO = time.perf_counter()
+
+import argparse
 import pygame
 import os
-import random
-import time
 import sys
-import tkinter as tk
-from tkinter import filedialog
-from tkinter import simpledialog
 import math
 import json
+from collections import OrderedDict
+
+from explorador import ListadoDirectorio, TareaFondo, directorio_padre
+from grabacion import DIRECTORIO_GRABACIONES, GrabadorSesion, ReproductorSesion
+from indice_imagenes import IndiceImagenes, ListaRutas
+from miniaturas import CacheMiniaturas
+from motor import NIVELES_TOTALES, PASO_SIMULACION, Sesion, calcular_parametros_nivel
+from animacion import AnimacionRecompensa
+from estadisticas import guardar_sesion as guardar_estadisticas
+from precarga import PrecargadorImagenes, liberar_recompensa
+from puntajes import ARCHIVO_PUNTAJES, EscritorPuntajes, TablaPuntajes, guardar_fusionado, leer_puntajes
+from retroceso import BibliotecaPatrones
+from telemetria import RUTA_PREDETERMINADA as RUTA_TELEMETRIA, PublicadorTelemetria
+from rendimiento import FASES, CapturaPerfil, MedidorFrames, TiemposInicio
+from vista import ALTO_LOGICO, ANCHO_LOGICO, Vista
+
+
+MODOS_FPS = ("limitado", "vsync", "ilimitado")
 
 
 def solicitar_nombre_usuario():
     """
-    Abre un diálogo para pedir el nombre de usuario.
+    Abre un diálogo nativo de Tk para pedir el nombre de usuario.
+    Solo se usa con "dialogos_nativos" en config.json; por defecto el nombre
+    se pide dentro de la ventana del juego (pedir_nombre_usuario).
     """
+    import tkinter as tk
+    from tkinter import simpledialog
+
     root = tk.Tk()
     root.withdraw()
     nombre = simpledialog.askstring("Nombre de Usuario", "Ingrese su nombre de usuario:", parent=root)
@@ -34,26 +58,37 @@ def solicitar_nombre_usuario():
 def cargar_puntajes():
     """
     Carga los puntajes desde el archivo score.json.
-    Si el archivo no existe, crea uno nuevo.
+    Si el archivo no existe, devuelve un diccionario vacío.
     """
     try:
-        if os.path.exists("score.json"):
-            with open("score.json", "r") as f:
-                return json.load(f)
-        else:
-            return {}
+        return leer_puntajes(ARCHIVO_PUNTAJES)
     except Exception as e:
         print(f"Error al cargar puntajes: {e}")
         return {}
 
 
+def cargar_config():
+    """
+    Carga la configuración desde el archivo config.json.
+    Si no existe o no se puede leer, devuelve un diccionario vacío.
+    """
+    try:
+        if os.path.exists("config.json"):
+            with open("config.json", "r") as f:
+                return json.load(f)
+    except Exception as e:
+        print(f"Error al cargar config.json: {e}")
+    return {}
+
+
 def guardar_puntajes(puntajes):
     """
-    Guarda los puntajes en el archivo score.json.
+    Guarda los puntajes en el archivo score.json, fusionándolos con los de
+    otras instancias y con reemplazo atómico. Es síncrono: dentro del bucle
+    del juego se usa EscritorPuntajes.
     """
     try:
-        with open("score.json", "w") as f:
-            json.dump(puntajes, f, indent=4)
+        guardar_fusionado(puntajes, ARCHIVO_PUNTAJES)
     except Exception as e:
         print(f"Error al guardar puntajes: {e}")
 
@@ -71,11 +106,28 @@ def obtener_mejores_puntajes(puntajes, limite=10):
     return lista_puntajes[:limite]
 
 
+def clasificacion_actual(tabla_puntajes, cliente_puntajes, nombre_usuario):
+    """
+    Devuelve (mejores, (posición, total)): la clasificación global si hay
+    conexión con el servicio de puntajes y, si no, la de score.json.
+    """
+    if cliente_puntajes is not None:
+        clasificacion = cliente_puntajes.clasificacion()
+        if clasificacion is not None:
+            return clasificacion
+    return tabla_puntajes.mejores(), (tabla_puntajes.posicion(nombre_usuario), len(tabla_puntajes))
+
+
 def seleccionar_directorio():
     """
     Lanza el cuadro de diálogo del sistema para seleccionar un directorio.
     Devuelve la ruta seleccionada o una cadena vacía si se cancela.
+    Bloquea el bucle del juego mientras está abierto, por eso solo se usa con
+    "dialogos_nativos" en config.json (por defecto, ExploradorDirectorios).
     """
+    import tkinter as tk
+    from tkinter import filedialog
+
     root = tk.Tk()
     root.withdraw()
     directorio = filedialog.askdirectory(title="Seleccione el directorio de imágenes")
@@ -85,24 +137,139 @@ def seleccionar_directorio():
 
 def cargar_imagenes(directorio):
     """
-    Carga todas las imágenes válidas desde el directorio especificado.
-    Devuelve una lista con las rutas completas de las imágenes.
+    Carga todas las imágenes válidas desde el directorio especificado y sus subdirectorios.
+    Usa un índice persistente en disco: tras el primer escaneo solo se vuelven a
+    listar los subdirectorios que cambiaron. Devuelve una ListaRutas compacta
+    con las rutas completas de las imágenes.
     """
-    imagenes = []
     if not os.path.exists(directorio):
         print(f"El directorio {directorio} no existe.")
-        return imagenes
-    
-    extensiones_validas = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
-    for archivo in os.listdir(directorio):
-        if archivo.lower().endswith(extensiones_validas):
-            ruta_completa = os.path.join(directorio, archivo)
-            if os.path.isfile(ruta_completa):
-                imagenes.append(ruta_completa)
+        return ListaRutas()
     
+    indice = IndiceImagenes(directorio)
+    imagenes = indice.actualizar()
+    print(f"Imágenes indexadas: {len(imagenes)} "
+          f"({indice.escaneados} directorios escaneados, {indice.reutilizados} sin cambios)")
     return imagenes
 
 
+# Registro compartido de fuentes: cada combinación (nombre, tamaño, negrita)
+# se crea una sola vez.
+_fuentes = {}
+
+# Archivos de fuente ya resueltos. Buscar una fuente del sistema recorre todas
+# las instaladas (fc-list en Linux), así que el resultado se guarda en disco y
+# los arranques siguientes abren el archivo directamente.
+ARCHIVO_FUENTES = os.path.join("cache", "fuentes.json")
+_rutas_fuentes = None
+
+
+def resolver_fuente(nombre, bold=False):
+    """
+    Devuelve (ruta del archivo, emular_negrita) para una fuente del sistema.
+    La ruta es None si no se encuentra (se usa la fuente por defecto de pygame);
+    emular_negrita indica que no hay variante negrita y pygame debe simularla.
+    """
+    global _rutas_fuentes
+    if _rutas_fuentes is None:
+        try:
+            with open(ARCHIVO_FUENTES, "r") as f:
+                _rutas_fuentes = json.load(f)
+        except (OSError, ValueError):
+            _rutas_fuentes = {}
+
+    clave = f"{nombre}|{int(bool(bold))}"
+    resuelta = _rutas_fuentes.get(clave)
+    if resuelta is not None and (resuelta[0] is None or os.path.exists(resuelta[0])):
+        return resuelta[0], resuelta[1]
+
+    ruta = pygame.font.match_font(nombre, bold=bold)
+    emular_negrita = bool(bold) and (ruta is None or ruta == pygame.font.match_font(nombre))
+    _rutas_fuentes[clave] = [ruta, emular_negrita]
+    try:
+        os.makedirs(os.path.dirname(ARCHIVO_FUENTES), exist_ok=True)
+        with open(ARCHIVO_FUENTES, "w") as f:
+            json.dump(_rutas_fuentes, f)
+    except OSError as e:
+        print(f"No se pudo guardar {ARCHIVO_FUENTES}: {e}")
+    return ruta, emular_negrita
+
+
+def obtener_fuente(nombre="Arial", tamano=24, bold=False):
+    """
+    Devuelve la fuente solicitada, creándola solo la primera vez.
+    """
+    clave = (nombre, tamano, bold)
+    fuente = _fuentes.get(clave)
+    if fuente is None:
+        ruta, emular_negrita = resolver_fuente(nombre, bold)
+        fuente = pygame.font.Font(ruta, tamano)
+        if emular_negrita:
+            fuente.set_bold(True)
+        _fuentes[clave] = fuente
+    return fuente
+
+
+class CacheTexto:
+    """
+    Caché LRU acotada de superficies de texto ya renderizadas.
+    La clave es (fuente, texto, color); cuenta aciertos y fallos.
+    """
+
+    def __init__(self, capacidad=512):
+        self.capacidad = capacidad
+        self.aciertos = 0
+        self.fallos = 0
+        self._superficies = OrderedDict()
+
+    def render(self, fuente, texto, color):
+        """
+        Devuelve la superficie del texto, renderizándola solo si no está en caché.
+        """
+        clave = (fuente, texto, tuple(color))
+        superficie = self._superficies.get(clave)
+        if superficie is not None:
+            self._superficies.move_to_end(clave)
+            self.aciertos += 1
+            return superficie
+
+        self.fallos += 1
+        superficie = fuente.render(texto, True, color)
+        self._superficies[clave] = superficie
+        if len(self._superficies) > self.capacidad:
+            self._superficies.popitem(last=False)
+        return superficie
+
+    def limpiar(self):
+        """
+        Vacía la caché (por ejemplo, al cambiar de resolución).
+        """
+        self._superficies.clear()
+
+    def estadisticas(self):
+        """
+        Devuelve un diccionario con el tamaño actual, aciertos, fallos y tasa de aciertos.
+        """
+        total = self.aciertos + self.fallos
+        return {
+            "entradas": len(self._superficies),
+            "capacidad": self.capacidad,
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / total if total else 0.0,
+        }
+
+
+cache_texto = CacheTexto()
+
+
+def renderizar_texto(fuente, texto, color):
+    """
+    Renderiza texto con antialiasing a través de la caché compartida.
+    """
+    return cache_texto.render(fuente, texto, color)
+
+
 def dibujar_botones(screen, fuente, btn_change_rect, btn_skip_rect):
     """
     Dibuja los botones en la pantalla.
@@ -110,8 +277,8 @@ def dibujar_botones(screen, fuente, btn_change_rect, btn_skip_rect):
     pygame.draw.rect(screen, (80, 80, 80), btn_change_rect)
     pygame.draw.rect(screen, (80, 80, 80), btn_skip_rect)
     
-    texto_btn1 = fuente.render("Cambiar Directorio", True, (255, 255, 255))
-    texto_btn2 = fuente.render("Saltar Nivel", True, (255, 255, 255))
+    texto_btn1 = renderizar_texto(fuente, "Cambiar Directorio", (255, 255, 255))
+    texto_btn2 = renderizar_texto(fuente, "Saltar Nivel", (255, 255, 255))
     
     screen.blit(texto_btn1, (
         btn_change_rect.x + btn_change_rect.width//2 - texto_btn1.get_width()//2,
@@ -123,51 +290,62 @@ def dibujar_botones(screen, fuente, btn_change_rect, btn_skip_rect):
     ))
 
 
-def dibujar_ayuda(screen, fuente, width, height):
+def dibujar_ayuda(screen, fuente, vista):
     """
     Dibuja el texto de ayuda en la parte inferior de la pantalla.
     """
     ayuda_text = "Presione F12 para liberar/capturar el mouse"
-    texto_ayuda = fuente.render(ayuda_text, True, (255, 255, 255))
+    texto_ayuda = renderizar_texto(fuente, ayuda_text, (255, 255, 255))
     screen.blit(
         texto_ayuda,
-        (width//2 - texto_ayuda.get_width()//2, height - 70)
+        (vista.x(ANCHO_LOGICO / 2) - texto_ayuda.get_width()//2, vista.y(ALTO_LOGICO - 70))
     )
 
 
-def dibujar_puntaje(screen, fuente, puntaje, max_puntaje, nombre_usuario, width, mejores_puntajes):
+def dibujar_puntaje(screen, fuente, puntaje, max_puntaje, nombre_usuario, vista, mejores_puntajes, posicion=None):
     """
     Dibuja el puntaje actual, el mejor puntaje y la tabla de mejores puntajes en la parte derecha del canvas.
+    posicion es opcional: (puesto del usuario, total de usuarios).
     """
     # Fuente para los puntajes
-    fuente_puntaje = pygame.font.SysFont("Arial", 16)
-    fuente_titulo = pygame.font.SysFont("Arial", 18, bold=True)
+    fuente_puntaje = obtener_fuente("Arial", vista.fuente(16))
+    fuente_titulo = obtener_fuente("Arial", vista.fuente(18), bold=True)
+
+    # Columnas de la tabla en píxeles: borde derecho, ranking y nombre
+    derecha = vista.x(ANCHO_LOGICO - 20)
+    x_ranking = vista.x(ANCHO_LOGICO - 180)
+    x_nombre = vista.x(ANCHO_LOGICO - 160)
     
     # Dibujar puntaje actual
-    texto_puntaje = fuente_puntaje.render(f"Puntaje: {puntaje}", True, (255, 255, 255))
-    screen.blit(texto_puntaje, (width - texto_puntaje.get_width() - 20, 60))
+    texto_puntaje = renderizar_texto(fuente_puntaje, f"Puntaje: {puntaje}", (255, 255, 255))
+    screen.blit(texto_puntaje, (derecha - texto_puntaje.get_width(), vista.y(60)))
     
     # Dibujar mejor puntaje del usuario actual
-    texto_max = fuente_puntaje.render(f"Tu mejor: {max_puntaje}", True, (255, 255, 255))
-    screen.blit(texto_max, (width - texto_max.get_width() - 20, 80))
+    texto_max = renderizar_texto(fuente_puntaje, f"Tu mejor: {max_puntaje}", (255, 255, 255))
+    screen.blit(texto_max, (derecha - texto_max.get_width(), vista.y(80)))
     
     # Dibujar nombre de usuario actual
-    texto_usuario = fuente_puntaje.render(f"Usuario: {nombre_usuario}", True, (255, 255, 255))
-    screen.blit(texto_usuario, (width - texto_usuario.get_width() - 20, 100))
+    texto_usuario = renderizar_texto(fuente_puntaje, f"Usuario: {nombre_usuario}", (255, 255, 255))
+    screen.blit(texto_usuario, (derecha - texto_usuario.get_width(), vista.y(100)))
+
+    # Dibujar posición del usuario actual en la clasificación
+    if posicion is not None and posicion[0] is not None:
+        texto_posicion = renderizar_texto(fuente_puntaje, f"Posición: {posicion[0]} de {posicion[1]}", (255, 255, 255))
+        screen.blit(texto_posicion, (derecha - texto_posicion.get_width(), vista.y(120)))
     
     # Dibujar tabla de mejores puntajes (estilo arcade)
     y_pos = 140
     
     # Título de la tabla
-    texto_titulo = fuente_titulo.render("HIGH SCORES", True, (255, 255, 0))
-    screen.blit(texto_titulo, (width - texto_titulo.get_width() - 20, y_pos))
+    texto_titulo = renderizar_texto(fuente_titulo, "HIGH SCORES", (255, 255, 0))
+    screen.blit(texto_titulo, (derecha - texto_titulo.get_width(), vista.y(y_pos)))
     y_pos += 25
     
     # Línea separadora
     pygame.draw.line(screen, (150, 150, 150), 
-                    (width - 180, y_pos), 
-                    (width - 20, y_pos), 
-                    1)
+                    (x_ranking, vista.y(y_pos)), 
+                    (derecha, vista.y(y_pos)), 
+                    max(1, round(vista.factor)))
     y_pos += 10
     
     # Listar los mejores puntajes
@@ -179,82 +357,823 @@ def dibujar_puntaje(screen, fuente, puntaje, max_puntaje, nombre_usuario, width,
             color = (200, 200, 200)  # Gris claro para los demás
             
         # Número de ranking
-        rank_text = fuente_puntaje.render(f"{i+1}.", True, color)
-        screen.blit(rank_text, (width - 180, y_pos))
+        rank_text = renderizar_texto(fuente_puntaje, f"{i+1}.", color)
+        screen.blit(rank_text, (x_ranking, vista.y(y_pos)))
         
         # Nombre recortado si es muy largo
         nombre_corto = user if len(user) < 10 else user[:8] + ".."
-        name_text = fuente_puntaje.render(nombre_corto, True, color)
-        screen.blit(name_text, (width - 160, y_pos))
+        name_text = renderizar_texto(fuente_puntaje, nombre_corto, color)
+        screen.blit(name_text, (x_nombre, vista.y(y_pos)))
         
         # Puntaje alineado a la derecha
-        score_text = fuente_puntaje.render(f"{score}", True, color)
-        screen.blit(score_text, (width - score_text.get_width() - 20, y_pos))
+        score_text = renderizar_texto(fuente_puntaje, f"{score}", color)
+        screen.blit(score_text, (derecha - score_text.get_width(), vista.y(y_pos)))
         
         y_pos += 20
 
 
-def dibujar_objetivo(screen, center_x, center_y, tolerancia):
+class AtlasObjetivos:
+    """
+    Sprites del objetivo prerenderizados, uno por tolerancia y escala.
+    La tolerancia solo cambia entre niveles, así que cada sprite se genera una
+    única vez y en el bucle del nivel solo se hace un blit. La escala es el
+    factor de la resolución de salida (Vista.factor): cada resolución tiene
+    sus propios sprites y cambiar de una a otra no invalida los demás.
+    """
+
+    def __init__(self, supermuestreo=4, decimales=2):
+        # El sprite se dibuja a mayor resolución y se reduce con smoothscale,
+        # de modo que las tolerancias con decimales conservan su radio real.
+        self.supermuestreo = supermuestreo
+        self.decimales = decimales
+        self._sprites = {}
+
+    def obtener(self, tolerancia, escala=1.0):
+        """
+        Devuelve el sprite para la tolerancia (lógica) y escala indicadas, generándolo si hace falta.
+        """
+        clave = (round(tolerancia, self.decimales), round(escala, 4))
+        sprite = self._sprites.get(clave)
+        if sprite is None:
+            sprite = self._generar(*clave)
+            self._sprites[clave] = sprite
+        return sprite
+
+    def precargar(self, tolerancias, escala=1.0):
+        """
+        Genera de antemano los sprites de todas las tolerancias indicadas.
+        """
+        for tolerancia in tolerancias:
+            self.obtener(tolerancia, escala)
+
+    def limpiar(self):
+        """
+        Descarta todos los sprites generados.
+        """
+        self._sprites.clear()
+
+    def _generar(self, tolerancia, escala):
+        k = self.supermuestreo
+        tolerancia *= escala
+        radio_externo = tolerancia * 1.1
+        # Tamaño par para que el centro del sprite caiga en un píxel exacto
+        lado = 2 * math.ceil(radio_externo) + 2
+        centro = (lado * k // 2, lado * k // 2)
+
+        grande = pygame.Surface((lado * k, lado * k), pygame.SRCALPHA)
+        # Círculo externo más suave
+        pygame.draw.circle(grande, (255, 0, 0, 30), centro, round(radio_externo * k))
+        # Círculo interno más intenso
+        pygame.draw.circle(grande, (255, 0, 0, 70), centro, round(tolerancia * 0.8 * k))
+        # Borde para mayor visibilidad
+        pygame.draw.circle(grande, (255, 0, 0, 120), centro, round(radio_externo * k), max(1, round(2 * escala * k)))
+
+        if k == 1:
+            return grande
+        return pygame.transform.smoothscale(grande, (lado, lado))
+
+
+atlas_objetivos = AtlasObjetivos()
+
+
+def dibujar_objetivo(screen, center_x, center_y, tolerancia, escala=1.0):
     """
     Dibuja solo el círculo objetivo usando la tolerancia establecida.
+    El centro está en píxeles; la tolerancia es lógica y se multiplica por escala.
     """
-    # Círculo de área válida con transparencia
-    circle_surface = pygame.Surface((int(tolerancia*2.2), int(tolerancia*2.2)), pygame.SRCALPHA)
-    # Círculo externo más suave
-    pygame.draw.circle(circle_surface, (255, 0, 0, 30), (int(tolerancia*1.1), int(tolerancia*1.1)), int(tolerancia*1.1))
-    # Círculo interno más intenso
-    pygame.draw.circle(circle_surface, (255, 0, 0, 70), (int(tolerancia*1.1), int(tolerancia*1.1)), int(tolerancia*0.8))
-    # Borde para mayor visibilidad
-    pygame.draw.circle(circle_surface, (255, 0, 0, 120), (int(tolerancia*1.1), int(tolerancia*1.1)), int(tolerancia*1.1), 2)
-    screen.blit(circle_surface, (center_x - tolerancia*1.1, center_y - tolerancia*1.1))
+    sprite = atlas_objetivos.obtener(tolerancia, escala)
+    mitad = sprite.get_width() // 2
+    screen.blit(sprite, (int(center_x) - mitad, int(center_y) - mitad))
 
 
-def calcular_parametros_nivel(nivel, niveles_totales, diametro_inicial=None):
+def dibujar_mira(screen, x, y, escala=1.0):
     """
-    Calcula los parámetros del nivel actual.
+    Dibuja la mira (cruceta) y devuelve el rectángulo que ocupa.
     """
-    # Si no hay diámetro inicial especificado, usar el valor por defecto
-    if diametro_inicial is None:
-        diametro_inicial = 12
-        
-    tolerancia = diametro_inicial - ((diametro_inicial - 2) * (nivel - 1) / (niveles_totales - 1))
-    recoil_y = -0.3 - ((2.5 - 0.3) * (nivel - 1) / (niveles_totales - 1))
-    recoil_x_lower = -0.1 - ((1.0 - 0.1) * (nivel - 1) / (niveles_totales - 1))
-    recoil_x_upper = 0.1 + ((1.0 - 0.1) * (nivel - 1) / (niveles_totales - 1))
-    
-    # Tiempo objetivo: 2 -> 5
-    tiempo_objetivo = 2 + (5 - 2) * (nivel - 1) / (niveles_totales - 1)
-    
-    return tolerancia, recoil_y, recoil_x_lower, recoil_x_upper, tiempo_objetivo
+    x, y = int(x), int(y)
+    brazo = round(10 * escala)
+    grosor = max(1, round(2 * escala))
+    rect_h = pygame.draw.line(screen, (0, 255, 0), (x - brazo, y), (x + brazo, y), grosor)
+    rect_v = pygame.draw.line(screen, (0, 255, 0), (x, y - brazo), (x, y + brazo), grosor)
+    return rect_h.union(rect_v)
+
+
+def dibujar_rendimiento(screen, fuente, resumen, x=20, y=70):
+    """
+    Dibuja el panel de rendimiento (percentiles del tiempo de frame, frames
+    perdidos y media por fase) y devuelve el rectángulo que ocupa.
+    """
+    lineas = [
+        f"p50 {resumen['p50_ms']:.1f}  p95 {resumen['p95_ms']:.1f}  p99 {resumen['p99_ms']:.1f} ms",
+        f"Perdidos: {resumen['perdidos']}/{resumen['frames']}",
+    ]
+    for fase in FASES:
+        lineas.append(f"{fase}: {resumen['fases_ms'][fase]:.2f} ms")
+
+    textos = [renderizar_texto(fuente, linea, (0, 255, 0)) for linea in lineas]
+    rect = pygame.Rect(x, y, max(t.get_width() for t in textos) + 10, sum(t.get_height() for t in textos) + 10)
+    screen.fill((0, 0, 0), rect)
+    y_pos = y + 5
+    for texto in textos:
+        screen.blit(texto, (x + 5, y_pos))
+        y_pos += texto.get_height()
+    return rect
+
+
+def dibujar_estadisticas(screen, fuente, resumen, vista, y=40):
+    """
+    Dibuja centradas las estadísticas de precisión de la sesión
+    (EstadisticasPrecision.resumen()) a partir de la altura lógica y.
+    """
+    lineas = [
+        f"En objetivo: {100 * resumen['en_objetivo']:.1f}% del tiempo",
+        f"Distancia al centro: {resumen['distancia_media']:.1f} ± {resumen['distancia_desviacion']:.1f}",
+        f"Rachas: {resumen['rachas']}, mediana {resumen['racha_p50']:.2f} s, p90 {resumen['racha_p90']:.2f} s, "
+        f"máxima {resumen['racha_maxima']:.2f} s",
+        f"Readquisición: mediana {resumen['readquisicion_p50']:.2f} s, p90 {resumen['readquisicion_p90']:.2f} s",
+    ]
+    for linea in lineas:
+        texto = renderizar_texto(fuente, linea, (180, 220, 255))
+        screen.blit(texto, (vista.x(ANCHO_LOGICO / 2) - texto.get_width() // 2, vista.y(y)))
+        y += 26
+
+
+def dibujar_escena_estatica(superficie, fuente, btn_change_rect, btn_skip_rect, vista,
+                            puntaje, max_puntaje, nombre_usuario, mejores_puntajes,
+                            objetivo=None, imagen=None, mensaje=None, posicion=None):
+    """
+    Dibuja la parte de la escena que no cambia entre frames: fondo, imagen de
+    recompensa (opcional), objetivo, mensaje, botones, ayuda y puntajes.
+    objetivo es (center_x, center_y, tolerancia) en coordenadas lógicas e
+    imagen es (superficie, (x, y)) en píxeles.
+    """
+    superficie.fill((50, 50, 50))  # Fondo gris oscuro
+
+    if imagen is not None:
+        superficie.blit(imagen[0], imagen[1])
+
+    if objetivo is not None:
+        dibujar_objetivo(superficie, *vista.punto(objetivo[0], objetivo[1]), objetivo[2], vista.factor)
+
+    if mensaje:
+        texto_msg = renderizar_texto(fuente, mensaje, (255, 255, 255))
+        superficie.blit(texto_msg, (vista.x(ANCHO_LOGICO / 2) - texto_msg.get_width()//2,
+                                    vista.y(ALTO_LOGICO / 2) - texto_msg.get_height()//2))
+
+    # Dibujar botones y ayuda
+    dibujar_botones(superficie, fuente, btn_change_rect, btn_skip_rect)
+    dibujar_ayuda(superficie, fuente, vista)
+
+    # Dibujar puntaje en la parte derecha
+    dibujar_puntaje(superficie, fuente, puntaje, max_puntaje, nombre_usuario, vista, mejores_puntajes, posicion)
+
+
+class EntradaNombre:
+    """
+    Campo de texto para el nombre de usuario dibujado con pygame.
+    Recibe los eventos del bucle del juego: Enter confirma y ESC deja el
+    nombre vacío (se usa "Anónimo").
+    """
+
+    def __init__(self, vista, longitud_maxima=20):
+        self.vista = vista
+        self.rect = vista.rect(ANCHO_LOGICO / 2 - 200, ALTO_LOGICO / 2 - 60, 400, 120)
+        self.longitud_maxima = longitud_maxima
+        self.texto = ""
+        self.terminado = False
+
+    def manejar_evento(self, event):
+        if event.type == pygame.TEXTINPUT:
+            self.texto = (self.texto + event.text)[:self.longitud_maxima]
+        elif event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                self.terminado = True
+            elif event.key == pygame.K_ESCAPE:
+                self.texto = ""
+                self.terminado = True
+            elif event.key == pygame.K_BACKSPACE:
+                self.texto = self.texto[:-1]
+
+    @property
+    def nombre(self):
+        nombre = self.texto.strip()
+        return nombre if nombre else "Anónimo"
+
+    def dibujar(self, screen, fuente):
+        """
+        Dibuja el cuadro con el texto escrito y devuelve el rectángulo que ocupa.
+        """
+        pygame.draw.rect(screen, (30, 30, 30), self.rect)
+        pygame.draw.rect(screen, (150, 150, 150), self.rect, 1)
+        x0 = ANCHO_LOGICO / 2 - 200
+        y0 = ALTO_LOGICO / 2 - 60
+        titulo = renderizar_texto(fuente, "Ingrese su nombre de usuario:", (255, 255, 255))
+        screen.blit(titulo, self.vista.punto(x0 + 15, y0 + 15))
+
+        campo = self.vista.rect(x0 + 15, y0 + 55, 370, 40)
+        pygame.draw.rect(screen, (80, 80, 80), campo)
+        # Cursor parpadeante al final del texto
+        cursor = "|" if pygame.time.get_ticks() // 500 % 2 == 0 else ""
+        texto = fuente.render(self.texto + cursor, True, (255, 255, 0))
+        margen = round(self.vista.longitud(8))
+        screen.blit(texto, (campo.x + margen, campo.centery - texto.get_height()//2),
+                    (0, 0, campo.width - 2 * margen, campo.height))
+        return self.rect
+
+
+def pedir_nombre_usuario(screen, clock, fuente, vista, tiempos=None):
+    """
+    Pide el nombre de usuario dentro de la ventana del juego.
+    Devuelve el nombre, o None si se cierra la ventana. Si se pasa un
+    TiemposInicio, marca en él el primer frame presentado.
+    """
+    entrada = EntradaNombre(vista)
+    pygame.key.start_text_input()
+    try:
+        while not entrada.terminado:
+            clock.tick(60)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    return None
+                entrada.manejar_evento(event)
+            screen.fill((50, 50, 50))
+            entrada.dibujar(screen, fuente)
+            pygame.display.flip()
+            if tiempos is not None:
+                tiempos.marcar("primer_frame")
+                tiempos = None
+    finally:
+        pygame.key.stop_text_input()
+    return entrada.nombre
+
+
+class ExploradorDirectorios:
+    """
+    Explorador de directorios dibujado sobre la escena del juego.
+    El contenido de cada directorio se lista en segundo plano y se va
+    mostrando a medida que llega; al elegir un directorio sus imágenes se
+    indexan también en segundo plano, de modo que el bucle del juego nunca
+    se bloquea.
+
+    Clic o Enter entran en un subdirectorio, Retroceso sube, la rueda y las
+    flechas desplazan la lista y ESC cancela. Cuando `terminado` es True,
+    `resultado` es (directorio, imagenes) o None si se canceló.
+    """
+
+    def __init__(self, directorio, vista):
+        self.vista = vista
+        self.rect = vista.rect(60, 60, ANCHO_LOGICO - 120, ALTO_LOGICO - 120)
+        margen = self._px(15)
+        alto_boton = self._px(36)
+        ancho_boton = (self.rect.width - 4 * margen) // 3
+        y_botones = self.rect.bottom - margen - alto_boton
+        self.btn_subir = pygame.Rect(self.rect.x + margen, y_botones, ancho_boton, alto_boton)
+        self.btn_usar = pygame.Rect(self.btn_subir.right + margen, y_botones, ancho_boton, alto_boton)
+        self.btn_cancelar = pygame.Rect(self.btn_usar.right + margen, y_botones, ancho_boton, alto_boton)
+        y_lista = self.rect.y + self._px(70)
+        self.rect_lista = pygame.Rect(self.rect.x + margen, y_lista, self.rect.width - 2 * margen,
+                                      y_botones - margen - self._px(25) - y_lista)
+        self.alto_fila = max(1, self._px(22))
+        self.filas_visibles = self.rect_lista.height // self.alto_fila
+
+        self.terminado = False
+        self.resultado = None
+        self.mensaje = None
+        self._tarea = None
+        self._indexando = None
+        self._listado = None
+        self.abrir(directorio if directorio and os.path.isdir(directorio) else os.getcwd())
+
+        # Soltar el mouse mientras el explorador está abierto
+        self._captura_previa = (pygame.event.get_grab(), pygame.mouse.get_visible())
+        pygame.event.set_grab(False)
+        pygame.mouse.set_visible(True)
+
+    def abrir(self, directorio):
+        """
+        Empieza a listar otro directorio ("" lista las unidades en Windows).
+        """
+        if self._listado is not None:
+            self._listado.cancelar()
+        self.directorio = directorio
+        self._listado = ListadoDirectorio(directorio)
+        self._recibidas = 0
+        self.entradas = []
+        self.seleccion = 0
+        self.desplazamiento = 0
+        self.mensaje = None
+
+    def cerrar(self):
+        """
+        Cancela el listado en curso (el indexado no se puede interrumpir).
+        """
+        if self._listado is not None:
+            self._listado.cancelar()
+
+    def _terminar(self, resultado):
+        self.cerrar()
+        self.resultado = resultado
+        self.terminado = True
+        # Devolver el mouse como estaba y descartar el movimiento acumulado
+        pygame.event.set_grab(self._captura_previa[0])
+        pygame.mouse.set_visible(self._captura_previa[1])
+        pygame.mouse.get_rel()
+
+    def actualizar(self):
+        """
+        Incorpora las entradas que llegaron del hilo de listado y comprueba
+        si terminó el indexado del directorio elegido.
+        """
+        nuevas = self._listado.nuevas(self._recibidas)
+        if nuevas:
+            self._recibidas += len(nuevas)
+            self.entradas.extend(nuevas)
+            self.entradas.sort(key=str.lower)
+
+        if self._tarea is not None and self._tarea.terminada:
+            tarea, self._tarea = self._tarea, None
+            if tarea.error is not None:
+                self.mensaje = f"Error al indexar: {tarea.error}"
+            elif not tarea.resultado:
+                self.mensaje = "No se encontraron imágenes en este directorio."
+            else:
+                self._terminar((self._indexando, tarea.resultado))
+
+    def manejar_evento(self, event):
+        if self._tarea is not None:
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                self.cancelar()
+            return
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_ESCAPE:
+                self.cancelar()
+            elif event.key == pygame.K_BACKSPACE:
+                self.subir()
+            elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                if self.entradas:
+                    self.entrar(self.entradas[self.seleccion])
+            elif event.key == pygame.K_UP:
+                self.seleccionar(self.seleccion - 1)
+            elif event.key == pygame.K_DOWN:
+                self.seleccionar(self.seleccion + 1)
+            elif event.key == pygame.K_PAGEUP:
+                self.seleccionar(self.seleccion - self.filas_visibles)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.seleccionar(self.seleccion + self.filas_visibles)
+        elif event.type == pygame.MOUSEWHEEL:
+            maximo = max(0, len(self.entradas) - self.filas_visibles)
+            self.desplazamiento = max(0, min(self.desplazamiento - 3 * event.y, maximo))
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.btn_subir.collidepoint(event.pos):
+                self.subir()
+            elif self.btn_usar.collidepoint(event.pos):
+                self.usar()
+            elif self.btn_cancelar.collidepoint(event.pos):
+                self.cancelar()
+            elif self.rect_lista.collidepoint(event.pos):
+                indice = self.desplazamiento + (event.pos[1] - self.rect_lista.y) // self.alto_fila
+                if indice < len(self.entradas):
+                    self.entrar(self.entradas[indice])
+
+    def _px(self, longitud):
+        return round(self.vista.longitud(longitud))
+
+    def seleccionar(self, indice):
+        if not self.entradas:
+            return
+        self.seleccion = max(0, min(indice, len(self.entradas) - 1))
+        if self.seleccion < self.desplazamiento:
+            self.desplazamiento = self.seleccion
+        elif self.seleccion >= self.desplazamiento + self.filas_visibles:
+            self.desplazamiento = self.seleccion - self.filas_visibles + 1
+
+    def entrar(self, nombre):
+        self.abrir(os.path.join(self.directorio, nombre))
+
+    def subir(self):
+        padre = directorio_padre(self.directorio)
+        if padre is not None:
+            self.abrir(padre)
+
+    def usar(self):
+        """
+        Indexa el directorio actual en segundo plano con cargar_imagenes.
+        """
+        if self.directorio:
+            self.mensaje = None
+            self._indexando = self.directorio
+            self._tarea = TareaFondo(cargar_imagenes, self.directorio)
 
+    def cancelar(self):
+        self._terminar(None)
 
-def main():
-    pygame.init()
+    def dibujar(self, screen, fuente, fuente_lista):
+        """
+        Dibuja el explorador y devuelve el rectángulo que ocupa.
+        """
+        pygame.draw.rect(screen, (30, 30, 30), self.rect)
+        pygame.draw.rect(screen, (150, 150, 150), self.rect, 1)
+
+        margen = self._px(15)
+        titulo = renderizar_texto(fuente, "Seleccione el directorio de imágenes", (255, 255, 255))
+        screen.blit(titulo, (self.rect.x + margen, self.rect.y + self._px(10)))
+
+        # Ruta actual, recortada por la izquierda si no cabe
+        ruta = self.directorio or "Unidades"
+        texto_ruta = fuente_lista.render(ruta, True, (255, 255, 0))
+        ancho = self.rect.width - 2 * margen
+        recorte = max(0, texto_ruta.get_width() - ancho)
+        screen.blit(texto_ruta, (self.rect.x + margen, self.rect.y + self._px(42)),
+                    (recorte, 0, ancho, texto_ruta.get_height()))
+
+        pygame.draw.rect(screen, (45, 45, 45), self.rect_lista)
+        sangria = self._px(8)
+        fin = min(len(self.entradas), self.desplazamiento + self.filas_visibles)
+        for fila, indice in enumerate(range(self.desplazamiento, fin)):
+            y = self.rect_lista.y + fila * self.alto_fila
+            if indice == self.seleccion:
+                pygame.draw.rect(screen, (80, 80, 120), (self.rect_lista.x, y, self.rect_lista.width, self.alto_fila))
+            texto = renderizar_texto(fuente_lista, self.entradas[indice], (220, 220, 220))
+            screen.blit(texto, (self.rect_lista.x + sangria, y + self._px(2)),
+                        (0, 0, self.rect_lista.width - 2 * sangria, self.alto_fila))
+
+        # Estado: progreso del listado, imágenes del directorio o mensaje
+        if self._tarea is not None:
+            estado = "Indexando imágenes..."
+        elif self.mensaje:
+            estado = self.mensaje
+        elif self._listado.error is not None:
+            estado = f"No se puede abrir: {self._listado.error.strerror or self._listado.error}"
+        else:
+            estado = f"{len(self.entradas)} carpetas, {self._listado.imagenes} imágenes"
+            if not self._listado.terminado:
+                estado += " (listando...)"
+        texto_estado = renderizar_texto(fuente_lista, estado, (200, 200, 200))
+        screen.blit(texto_estado, (self.rect.x + margen, self.rect_lista.bottom + self._px(5)))
+
+        for rect, etiqueta in ((self.btn_subir, "Subir"), (self.btn_usar, "Usar este directorio"),
+                               (self.btn_cancelar, "Cancelar")):
+            pygame.draw.rect(screen, (80, 80, 80), rect)
+            texto = renderizar_texto(fuente_lista, etiqueta, (255, 255, 255))
+            screen.blit(texto, (rect.centerx - texto.get_width()//2, rect.centery - texto.get_height()//2))
+        return self.rect
+
+
+class RenderizadorCapas:
+    """
+    Presenta cada frame a partir de una capa estática cacheada y solo
+    actualiza en pantalla los rectángulos que cambian (mira, textos de estado).
+
+    Cada frame: restaurar(capa) -> dibujar lo dinámico y pasar sus rectángulos
+    a marcar() -> presentar(). Con render_completo=True se usa siempre
+    pygame.display.flip() sobre la pantalla completa. Con más de max_rects
+    rectángulos sucios (p. ej. cientos de objetivos en movimiento) también se
+    repone y presenta la pantalla completa, que es más barato que tantos
+    blits y rectángulos pequeños.
+    """
+
+    def __init__(self, screen, render_completo=False, max_rects=64):
+        self.screen = screen
+        self.render_completo = render_completo
+        self.max_rects = max_rects
+        self._capas = {}
+        self._capa_actual = None
+        self._rects_previos = []
+        self._rects_actuales = []
+        self._completo = True
+
+    def tiene_capa(self, nombre):
+        return nombre in self._capas
+
+    def crear_capa(self, nombre):
+        """
+        Crea (o reemplaza) una capa del tamaño de la pantalla y la devuelve para dibujar en ella.
+        """
+        capa = pygame.Surface(self.screen.get_size()).convert(self.screen)
+        self._capas[nombre] = capa
+        if nombre == self._capa_actual:
+            self._completo = True
+        return capa
+
+    def invalidar(self):
+        """
+        Descarta las capas estáticas; se usa cuando cambian el nivel, los puntajes o los botones.
+        """
+        self._capas.clear()
+        self._completo = True
+
+    def descartar_capa(self, nombre):
+        """
+        Descarta una sola capa (p. ej. la de la imagen cuando avanza una animación).
+        """
+        self._capas.pop(nombre, None)
+
+    def forzar_completo(self):
+        """
+        Fuerza a que el siguiente frame se presente completo (p. ej. tras exponer la ventana).
+        """
+        self._completo = True
+
+    def restaurar(self, nombre):
+        """
+        Repone la capa estática indicada donde se dibujó contenido dinámico el frame anterior.
+        """
+        capa = self._capas[nombre]
+        if (self.render_completo or self._completo or nombre != self._capa_actual
+                or len(self._rects_previos) > self.max_rects):
+            self.screen.blit(capa, (0, 0))
+            self._completo = True
+        else:
+            for rect in self._rects_previos:
+                self.screen.blit(capa, rect, rect)
+        self._capa_actual = nombre
+        self._rects_actuales = []
+
+    def marcar(self, rect):
+        """
+        Registra un rectángulo dibujado en este frame.
+        """
+        self._rects_actuales.append(rect)
+
+    def marcar_varios(self, rects):
+        """
+        Registra varios rectángulos dibujados en este frame (p. ej. los que devuelve Surface.blits()).
+        """
+        self._rects_actuales.extend(rects)
+
+    def presentar(self):
+        """
+        Envía el frame a la pantalla: flip completo o solo los rectángulos sucios.
+        """
+        if self._completo or len(self._rects_actuales) > self.max_rects:
+            pygame.display.flip()
+            self._completo = False
+        else:
+            pygame.display.update(self._rects_previos + self._rects_actuales)
+        self._rects_previos = self._rects_actuales
+
+
+def registrar_entrada_mouse(motor, eventos, inicio_ms, fin_ms, con_movimiento=True):
+    """
+    Pasa al motor los eventos de mouse del frame (MOUSEMOTION y botón
+    izquierdo), cada uno en su instante dentro del frame [inicio_ms, fin_ms]
+    (ms de pygame.time.get_ticks()). Si el evento no trae la marca de tiempo
+    de SDL (atributo timestamp) se reparten en orden a lo largo del frame.
+    Devuelve el movimiento total (dx, dy) del frame.
+    """
+    duracion = fin_ms - inicio_ms
+    dx = dy = 0
+    for i, event in enumerate(eventos):
+        marca = getattr(event, "timestamp", None)
+        if marca is not None and duracion > 0:
+            fraccion = min(1.0, max(0.0, (marca - inicio_ms) / duracion))
+        else:
+            fraccion = (i + 1) / len(eventos)
+        if event.type == pygame.MOUSEMOTION:
+            if con_movimiento:
+                motor.registrar_movimiento(fraccion, *event.rel)
+                dx += event.rel[0]
+                dy += event.rel[1]
+        else:
+            motor.registrar_boton(fraccion, event.type == pygame.MOUSEBUTTONDOWN)
+    return dx, dy
+
+
+def crear_pantalla(width, height, modo_fps="limitado", pantalla_completa=False, escala_interna=1.0):
+    """
+    Crea la ventana del juego según el modo de FPS.
+    En modo "vsync" pygame 2 necesita una pantalla SCALED; si el driver no
+    admite vsync se vuelve al modo "limitado".
+    Con escala_interna < 1 el juego se dibuja en una superficie más pequeña
+    que SDL amplía al tamaño de salida (pygame.SCALED): el costo de dibujo por
+    software deja de crecer con la resolución (1440p, 4K). El movimiento
+    relativo del mouse no se escala si main() fijó SDL_MOUSE_RELATIVE_SCALING
+    antes de iniciar el video.
+    Devuelve (screen, modo_fps_efectivo).
+    """
+    flags = pygame.FULLSCREEN if pantalla_completa else 0
+    tamano = (width, height)
+    if escala_interna < 1.0:
+        tamano = (max(1, round(width * escala_interna)), max(1, round(height * escala_interna)))
+        flags |= pygame.SCALED
+    if modo_fps == "vsync":
+        try:
+            return pygame.display.set_mode(tamano, flags | pygame.SCALED, vsync=1), "vsync"
+        except pygame.error as e:
+            print(f"VSync no disponible ({e}); se usa el modo limitado.")
+            modo_fps = "limitado"
+    return pygame.display.set_mode(tamano, flags), modo_fps
+
+
+def resolucion_salida(config):
+    """
+    Resolución de la ventana según config.json: "resolucion" [ancho, alto] o,
+    en pantalla completa sin resolución, la del escritorio. Por defecto 800x600.
+    """
+    resolucion = config.get("resolucion")
+    if resolucion:
+        return int(resolucion[0]), int(resolucion[1])
+    if config.get("pantalla_completa"):
+        return pygame.display.get_desktop_sizes()[0]
+    return ANCHO_LOGICO, ALTO_LOGICO
+
+
+def reproducir_sesion(ruta, velocidad=1.0):
+    """
+    Reproduce una grabación (.aimrec) mostrando el objetivo, la mira y el estado de cada frame.
+    Espacio pausa, izquierda/derecha saltan 5 segundos, arriba/abajo cambian la
+    velocidad, RePág/AvPág cambian de nivel y ESC sale.
+    """
+    try:
+        reproductor = ReproductorSesion(ruta)
+    except (OSError, ValueError) as e:
+        print(f"Error al abrir la grabación: {e}")
+        return
+    if not len(reproductor):
+        print("La grabación está vacía.")
+        reproductor.cerrar()
+        return
+
+    pygame.display.init()
+    pygame.font.init()
     width, height = 800, 600
     screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption(f"Repetición: {os.path.basename(ruta)}")
+    clock = pygame.time.Clock()
+    fuente = obtener_fuente("Arial", 24)
+    fuente_ayuda = obtener_fuente("Arial", 16)
+    center_x, center_y = width // 2, height // 2
+
+    duracion = reproductor.duracion
+    inicios_nivel = sorted(reproductor.inicios_nivel.items())
+    tiempo = reproductor.tiempo(0)
+    pausado = False
+    indice = 0
+    compensacion = list(reproductor.compensacion(0))
+
+    running = True
+    while running:
+        dt = clock.tick(60) / 1000.0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
+                    running = False
+                elif event.key == pygame.K_SPACE:
+                    pausado = not pausado
+                elif event.key == pygame.K_LEFT:
+                    tiempo = max(0.0, tiempo - 5.0)
+                elif event.key == pygame.K_RIGHT:
+                    tiempo = min(duracion, tiempo + 5.0)
+                elif event.key == pygame.K_UP:
+                    velocidad = min(64.0, velocidad * 2)
+                elif event.key == pygame.K_DOWN:
+                    velocidad = max(1.0 / 16, velocidad / 2)
+                elif event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                    nivel_actual = reproductor[indice].nivel
+                    if event.key == pygame.K_PAGEDOWN:
+                        destinos = [i for n, i in inicios_nivel if n > nivel_actual]
+                    else:
+                        destinos = [i for n, i in inicios_nivel if n < nivel_actual][-1:]
+                    if destinos:
+                        tiempo = reproductor.tiempo(destinos[0])
+
+        if not pausado:
+            tiempo = min(duracion, tiempo + dt * velocidad)
+
+        # Avanzar acumulando el movimiento; al retroceder o saltar se reconstruye desde el inicio del nivel
+        nuevo = reproductor.buscar(tiempo)
+        if nuevo >= indice and nuevo - indice < 1000:
+            for i in range(indice + 1, nuevo + 1):
+                registro = reproductor[i]
+                if registro.nivel != reproductor[i - 1].nivel:
+                    compensacion = [0, 0]
+                compensacion[0] += registro.dx
+                compensacion[1] += registro.dy
+        else:
+            compensacion = list(reproductor.compensacion(nuevo))
+        indice = nuevo
+        registro = reproductor[indice]
+
+        tolerancia = calcular_parametros_nivel(registro.nivel, reproductor.niveles_totales, reproductor.diametro_inicial)[0]
+        x = max(0, min(center_x + compensacion[0] + registro.retroceso_x, width))
+        y = max(0, min(center_y + compensacion[1] + registro.retroceso_y, height))
+
+        screen.fill((50, 50, 50))
+        dibujar_objetivo(screen, center_x, center_y, tolerancia)
+        dibujar_mira(screen, x, y)
+
+        estado = "EN OBJETIVO" if registro.en_objetivo else ("Disparando" if registro.boton else "")
+        texto_info = renderizar_texto(
+            fuente,
+            f"Repetición  Nivel {registro.nivel}  {tiempo:.2f}/{duracion:.2f} s  x{velocidad:g}"
+            + ("  (pausa)" if pausado else ""),
+            (255, 255, 255)
+        )
+        screen.blit(texto_info, (10, height - 30))
+        if estado:
+            texto_estado = renderizar_texto(fuente, estado, (255, 255, 0))
+            screen.blit(texto_estado, (width//2 - texto_estado.get_width()//2, 20))
+        texto_ayuda = renderizar_texto(
+            fuente_ayuda, "Espacio: pausa  Izq/Der: -5/+5 s  Arriba/Abajo: velocidad  RePág/AvPág: nivel  ESC: salir",
+            (200, 200, 200)
+        )
+        screen.blit(texto_ayuda, (width//2 - texto_ayuda.get_width()//2, height - 60))
+
+        pygame.display.flip()
+
+    reproductor.cerrar()
+    pygame.quit()
+
+
+def main(informe_inicio=False, exportar_rendimiento=None):
+    # Duración de cada fase del arranque; se imprime con --tiempos-inicio
+    tiempos = TiemposInicio(_INICIO)
+    tiempos.marcar("importacion")
+
+    # Cargar la configuración (diámetro del círculo, modo de FPS, etc.) desde config.json si existe
+    config = cargar_config()
+    diametro_inicial = config.get("diametro")
+    if diametro_inicial is not None:
+        print(f"Diámetro cargado desde config.json: {diametro_inicial}")
+    tiempos.marcar("configuracion")
+
+    # Solo los módulos que usa el juego: pygame.init() también abriría el audio
+    # y los joysticks, que retrasan el arranque. Con SCALED (vsync o
+    # escala_interna) SDL escalaría también el movimiento relativo del mouse;
+    # se desactiva para que una cuenta siga siendo una unidad lógica. SDL lee
+    # la variable al iniciar el video, así que debe fijarse antes
+    os.environ.setdefault("SDL_MOUSE_RELATIVE_SCALING", "0")
+    pygame.display.init()
+
+    # Ritmo de frames: "limitado" a fps_max, "vsync" o "ilimitado"
+    modo_fps = config.get("modo_fps", "limitado")
+    if modo_fps not in MODOS_FPS:
+        print(f"modo_fps desconocido: {modo_fps}; se usa 'limitado'.")
+        modo_fps = "limitado"
+
+    # Resolución de salida ("resolucion", "pantalla_completa") y, opcionalmente,
+    # una resolución interna menor que se amplía al presentar ("escala_interna")
+    width, height = resolucion_salida(config)
+    screen, modo_fps = crear_pantalla(
+        width, height, modo_fps,
+        pantalla_completa=bool(config.get("pantalla_completa", False)),
+        escala_interna=float(config.get("escala_interna", 1.0))
+    )
+    limite_fps = int(config.get("fps_max", 60)) if modo_fps == "limitado" else 0
     pygame.display.set_caption("Entrenamiento de Puntería")
     clock = pygame.time.Clock()
+    tiempos.marcar("pantalla")
+
+    # El juego trabaja en coordenadas lógicas de 800x600; la vista las lleva a
+    # los píxeles de la superficie de dibujo
+    vista = Vista(*screen.get_size())
+
+    # Fuente para textos (las demás se crean al usarse por primera vez)
+    pygame.font.init()
+    fuente = obtener_fuente("Arial", vista.fuente(24))
+    tiempos.marcar("fuentes")
     
-    center_x, center_y = width // 2, height // 2
+    center_x, center_y = ANCHO_LOGICO // 2, ALTO_LOGICO // 2
 
-    # Solicitar nombre de usuario
-    nombre_usuario = solicitar_nombre_usuario()
+    # Solicitar nombre de usuario dentro de la ventana; los diálogos de Tk
+    # solo se usan si se piden con "dialogos_nativos" en config.json
+    dialogos_nativos = bool(config.get("dialogos_nativos", False))
+    if dialogos_nativos:
+        nombre_usuario = solicitar_nombre_usuario()
+    else:
+        nombre_usuario = pedir_nombre_usuario(screen, clock, fuente, vista, tiempos)
+        if nombre_usuario is None:
+            pygame.quit()
+            return
+    # El tiempo que el usuario tarda en escribir no cuenta como arranque
+    tiempos.descontar()
     
-    # Cargar puntajes
-    puntajes = cargar_puntajes()
+    # Cargar puntajes en streaming en una tabla incremental; las escrituras se
+    # hacen en segundo plano
+    tabla_puntajes = TablaPuntajes.desde_archivo(ARCHIVO_PUNTAJES, seguidos=[nombre_usuario])
+    escritor_puntajes = EscritorPuntajes(ARCHIVO_PUNTAJES)
     
     # Verificar si el usuario existe y obtener su mejor puntaje
-    if nombre_usuario in puntajes:
-        max_puntaje = puntajes[nombre_usuario]
-    else:
+    max_puntaje = tabla_puntajes.puntaje(nombre_usuario)
+    if max_puntaje is None:
         max_puntaje = 0
-        puntajes[nombre_usuario] = max_puntaje
+        tabla_puntajes.actualizar(nombre_usuario, max_puntaje)
     
-    # Obtener tabla de mejores puntajes
-    mejores_puntajes = obtener_mejores_puntajes(puntajes)
+    # Servicio de puntajes compartido por varias estaciones ("servicio_puntajes":
+    # "host:puerto" en config.json). score.json se sigue escribiendo siempre y
+    # es la clasificación que se muestra mientras el servicio no responde.
+    cliente_puntajes = None
+    if config.get("servicio_puntajes"):
+        from servicio_puntajes import ClientePuntajes
+        cliente_puntajes = ClientePuntajes(config["servicio_puntajes"], nombre_usuario)
+        cliente_puntajes.actualizar(nombre_usuario, max_puntaje)
+    inicio_sesion = time.time()
     
-    # Puntaje actual
-    puntaje_actual = 0
+    # Obtener tabla de mejores puntajes
+    mejores_puntajes, posicion_usuario = clasificacion_actual(tabla_puntajes, cliente_puntajes, nombre_usuario)
+    tiempos.marcar("puntajes")
 
     # Botones en las esquinas superiores
     btn_width = 180
@@ -262,15 +1181,15 @@ def main():
     btn_margin = 20
     
     # Botón "Cambiar Directorio" en esquina superior izquierda
-    btn_change_rect = pygame.Rect(
+    btn_change_rect = vista.rect(
         btn_margin, 
         btn_margin, 
         btn_width, 
         btn_height
     )
     # Botón "Saltar Nivel" en esquina superior derecha
-    btn_skip_rect = pygame.Rect(
-        width - btn_width - btn_margin, 
+    btn_skip_rect = vista.rect(
+        ANCHO_LOGICO - btn_width - btn_margin, 
         btn_margin, 
         btn_width, 
         btn_height
@@ -279,47 +1198,118 @@ def main():
     # Inicialmente no se selecciona directorio ni se cargan imágenes
     directorio_imagenes = ""
     imagenes = []
+
+    # Explorador de directorios abierto (None si no hay ninguno); mientras
+    # está abierto el nivel queda en pausa
+    explorador = None
+    fuente_explorador = obtener_fuente("Arial", vista.fuente(16))
     
     # Capturar el mouse hasta que se presione F12
     pygame.event.set_grab(True)
     pygame.mouse.set_visible(False)
 
-    # Cargar el diámetro del círculo desde config.json si existe
-    diametro_inicial = None
-    try:
-        if os.path.exists("config.json"):
-            with open("config.json", "r") as f:
-                config = json.load(f)
-                if "diametro" in config:
-                    diametro_inicial = config["diametro"]
-                    print(f"Diámetro cargado desde config.json: {diametro_inicial}")
-    except Exception as e:
-        print(f"Error al cargar config.json: {e}")
-        diametro_inicial = 12  # Valor por defecto si hay error
+    # Patrones de retroceso de una biblioteca .aimpat ("patrones_retroceso" en
+    # config.json, ver retroceso.py); sin ella se generan con la semilla
+    biblioteca_patrones = None
+    if config.get("patrones_retroceso"):
+        try:
+            biblioteca_patrones = BibliotecaPatrones(config["patrones_retroceso"])
+        except (OSError, ValueError) as e:
+            print(f"No se pudo abrir la biblioteca de patrones: {e}")
 
-    niveles_totales = 100
-    nivel = 1
-    factor_shake = 2.0  # Factor de sacudida
-    
-    # Fuente para textos
-    fuente = pygame.font.SysFont("Arial", 24)
+    # Progresión de niveles, puntaje actual y retroceso (semilla opcional en config.json)
+    sesion = Sesion(semilla=config.get("semilla"), niveles_totales=NIVELES_TOTALES, diametro_inicial=diametro_inicial,
+                    biblioteca=biblioteca_patrones, estadisticas=True)
+
+    # Modo multiobjetivo: "multiobjetivo" es la cantidad de objetivos en
+    # movimiento y "modo_multiobjetivo" es "seguimiento" o "rapido" (necesita NumPy)
+    cantidad_objetivos = int(config.get("multiobjetivo", 0))
+    tipo_multiobjetivo = config.get("modo_multiobjetivo", "seguimiento")
+    escala_radio = 1.0
+    if cantidad_objetivos > 0:
+        try:
+            from multiobjetivo import ESCALA_RADIO, TIPOS, coordenadas_blit, iniciar_nivel_multiobjetivo
+        except ImportError as e:
+            print(f"El modo multiobjetivo necesita NumPy ({e}); se usa el modo clásico.")
+            cantidad_objetivos = 0
+        else:
+            escala_radio = ESCALA_RADIO
+            if tipo_multiobjetivo not in TIPOS:
+                print(f"modo_multiobjetivo desconocido: {tipo_multiobjetivo}; se usa 'seguimiento'.")
+                tipo_multiobjetivo = "seguimiento"
+
+    # Prerenderizar los sprites del objetivo de todos los niveles a esta resolución
+    atlas_objetivos.precargar(
+        (sesion.parametros(n)[0] * escala_radio for n in range(1, sesion.niveles_totales + 1)),
+        vista.factor
+    )
+
+    # Renderizado por capas; "render_completo" en config.json vuelve al flip completo
+    renderizador = RenderizadorCapas(screen, render_completo=bool(config.get("render_completo", False)))
+
+    # Las imágenes de recompensa se decodifican y escalan en segundo plano; las
+    # copias ya escaladas se guardan en disco para las siguientes sesiones. De
+    # los GIF/APNG animados solo se tienen "cuadros_animacion" cuadros en memoria.
+    limite_miniaturas = int(config.get("cache_miniaturas_mb", 256)) * 1024 * 1024
+    precargador = PrecargadorImagenes(
+        *vista.tamano,
+        capacidad=int(config.get("precarga_imagenes", 4)),
+        hilos=int(config.get("hilos_precarga", 2)),
+        miniaturas=CacheMiniaturas(limite_bytes=limite_miniaturas) if limite_miniaturas > 0 else None,
+        cuadros_animacion=int(config.get("cuadros_animacion", 8))
+    )
+
+    # Instrumentación: F3 muestra el panel de rendimiento, F4 inicia/detiene cProfile
+    medidor = MedidorFrames(presupuesto=1.0 / limite_fps if limite_fps else PASO_SIMULACION)
+    perfil = CapturaPerfil()
+    fuente_rendimiento = obtener_fuente("Arial", vista.fuente(14))
+    mostrar_rendimiento = False
+    resumen_rendimiento = None
+    proximo_resumen = 0.0
+
+    # Grabación opcional de cada frame de los niveles ("grabar_sesiones" en config.json)
+    grabador = None
+    if config.get("grabar_sesiones"):
+        ruta_grabacion = os.path.join(DIRECTORIO_GRABACIONES, time.strftime("sesion_%Y%m%d_%H%M%S.aimrec"))
+        try:
+            grabador = GrabadorSesion(ruta_grabacion, sesion.niveles_totales, diametro_inicial)
+            print(f"Grabando sesión en {ruta_grabacion}")
+        except OSError as e:
+            print(f"No se pudo iniciar la grabación: {e}")
+
+    # Telemetría en vivo para overlays ("telemetria" en config.json: true o
+    # la ruta del archivo; se lee con telemetria.py)
+    telemetria = None
+    if config.get("telemetria"):
+        ruta_telemetria = config["telemetria"] if isinstance(config["telemetria"], str) else RUTA_TELEMETRIA
+        try:
+            telemetria = PublicadorTelemetria(ruta_telemetria)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo iniciar la telemetría: {e}")
+
+    tiempos.marcar("recursos")
+    if informe_inicio:
+        print(tiempos.informe())
 
     running_game = True
+    recompensa = None
     skip_level_flag = False  # Para saltar nivel manualmente
     
-    while running_game and nivel <= niveles_totales:
-        # Obtener parámetros para el nivel actual
-        tolerancia, recoil_y, recoil_x_lower, recoil_x_upper, tiempo_objetivo = calcular_parametros_nivel(nivel, niveles_totales, diametro_inicial)
-        
+    while running_game and not sesion.terminada:
         # Si no hay imágenes, esperamos a que el usuario seleccione un directorio
         if not imagenes:
             waiting_for_images = True
+            renderizador.invalidar()
             while waiting_for_images and running_game:
                 dt = clock.tick(60) / 1000.0
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         running_game = False
                         waiting_for_images = False
+                    elif event.type == pygame.VIDEOEXPOSE:
+                        renderizador.forzar_completo()
+                    elif explorador is not None:
+                        explorador.manejar_evento(event)
                     elif event.type == pygame.KEYDOWN:
                         if event.key == pygame.K_F12:
                             # Alternar captura
@@ -332,87 +1322,112 @@ def main():
                         if event.button == 1:  # Clic izquierdo
                             if btn_change_rect.collidepoint(event.pos):
                                 # Cambiar directorio
+                                if not dialogos_nativos:
+                                    explorador = ExploradorDirectorios(directorio_imagenes, vista)
+                                    continue
                                 nuevo_dir = seleccionar_directorio()
                                 if nuevo_dir:
                                     nuevas_imagenes = cargar_imagenes(nuevo_dir)
                                     if nuevas_imagenes:
                                         directorio_imagenes = nuevo_dir
                                         imagenes = nuevas_imagenes
+                                        precargador.establecer_imagenes(imagenes)
                                         waiting_for_images = False
                             elif btn_skip_rect.collidepoint(event.pos):
                                 skip_level_flag = True
                                 waiting_for_images = False
                 
+                if explorador is not None:
+                    explorador.actualizar()
+                    if explorador.terminado:
+                        if explorador.resultado is not None:
+                            directorio_imagenes, imagenes = explorador.resultado
+                            precargador.establecer_imagenes(imagenes)
+                            waiting_for_images = False
+                        explorador = None
+
                 if skip_level_flag:
                     skip_level_flag = False
                     # Avanzar de nivel aunque no haya imágenes
-                    nivel += 1
+                    sesion.saltar_nivel()
                     waiting_for_images = False
                     break
                 
-                screen.fill((50, 50, 50))  # Fondo gris oscuro
-                
-                # Mensaje de "No hay imágenes"
-                msg = "Sin imágenes. Use 'Cambiar Directorio' para cargar."
-                texto_msg = fuente.render(msg, True, (255, 255, 255))
-                screen.blit(texto_msg, (width//2 - texto_msg.get_width()//2, height//2 - texto_msg.get_height()//2))
-                
-                # Dibujar botones y ayuda
-                dibujar_botones(screen, fuente, btn_change_rect, btn_skip_rect)
-                dibujar_ayuda(screen, fuente, width, height)
-                
-                # Dibujar puntaje en la parte derecha
-                dibujar_puntaje(screen, fuente, puntaje_actual, max_puntaje, nombre_usuario, width, mejores_puntajes)
-                
-                pygame.display.flip()
+                # Clasificación global recibida del servicio
+                if cliente_puntajes is not None and cliente_puntajes.hay_cambios():
+                    mejores_puntajes, posicion_usuario = clasificacion_actual(
+                        tabla_puntajes, cliente_puntajes, nombre_usuario)
+                    renderizador.invalidar()
+
+                # Mensaje de "No hay imágenes" sobre la capa estática
+                if not renderizador.tiene_capa("sin_imagenes"):
+                    dibujar_escena_estatica(
+                        renderizador.crear_capa("sin_imagenes"), fuente, btn_change_rect, btn_skip_rect,
+                        vista, sesion.puntaje, max_puntaje, nombre_usuario, mejores_puntajes,
+                        posicion=posicion_usuario,
+                        mensaje="Sin imágenes. Use 'Cambiar Directorio' para cargar."
+                    )
+                renderizador.restaurar("sin_imagenes")
+                if explorador is not None:
+                    renderizador.marcar(explorador.dibujar(screen, fuente, fuente_explorador))
+                renderizador.presentar()
             
             if not running_game:
                 break
             # Si aún no hay imágenes, se fuerza la salida de este nivel
             if not imagenes:
-                nivel += 1
+                sesion.saltar_nivel()
                 continue
         
-        # Ahora sí hay imágenes
-        imagen_path = random.choice(imagenes)
-        try:
-            reward_image_loaded = pygame.image.load(imagen_path)
-        except (pygame.error, FileNotFoundError, PermissionError) as e:
-            print(f"Error al cargar imagen: {e}")
-            if imagen_path in imagenes:
-                imagenes.remove(imagen_path)
-            if not imagenes:
-                print("No hay más imágenes disponibles. Saliendo.")
-                break
-            # Saltar este nivel si falla la carga
-            nivel += 1
-            continue
-        
-        # Escalado proporcional
-        img_w, img_h = reward_image_loaded.get_size()
-        ratio = min(width / img_w, height / img_h)
-        new_w = int(img_w * ratio)
-        new_h = int(img_h * ratio)
-        reward_image_loaded = pygame.transform.scale(reward_image_loaded, (new_w, new_h))
-        img_x = (width - new_w) // 2
-        img_y = (height - new_h) // 2
+        # Ahora sí hay imágenes; si todas resultaron ilegibles no queda nada que mostrar
+        if not imagenes:
+            print("No hay más imágenes disponibles. Saliendo.")
+            break
+
+        # Tomar la siguiente imagen ya preparada. Si aún no hay ninguna, el nivel
+        # empieza igual y la imagen se recoge en cuanto esté lista.
+        liberar_recompensa(recompensa)
+        recompensa = precargador.obtener()
         
-        compensation = [0.0, 0.0]
-        recoil_offset = [0.0, 0.0]
-        tiempo_en_objetivo_acumulado = 0.0
+        # Estado del nivel (retroceso, tiempo en objetivo) en el motor sin pygame
+        if cantidad_objetivos > 0:
+            motor = iniciar_nivel_multiobjetivo(sesion, cantidad_objetivos, tipo_multiobjetivo,
+                                                (ANCHO_LOGICO, ALTO_LOGICO))
+        else:
+            motor = sesion.iniciar_nivel()
         
-        # Centrar el mouse y vaciar acumulado
-        pygame.mouse.set_pos((center_x, center_y))
+        # Centrar el mouse y vaciar acumulado (incluido el evento de movimiento del salto)
+        pygame.mouse.set_pos(vista.punto(center_x, center_y))
         pygame.mouse.get_rel()
+        pygame.event.clear(pygame.MOUSEMOTION)
+        marca_frame = pygame.time.get_ticks()
+
+        # Nuevo nivel: reconstruir las capas estáticas (objetivo, imagen y puntajes)
+        renderizador.invalidar()
 
         running_level = True
         while running_level and running_game:
-            dt = clock.tick(60) / 1000.0
+            medidor.iniciar_frame()
+            dt = clock.tick(limite_fps) / 1000.0
+            medidor.marcar("espera")
             
+            # Eventos de mouse del frame para el motor, con su instante (el
+            # frame abarca desde la lectura de eventos anterior hasta esta)
+            eventos_mouse = []
+            inicio_frame, marca_frame = marca_frame, pygame.time.get_ticks()
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running_game = False
                     running_level = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    renderizador.forzar_completo()
+                elif explorador is not None:
+                    explorador.manejar_evento(event)
+                elif event.type == pygame.MOUSEMOTION:
+                    eventos_mouse.append(event)
+                elif event.type == pygame.MOUSEBUTTONUP:
+                    if event.button == 1:
+                        eventos_mouse.append(event)
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_F12:
                         # Alternar captura
@@ -421,152 +1436,220 @@ def main():
                     elif event.key == pygame.K_ESCAPE:
                         running_game = False
                         running_level = False
+                    elif event.key == pygame.K_F3:
+                        mostrar_rendimiento = not mostrar_rendimiento
+                    elif event.key == pygame.K_F4:
+                        perfil.alternar()
                         
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     if event.button == 1:  # Clic izquierdo
+                        eventos_mouse.append(event)
                         if btn_change_rect.collidepoint(event.pos):
+                            if not dialogos_nativos:
+                                explorador = ExploradorDirectorios(directorio_imagenes, vista)
+                                continue
                             nuevo_dir = seleccionar_directorio()
                             if nuevo_dir:
                                 nuevas_imagenes = cargar_imagenes(nuevo_dir)
                                 if nuevas_imagenes:
                                     directorio_imagenes = nuevo_dir
                                     imagenes = nuevas_imagenes
+                                    precargador.establecer_imagenes(imagenes)
                         elif btn_skip_rect.collidepoint(event.pos):
                             skip_level_flag = True
             
             # Si el usuario pulsó "Saltar Nivel"
             if skip_level_flag:
                 skip_level_flag = False
-                nivel += 1
+                sesion.saltar_nivel()
                 running_level = False
                 continue
 
+            if explorador is not None:
+                explorador.actualizar()
+                if explorador.terminado:
+                    if explorador.resultado is not None:
+                        directorio_imagenes, imagenes = explorador.resultado
+                        precargador.establecer_imagenes(imagenes)
+                    explorador = None
+
             if not imagenes:
                 # Si se vació la lista de imágenes en runtime, salir
                 running_game = False
                 running_level = False
                 continue
 
-            # Leer movimiento relativo si el mouse está "grabado"
-            if pygame.event.get_grab():
-                rel = pygame.mouse.get_rel()
-                compensation[0] += rel[0]
-                compensation[1] += rel[1]
-
-            # Actualizar retroceso
-            recoil_x_increment = random.uniform(recoil_x_lower, recoil_x_upper)
-            recoil_offset[0] += recoil_x_increment * factor_shake
-            recoil_offset[1] += recoil_y * factor_shake
+            if recompensa is None:
+                recompensa = precargador.obtener()
+                if recompensa is not None:
+                    renderizador.invalidar()
 
-            # Calcular posición real
-            effective_x_raw = center_x + compensation[0] + recoil_offset[0]
-            effective_y_raw = center_y + compensation[1] + recoil_offset[1]
-
-            # Clamping para dibujar
-            effective_x_draw = max(0, min(effective_x_raw, width))
-            effective_y_draw = max(0, min(effective_y_raw, height))
+            # Con el explorador abierto el nivel queda en pausa: no se lee el
+            # mouse ni avanzan el retroceso y el tiempo en objetivo
+            pausado = explorador is not None
 
-            # Distancia al centro
-            distancia = math.hypot(effective_x_raw - center_x, effective_y_raw - center_y)
+            # Eventos de movimiento (solo si el mouse está "grabado") y del botón
+            # izquierdo, cada uno en su instante: el motor arma con ellos el
+            # recorrido de la mira entre pasos
+            rel = (0, 0)
+            if not pausado:
+                rel = registrar_entrada_mouse(motor, eventos_mouse, inicio_frame, marca_frame,
+                                              con_movimiento=pygame.event.get_grab())
 
             # Verificar si el botón izquierdo está presionado
-            left_button_pressed = pygame.mouse.get_pressed()[0]
+            left_button_pressed = pygame.mouse.get_pressed()[0] and not pausado
+            medidor.marcar("eventos")
 
-            # Acumular tiempo SOLO si está en la zona Y el botón izquierdo está presionado
-            if distancia <= tolerancia and left_button_pressed:
-                tiempo_en_objetivo_acumulado += dt
-            else:
-                tiempo_en_objetivo_acumulado = 0.0
+            # Simulación en pasos fijos: el retroceso y el tiempo en objetivo
+            # avanzan igual sea cual sea la frecuencia de dibujo
+            if not pausado:
+                motor.avanzar(dt, left_button_pressed)
+                if grabador is not None:
+                    grabador.registrar(rel[0], rel[1], motor.retroceso[0], motor.retroceso[1],
+                                       sesion.nivel, left_button_pressed, motor.en_objetivo)
+            if telemetria is not None:
+                telemetria.publicar(sesion.nivel, sesion.puntaje, motor.tiempo_en_objetivo, motor.tiempo_objetivo,
+                                    motor.distancia, motor.tolerancia * escala_radio, dt * 1000.0,
+                                    left_button_pressed, motor.en_objetivo)
+            medidor.marcar("simulacion")
 
             # Verificar avance de nivel
-            if tiempo_en_objetivo_acumulado >= tiempo_objetivo:
-                nivel += 1
+            if motor.completado:
                 # Aumentar puntaje cuando se completa un nivel
-                puntaje_actual += 100 + int(100 * (nivel / niveles_totales))
+                sesion.completar_nivel()
                 
                 # Actualizar el mejor puntaje si es necesario
-                if puntaje_actual > max_puntaje:
-                    max_puntaje = puntaje_actual
-                    puntajes[nombre_usuario] = max_puntaje
-                    guardar_puntajes(puntajes)
+                if sesion.puntaje > max_puntaje:
+                    max_puntaje = sesion.puntaje
+                    tabla_puntajes.actualizar(nombre_usuario, max_puntaje)
+                    escritor_puntajes.actualizar(nombre_usuario, max_puntaje)
+                    if cliente_puntajes is not None:
+                        cliente_puntajes.actualizar(nombre_usuario, max_puntaje)
                     # Actualizar la tabla de mejores puntajes
-                    mejores_puntajes = obtener_mejores_puntajes(puntajes)
+                    mejores_puntajes, posicion_usuario = clasificacion_actual(
+                        tabla_puntajes, cliente_puntajes, nombre_usuario)
                 
                 running_level = False
                 break
 
+            # Posición dibujada: el retroceso se interpola entre los dos últimos pasos
+            desplazamiento_x, desplazamiento_y = motor.desplazamiento()
+            effective_x_raw = center_x + desplazamiento_x
+            effective_y_raw = center_y + desplazamiento_y
+
+            # Clamping para dibujar
+            effective_x_draw = max(0, min(effective_x_raw, ANCHO_LOGICO))
+            effective_y_draw = max(0, min(effective_y_raw, ALTO_LOGICO))
+
             # Dibujo de la escena
-            # Fondo gris oscuro
-            screen.fill((50, 50, 50))
-            
             # Mostrar la imagen SOLO si está en la zona y el botón está presionado
-            if distancia <= tolerancia and left_button_pressed:
-                screen.blit(reward_image_loaded, (img_x, img_y))
+            mostrar_imagen = motor.en_objetivo
+            nombre_capa = "con_imagen" if mostrar_imagen else "base"
+            imagen_recompensa = recompensa
+            if recompensa is not None and isinstance(recompensa[0], AnimacionRecompensa):
+                # Cada cuadro nuevo de la animación rehace la capa con imagen;
+                # el resto de frames se presentan con los rectángulos sucios
+                if mostrar_imagen and recompensa[0].avanzar(time.perf_counter()):
+                    renderizador.descartar_capa("con_imagen")
+                imagen_recompensa = (recompensa[0].cuadro, recompensa[1])
+            if cliente_puntajes is not None and cliente_puntajes.hay_cambios():
+                mejores_puntajes, posicion_usuario = clasificacion_actual(
+                    tabla_puntajes, cliente_puntajes, nombre_usuario)
+                renderizador.invalidar()
+            if not renderizador.tiene_capa(nombre_capa):
+                dibujar_escena_estatica(
+                    renderizador.crear_capa(nombre_capa), fuente, btn_change_rect, btn_skip_rect,
+                    vista, sesion.puntaje, max_puntaje, nombre_usuario, mejores_puntajes,
+                    posicion=posicion_usuario,
+                    objetivo=(center_x, center_y, motor.tolerancia) if not cantidad_objetivos else None,
+                    imagen=imagen_recompensa if mostrar_imagen else None
+                )
+            medidor.marcar("capas")
+            renderizador.restaurar(nombre_capa)
+
+            # Objetivos en movimiento: posiciones interpoladas convertidas a
+            # píxeles de una vez y un solo blits() para todos los sprites
+            if cantidad_objetivos > 0:
+                sprite = atlas_objetivos.obtener(motor.radio, vista.factor)
+                esquinas = coordenadas_blit(motor.posiciones_dibujo(), vista, sprite.get_width() // 2)
+                renderizador.marcar_varios(screen.blits([(sprite, esquina) for esquina in esquinas]))
 
-            # Dibujar solo el círculo objetivo
-            dibujar_objetivo(screen, center_x, center_y, tolerancia)
-            
             # Mira (cruceta)
-            pygame.draw.line(screen, (0, 255, 0), (int(effective_x_draw) - 10, int(effective_y_draw)), (int(effective_x_draw) + 10, int(effective_y_draw)), 2)
-            pygame.draw.line(screen, (0, 255, 0), (int(effective_x_draw), int(effective_y_draw) - 10), (int(effective_x_draw), int(effective_y_draw) + 10), 2)
+            renderizador.marcar(dibujar_mira(screen, *vista.punto(effective_x_draw, effective_y_draw), vista.factor))
             
             # Texto info de nivel
-            texto_info = fuente.render(
-                f"Nivel {nivel}  Tiempo: {tiempo_en_objetivo_acumulado:.2f}/{tiempo_objetivo:.2f} seg",
-                True, (255, 255, 255)
-            )
-            screen.blit(texto_info, (10, height - 30))
-
-            # Dibujar botones y ayuda
-            dibujar_botones(screen, fuente, btn_change_rect, btn_skip_rect)
-            dibujar_ayuda(screen, fuente, width, height)
-            
-            # Dibujar puntaje en la parte derecha
-            dibujar_puntaje(screen, fuente, puntaje_actual, max_puntaje, nombre_usuario, width, mejores_puntajes)
+            if cantidad_objetivos > 0 and tipo_multiobjetivo == "rapido":
+                estado_nivel = f"Aciertos: {motor.aciertos}/{motor.aciertos_objetivo}"
+            else:
+                estado_nivel = f"Tiempo: {motor.tiempo_en_objetivo:.2f}/{motor.tiempo_objetivo:.2f} seg"
+            texto_info = renderizar_texto(fuente, f"Nivel {sesion.nivel}  {estado_nivel}", (255, 255, 255))
+            renderizador.marcar(screen.blit(texto_info, vista.punto(10, ALTO_LOGICO - 30)))
 
-            pygame.display.flip()
+            # Panel de rendimiento (el resumen se recalcula 4 veces por segundo)
+            if mostrar_rendimiento:
+                ahora = time.perf_counter()
+                if ahora >= proximo_resumen:
+                    resumen_rendimiento = medidor.resumen()
+                    proximo_resumen = ahora + 0.25
+                if resumen_rendimiento is not None:
+                    renderizador.marcar(dibujar_rendimiento(screen, fuente_rendimiento, resumen_rendimiento,
+                                                            *vista.punto(20, 70)))
+            if explorador is not None:
+                renderizador.marcar(explorador.dibujar(screen, fuente, fuente_explorador))
+            medidor.marcar("dibujo")
+
+            renderizador.presentar()
+            medidor.marcar("presentacion")
+            medidor.cerrar_frame()
 
     # Mensaje final cuando se completa todo el entrenamiento
-    if running_game and nivel > niveles_totales:
+    if running_game and sesion.terminada:
         screen.fill((50, 50, 50))
-        fuente_final = pygame.font.SysFont("Arial", 36)
+        centro_x = vista.x(ANCHO_LOGICO / 2)
+        centro_y = ALTO_LOGICO / 2
+        fuente_final = obtener_fuente("Arial", vista.fuente(36))
         texto_final = fuente_final.render("¡Entrenamiento completado!", True, (255, 255, 255))
-        screen.blit(texto_final, (width//2 - texto_final.get_width()//2, height//2 - texto_final.get_height()//2 - 100))
+        screen.blit(texto_final, (centro_x - texto_final.get_width()//2, vista.y(centro_y - 100) - texto_final.get_height()//2))
+
+        # Estadísticas de precisión de la sesión (ya acumuladas: solo se dibujan)
+        dibujar_estadisticas(screen, obtener_fuente("Arial", vista.fuente(20)), sesion.estadisticas.resumen(), vista)
         
         # Mostrar puntaje final
-        fuente_puntaje = pygame.font.SysFont("Arial", 28)
-        texto_puntaje = fuente_puntaje.render(f"Puntaje final: {puntaje_actual}", True, (255, 255, 0))
-        screen.blit(texto_puntaje, (width//2 - texto_puntaje.get_width()//2, height//2 - 60))
+        fuente_puntaje = obtener_fuente("Arial", vista.fuente(28))
+        texto_puntaje = fuente_puntaje.render(f"Puntaje final: {sesion.puntaje}", True, (255, 255, 0))
+        screen.blit(texto_puntaje, (centro_x - texto_puntaje.get_width()//2, vista.y(centro_y - 60)))
         
         # Verificar una vez más si es un nuevo récord
-        if puntaje_actual > max_puntaje:
-            max_puntaje = puntaje_actual
-            puntajes[nombre_usuario] = max_puntaje
-            guardar_puntajes(puntajes)
+        if sesion.puntaje > max_puntaje:
+            max_puntaje = sesion.puntaje
+            tabla_puntajes.actualizar(nombre_usuario, max_puntaje)
+            escritor_puntajes.actualizar(nombre_usuario, max_puntaje)
+            if cliente_puntajes is not None:
+                cliente_puntajes.actualizar(nombre_usuario, max_puntaje)
             
             # Mostrar mensaje de nuevo récord
             texto_record = fuente_puntaje.render("¡NUEVO RÉCORD!", True, (255, 50, 50))
-            screen.blit(texto_record, (width//2 - texto_record.get_width()//2, height//2 - 20))
+            screen.blit(texto_record, (centro_x - texto_record.get_width()//2, vista.y(centro_y - 20)))
         
         # Mostrar mejor puntaje del usuario
         texto_mejor = fuente_puntaje.render(f"Tu mejor puntaje: {max_puntaje}", True, (255, 255, 255))
-        screen.blit(texto_mejor, (width//2 - texto_mejor.get_width()//2, height//2 + 20))
+        screen.blit(texto_mejor, (centro_x - texto_mejor.get_width()//2, vista.y(centro_y + 20)))
         
         # Actualizar lista de mejores puntajes
-        mejores_puntajes = obtener_mejores_puntajes(puntajes)
+        mejores_puntajes, posicion_usuario = clasificacion_actual(tabla_puntajes, cliente_puntajes, nombre_usuario)
         
         # Dibujar tabla de HIGH SCORES
-        y_pos = height//2 + 80
-        fuente_high = pygame.font.SysFont("Arial", 24, bold=True)
+        y_pos = centro_y + 80
+        fuente_high = obtener_fuente("Arial", vista.fuente(24), bold=True)
         texto_high = fuente_high.render("HIGH SCORES", True, (255, 255, 0))
-        screen.blit(texto_high, (width//2 - texto_high.get_width()//2, y_pos))
+        screen.blit(texto_high, (centro_x - texto_high.get_width()//2, vista.y(y_pos)))
         y_pos += 30
         
         # Línea separadora
         pygame.draw.line(screen, (150, 150, 150), 
-                        (width//2 - 150, y_pos), 
-                        (width//2 + 150, y_pos), 
-                        1)
+                        vista.punto(ANCHO_LOGICO / 2 - 150, y_pos), 
+                        vista.punto(ANCHO_LOGICO / 2 + 150, y_pos), 
+                        max(1, round(vista.factor)))
         y_pos += 10
         
         # Mostrar los 5 mejores puntajes
@@ -586,16 +1669,60 @@ def main():
             score_text = fuente_puntaje.render(f"{score}", True, color)
             
             # Posicionar textos (alineados)
-            screen.blit(rank_text, (width//2 - 150, y_pos))
-            screen.blit(score_text, (width//2 + 150 - score_text.get_width(), y_pos))
+            screen.blit(rank_text, vista.punto(ANCHO_LOGICO / 2 - 150, y_pos))
+            screen.blit(score_text, (vista.x(ANCHO_LOGICO / 2 + 150) - score_text.get_width(), vista.y(y_pos)))
             
             y_pos += 30
         
         pygame.display.flip()
         pygame.time.delay(8000)  # Mostrar por más tiempo para que vean la tabla
     
+    if explorador is not None:
+        explorador.cerrar()
+    liberar_recompensa(recompensa)
+    precargador.detener()
+    escritor_puntajes.cerrar()
+    # Estadísticas de precisión junto a score.json (también si se salió a mitad de nivel)
+    sesion.terminar_nivel()
+    if sesion.estadisticas.tiempo_total > 0.0:
+        try:
+            guardar_estadisticas(nombre_usuario, inicio_sesion, sesion)
+        except OSError as e:
+            print(f"Error al guardar las estadísticas: {e}")
+    if cliente_puntajes is not None:
+        cliente_puntajes.enviar_resumen({
+            "puntaje": sesion.puntaje,
+            "nivel": sesion.nivel,
+            "completada": sesion.terminada,
+            "inicio": inicio_sesion,
+            "duracion": round(time.time() - inicio_sesion, 3),
+        })
+        cliente_puntajes.detener()
+    perfil.detener()
+    if grabador is not None:
+        grabador.cerrar()
+    if biblioteca_patrones is not None:
+        biblioteca_patrones.cerrar()
+    if telemetria is not None:
+        telemetria.cerrar()
+    # --exportar-rendimiento tiene prioridad sobre config.json
+    exportar_rendimiento = exportar_rendimiento or config.get("exportar_rendimiento")
+    if exportar_rendimiento:
+        medidor.exportar(exportar_rendimiento)
     pygame.quit()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Entrenamiento de Puntería")
+    parser.add_argument("--replay", metavar="ARCHIVO", help="reproduce una grabación .aimrec")
+    parser.add_argument("--velocidad", type=float, default=1.0, help="velocidad inicial de la repetición")
+    parser.add_argument("--tiempos-inicio", action="store_true",
+                        help="imprime la duración de cada fase del arranque")
+    parser.add_argument("--exportar-rendimiento", metavar="RUTA",
+                        help="al salir, guarda los tiempos por fase de los últimos frames (.csv o .json)")
+    args = parser.parse_args()
+
+    if args.replay:
+        reproducir_sesion(args.replay, args.velocidad)
+    else:
+        main(informe_inicio=args.tiempos_inicio, exportar_rendimiento=args.exportar_rendimiento)
@@ -0,0 +1,169 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import threading
+from collections import deque
+
+import pygame
+
+from miniaturas import cargar_pillow, tamano_ajustado
+
+
+# Los navegadores tratan los retardos de GIF menores de 20 ms como 100 ms;
+# muchos archivos cuentan con ello
+RETARDO_MINIMO_MS = 20
+RETARDO_PREDETERMINADO_MS = 100
+
+EXTENSIONES_ANIMABLES = (".gif", ".png")
+
+
+def es_animada(ruta):
+    """
+    True si la imagen es un GIF o APNG con más de un cuadro. Sin Pillow
+    siempre es False (pygame solo carga el primer cuadro).
+    """
+    if not ruta.lower().endswith(EXTENSIONES_ANIMABLES):
+        return False
+    Image = cargar_pillow()
+    if Image is None:
+        return False
+    try:
+        with Image.open(ruta) as img:
+            return bool(getattr(img, "is_animated", False))
+    except (OSError, ValueError, SyntaxError):
+        return False
+
+
+class AnimacionRecompensa:
+    """
+    Imagen de recompensa animada (GIF o APNG) decodificada en streaming.
+
+    Un hilo de fondo decodifica los cuadros ya escalados a width x height y
+    los deja en un anillo de `capacidad` cuadros; el juego toma el siguiente
+    cuando vence el retardo del actual. Así la memoria no depende de la
+    duración de la animación. Si la animación entera cabe en el anillo se
+    decodifica una sola vez y se repite desde memoria.
+
+    El primer cuadro se decodifica en el constructor (que se llama desde los
+    hilos de precarga), así que `cuadro` siempre tiene una superficie.
+    """
+
+    def __init__(self, ruta, width, height, capacidad=8):
+        self.ruta = ruta
+        self.capacidad = max(2, capacidad)
+        self._img = cargar_pillow().open(ruta)
+        try:
+            self.cuadros_totales = getattr(self._img, "n_frames", 1)
+            self.tamano = tamano_ajustado(self._img.width, self._img.height, width, height)
+            self.cuadro, self.retardo = self._decodificar(0)
+        except Exception:
+            self._img.close()
+            raise
+        self.error = None
+        self._completa = self.cuadros_totales <= self.capacidad
+        self._todos = [(self.cuadro, self.retardo)]
+        self._indice = 0
+        self._anillo = deque()
+        self._condicion = threading.Condition()
+        self._cerrada = False
+        self._proximo_cambio = None
+        self._hilo = threading.Thread(target=self._trabajar, name="animacion", daemon=True)
+        self._hilo.start()
+
+    def avanzar(self, ahora):
+        """
+        Pasa al siguiente cuadro si venció el retardo del actual (ahora en
+        segundos, p. ej. time.perf_counter()). Nunca bloquea: si el siguiente
+        cuadro aún no está decodificado se mantiene el actual.
+        Devuelve True si cambió el cuadro.
+        """
+        if self._proximo_cambio is None or ahora - self._proximo_cambio > 1.0:
+            # Primera vez o la animación dejó de mostrarse un rato: seguir
+            # desde aquí en vez de saltar cuadros para alcanzar el reloj
+            self._proximo_cambio = ahora + self.retardo
+            return False
+        if ahora < self._proximo_cambio:
+            return False
+
+        siguiente = self._siguiente()
+        if siguiente is None:
+            return False
+        self.cuadro, self.retardo = siguiente
+        self._proximo_cambio += self.retardo
+        if self._proximo_cambio < ahora:
+            # El decodificador se atrasó: no acelerar para recuperar el tiempo
+            self._proximo_cambio = ahora + self.retardo
+        return True
+
+    def cerrar(self):
+        """
+        Detiene la decodificación y libera los cuadros.
+        """
+        with self._condicion:
+            self._cerrada = True
+            self._anillo.clear()
+            self._condicion.notify_all()
+
+    def _siguiente(self):
+        if self._completa:
+            with self._condicion:
+                # Mientras se decodifica la primera vuelta se espera a cada cuadro
+                if self._indice + 1 >= len(self._todos):
+                    if len(self._todos) < self.cuadros_totales:
+                        return None
+                    self._indice = -1
+                self._indice += 1
+                return self._todos[self._indice]
+        with self._condicion:
+            if not self._anillo:
+                return None
+            siguiente = self._anillo.popleft()
+            self._condicion.notify()
+            return siguiente
+
+    def _decodificar(self, indice):
+        self._img.seek(indice)
+        retardo = self._img.info.get("duration") or RETARDO_PREDETERMINADO_MS
+        if retardo < RETARDO_MINIMO_MS:
+            retardo = RETARDO_PREDETERMINADO_MS
+        con_alfa = "A" in self._img.mode or "transparency" in self._img.info
+        cuadro = self._img.convert("RGBA" if con_alfa else "RGB")
+        if cuadro.size != self.tamano:
+            # reducing_gap=1 reduce primero por un factor entero (mucho más
+            # barato que el filtro completo) para seguir el ritmo de la animación
+            cuadro = cuadro.resize(self.tamano, cargar_pillow().BILINEAR, reducing_gap=1.0)
+        superficie = pygame.image.frombuffer(cuadro.tobytes(), cuadro.size, cuadro.mode)
+        if pygame.display.get_surface() is not None:
+            superficie = superficie.convert_alpha() if con_alfa else superficie.convert()
+        return superficie, retardo / 1000.0
+
+    def _trabajar(self):
+        indice = 1 % self.cuadros_totales
+        try:
+            while True:
+                with self._condicion:
+                    while not self._cerrada and len(self._anillo) >= self.capacidad:
+                        self._condicion.wait()
+                    if self._cerrada or (self._completa and len(self._todos) >= self.cuadros_totales):
+                        return
+                cuadro = self._decodificar(indice)
+                with self._condicion:
+                    if self._cerrada:
+                        return
+                    if self._completa:
+                        self._todos.append(cuadro)
+                    else:
+                        self._anillo.append(cuadro)
+                indice = (indice + 1) % self.cuadros_totales
+        except (OSError, ValueError, EOFError, pygame.error) as e:
+            # Un cuadro dañado corta la animación: se repiten los cuadros ya
+            # decodificados o queda fija en el último cuadro válido
+            self.error = e
+            with self._condicion:
+                if self._completa:
+                    self.cuadros_totales = len(self._todos)
+        finally:
+            self._img.close()
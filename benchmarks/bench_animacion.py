@@ -0,0 +1,87 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+
+Benchmark de las recompensas animadas: genera un GIF largo, lo reproduce con
+AnimacionRecompensa al ritmo del archivo y mide cuadros perdidos, lo que
+tarda avanzar() en el hilo del juego y la memoria de cuadros retenida,
+comparada con decodificar la animación completa por adelantado.
+Requiere Pillow.
+
+    python benchmarks/bench_animacion.py --cuadros 300 --segundos 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from animacion import AnimacionRecompensa  # noqa: E402
+
+
+def generar_gif(ruta, cuadros, ancho, alto, retardo):
+    imagenes = [Image.new("RGB", (ancho, alto), (i * 7 % 256, 90, 255 - i % 256)) for i in range(cuadros)]
+    imagenes[0].save(ruta, save_all=True, append_images=imagenes[1:], duration=retardo, loop=0)
+
+
+def bytes_cuadro(superficie):
+    return superficie.get_pitch() * superficie.get_height()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de recompensas animadas.")
+    parser.add_argument("--cuadros", type=int, default=300)
+    parser.add_argument("--origen", type=int, nargs=2, default=[1600, 1200], metavar=("ANCHO", "ALTO"))
+    parser.add_argument("--pantalla", type=int, nargs=2, default=[800, 600], metavar=("ANCHO", "ALTO"))
+    parser.add_argument("--retardo", type=int, default=40, help="ms por cuadro del GIF")
+    parser.add_argument("--capacidad", type=int, default=8, help="cuadros del anillo")
+    parser.add_argument("--segundos", type=float, default=5.0)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.display.set_mode(args.pantalla)
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "animacion.gif")
+        generar_gif(ruta, args.cuadros, *args.origen, args.retardo)
+
+        inicio = time.perf_counter()
+        animacion = AnimacionRecompensa(ruta, *args.pantalla, capacidad=args.capacidad)
+        primer_cuadro = time.perf_counter() - inicio
+
+        # Bucle de juego a ~250 FPS: solo avanzar() corre en este hilo
+        cambios = 0
+        pico_retenidos = 0
+        peor_avanzar = 0.0
+        inicio = time.perf_counter()
+        while True:
+            ahora = time.perf_counter()
+            if ahora - inicio >= args.segundos:
+                break
+            cambios += animacion.avanzar(ahora)
+            peor_avanzar = max(peor_avanzar, time.perf_counter() - ahora)
+            pico_retenidos = max(pico_retenidos, len(animacion._anillo) + len(animacion._todos))
+            time.sleep(0.004)
+        animacion.cerrar()
+
+        esperados = int(args.segundos * 1000 / args.retardo)
+        tamano = bytes_cuadro(animacion.cuadro)
+        print(f"{args.cuadros} cuadros {args.origen[0]}x{args.origen[1]} -> {args.pantalla[0]}x{args.pantalla[1]}, "
+              f"{args.retardo} ms por cuadro")
+        print(f"Primer cuadro listo en {primer_cuadro * 1000:.1f} ms")
+        print(f"Cuadros mostrados en {args.segundos:.0f} s: {cambios} de {esperados}; "
+              f"peor avanzar() {peor_avanzar * 1000:.2f} ms")
+        print(f"Memoria de cuadros: anillo {(pico_retenidos + 1) * tamano / 2**20:.1f} MB, "
+              f"animación completa {args.cuadros * tamano / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+
+Benchmark del modo multiobjetivo: costo por paso de simulación (movimiento
+vectorizado + rejilla espacial) comparado con mover y comprobar cada
+objetivo en Python, y costo del dibujo con un solo Surface.blits().
+
+    python benchmarks/bench_multiobjetivo.py --objetivos 10 100 500 2000
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+
+from motor import PASO_SIMULACION, Sesion  # noqa: E402
+from multiobjetivo import coordenadas_blit, iniciar_nivel_multiobjetivo  # noqa: E402
+from vista import ALTO_LOGICO, ANCHO_LOGICO, Vista  # noqa: E402
+
+
+def paso_python(objetivos, x, y, radio, ancho, alto):
+    # Referencia: un objetivo lineal por tupla, movido y comprobado con math.hypot
+    sobre = -1
+    for i, objetivo in enumerate(objetivos):
+        px, py, vx, vy = objetivo
+        px += vx * PASO_SIMULACION
+        py += vy * PASO_SIMULACION
+        if not radio <= px <= ancho - radio:
+            vx = -vx
+        if not radio <= py <= alto - radio:
+            vy = -vy
+        objetivos[i] = (px, py, vx, vy)
+        if sobre < 0 and math.hypot(px - x, py - y) <= radio:
+            sobre = i
+    return sobre
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del modo multiobjetivo.")
+    parser.add_argument("--objetivos", type=int, nargs="+", default=[10, 100, 500, 2000])
+    parser.add_argument("--nivel", type=int, default=50)
+    parser.add_argument("--pasos", type=int, default=600)
+    parser.add_argument("--resolucion", type=int, nargs=2, default=[1920, 1080], metavar=("ANCHO", "ALTO"))
+    args = parser.parse_args()
+
+    pygame.display.init()
+    screen = pygame.display.set_mode(args.resolucion)
+    vista = Vista(*args.resolucion)
+
+    print(f"{'objetivos':>9} {'paso ms':>8} {'python ms':>10} {'dibujo ms':>10}")
+    for cantidad in args.objetivos:
+        sesion = Sesion(semilla=0)
+        sesion.nivel = args.nivel
+        motor = iniciar_nivel_multiobjetivo(sesion, cantidad, area=(ANCHO_LOGICO, ALTO_LOGICO))
+        paso = medir(lambda: motor.paso_fijo(True), args.pasos)
+
+        objetivos = [(x, y, vx, vy) for (x, y), (vx, vy) in zip(motor.posiciones.tolist(), motor.velocidades.tolist())]
+        x, y = motor.mira()
+        python = medir(lambda: paso_python(objetivos, x, y, motor.radio, ANCHO_LOGICO, ALTO_LOGICO), args.pasos)
+
+        sprite = pygame.Surface((2 * round(motor.radio * vista.factor),) * 2, pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(sprite, (255, 0, 0, 120), (sprite.get_width() // 2,) * 2, sprite.get_width() // 2)
+
+        def dibujar():
+            esquinas = coordenadas_blit(motor.posiciones_dibujo(), vista, sprite.get_width() // 2)
+            screen.blits([(sprite, esquina) for esquina in esquinas], doreturn=False)
+
+        dibujo = medir(dibujar, max(1, args.pasos // 10))
+        print(f"{cantidad:>9} {paso:>8.3f} {python:>10.3f} {dibujo:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+
+Benchmark de la tabla de puntajes: carga de score.json y actualización de
+récords con la tabla incremental (TablaPuntajes) frente al diccionario
+completo con ordenación (cargar_puntajes + obtener_mejores_puntajes).
+
+    python benchmarks/bench_puntajes.py --usuarios 1000000
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aimtrainer import obtener_mejores_puntajes  # noqa: E402
+from puntajes import TablaPuntajes, guardar_fusionado, leer_puntajes  # noqa: E402
+
+
+def generar_archivo(ruta, usuarios, semilla):
+    rng = random.Random(semilla)
+    with open(ruta, "w") as f:
+        json.dump({f"usuario{i}": rng.randint(0, 15000) for i in range(usuarios)}, f, indent=4)
+
+
+def medir(funcion, memoria=False):
+    if memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcion()
+    duracion = time.perf_counter() - inicio
+    pico = None
+    if memoria:
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return resultado, duracion, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la tabla de puntajes.")
+    parser.add_argument("--usuarios", type=int, default=1000000)
+    parser.add_argument("--actualizaciones", type=int, default=100000)
+    parser.add_argument("--actualizaciones-ordenando", type=int, default=5,
+                        help="actualizaciones a medir con la ordenación completa (lenta)")
+    parser.add_argument("--memoria", action="store_true", help="medir el pico de memoria de la carga (más lento)")
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.semilla)
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "score.json")
+        print(f"Generando {args.usuarios} usuarios...")
+        generar_archivo(ruta, args.usuarios, args.semilla)
+        usuario = f"usuario{rng.randrange(args.usuarios)}"
+
+        # Diccionario completo + ordenación en cada récord
+        puntajes, t_carga_dict, pico_dict = medir(lambda: leer_puntajes(ruta), args.memoria)
+        _, t_orden, _ = medir(lambda: obtener_mejores_puntajes(puntajes))
+        inicio = time.perf_counter()
+        for i in range(args.actualizaciones_ordenando):
+            puntajes[usuario] = 15001 + i
+            obtener_mejores_puntajes(puntajes)
+        t_act_dict = (time.perf_counter() - inicio) / max(1, args.actualizaciones_ordenando)
+        puntajes = None
+
+        # Tabla incremental cargada en streaming
+        tabla, t_carga_tabla, pico_tabla = medir(
+            lambda: TablaPuntajes.desde_archivo(ruta, seguidos=[usuario]), args.memoria)
+        inicio = time.perf_counter()
+        for i in range(args.actualizaciones):
+            tabla.actualizar(usuario, 15001 + i)
+            tabla.posicion(usuario)
+        t_act_tabla = (time.perf_counter() - inicio) / max(1, args.actualizaciones)
+
+        # Guardar un récord en disco (diario, sin reescribir la tabla)
+        _, t_guardar, _ = medir(lambda: guardar_fusionado({usuario: 15001 + args.actualizaciones}, ruta))
+
+    def memoria(pico):
+        return f"  pico {pico / 1e6:.1f} MB" if pico is not None else ""
+
+    print(f"Diccionario: carga {t_carga_dict:.3f} s{memoria(pico_dict)}, "
+          f"top-10 {t_orden * 1000:.1f} ms, récord {t_act_dict * 1000:.2f} ms")
+    print(f"TablaPuntajes: carga {t_carga_tabla:.3f} s{memoria(pico_tabla)}, "
+          f"récord + posición {t_act_tabla * 1e6:.2f} us")
+    print(f"Guardar un récord: {t_guardar * 1000:.2f} ms")
+    print(f"Posición final del usuario: {tabla.posicion(usuario)} de {len(tabla)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+
+Benchmark del dibujo: mide cada función de dibujo de aimtrainer.py
+(objetivo, puntajes, botones, ayuda, mira, imagen de recompensa) y un frame
+sintético completo de un nivel, sin ventana (SDL_VIDEODRIVER=dummy), para
+varias resoluciones, tolerancias, tamaños de la tabla de puntajes y de la
+imagen. Los resultados se escriben en JSON y se comparan con una base
+guardada: cada caso tiene un umbral (tiempo actual / tiempo base) a partir
+del cual se marca como regresión y el proceso termina con código 1.
+
+    python benchmarks/bench_render.py --salida resultados.json
+    python benchmarks/bench_render.py --base benchmarks/base_render.json
+    python benchmarks/bench_render.py --guardar-base benchmarks/base_render.json
+    python benchmarks/bench_render.py --filtro puntaje --resoluciones 1920x1080 --repeticiones 1
+
+La base incluida se midió en una sola máquina; los tiempos absolutos
+dependen del equipo, así que conviene regenerarla (--guardar-base) en la
+máquina donde se comparan los cambios antes de medirlos.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame  # noqa: E402
+
+from aimtrainer import (RenderizadorCapas, atlas_objetivos, cache_texto, dibujar_ayuda,  # noqa: E402
+                        dibujar_botones, dibujar_escena_estatica, dibujar_mira, dibujar_objetivo,
+                        dibujar_puntaje, obtener_fuente, renderizar_texto)
+from miniaturas import tamano_ajustado  # noqa: E402
+from vista import ALTO_LOGICO, ANCHO_LOGICO, Vista  # noqa: E402
+
+
+# Tiempo actual / tiempo base a partir del cual un caso es una regresión,
+# si la base no indica otro para ese caso
+UMBRAL_PREDETERMINADO = 1.3
+
+# Duración aproximada de cada ronda de medición
+DURACION_RONDA = 0.02
+
+
+def tamano(texto):
+    try:
+        ancho, alto = texto.lower().split("x")
+        return int(ancho), int(alto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"tamaño no válido: {texto!r} (use ANCHOxALTO)")
+
+
+def medir(funcion, rondas):
+    """
+    Ejecuta funcion en `rondas` rondas de ~DURACION_RONDA segundos y devuelve
+    el tiempo por llamada (mediana, mínimo y p95 de las rondas) en µs.
+    """
+    funcion()
+    llamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        transcurrido = time.perf_counter() - inicio
+        if transcurrido >= DURACION_RONDA / 4 or llamadas >= 1 << 20:
+            break
+        llamadas *= 4
+    llamadas = max(1, round(llamadas * DURACION_RONDA / max(transcurrido, 1e-9)))
+
+    tiempos = []
+    for _ in range(rondas):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        tiempos.append((time.perf_counter() - inicio) / llamadas * 1e6)
+    tiempos.sort()
+    return {
+        "mediana_us": round(statistics.median(tiempos), 3),
+        "min_us": round(tiempos[0], 3),
+        "p95_us": round(tiempos[min(len(tiempos) - 1, int(len(tiempos) * 0.95))], 3),
+        "llamadas": llamadas,
+    }
+
+
+def tabla_sintetica(cantidad, nombre_usuario):
+    tabla = [(f"jugador{i:04d}", 100000 - 37 * i) for i in range(cantidad)]
+    if cantidad:
+        tabla[cantidad // 2] = (nombre_usuario, tabla[cantidad // 2][1])
+    return tabla
+
+
+def imagen_sintetica(ancho, alto, vista):
+    # Imagen de recompensa ya escalada como la deja el precargador
+    superficie = pygame.Surface((ancho, alto)).convert()
+    for i in range(0, alto, 8):
+        superficie.fill((i % 256, 80, 255 - i % 256), (0, i, ancho, 8))
+    w, h = tamano_ajustado(ancho, alto, vista.ancho, vista.alto)
+    if (w, h) != (ancho, alto):
+        superficie = pygame.transform.smoothscale(superficie, (w, h))
+    return superficie, ((vista.ancho - w) // 2, (vista.alto - h) // 2)
+
+
+def casos_resolucion(resolucion, args):
+    """
+    Genera (nombre, función) para todos los casos a una resolución.
+    """
+    screen = pygame.display.set_mode(resolucion)
+    vista = Vista(*resolucion)
+    etiqueta = f"{resolucion[0]}x{resolucion[1]}"
+    fuente = obtener_fuente("Arial", vista.fuente(24))
+    nombre_usuario = "jugador"
+    btn_change_rect = vista.rect(20, 20, 180, 40)
+    btn_skip_rect = vista.rect(ANCHO_LOGICO - 200, 20, 180, 40)
+    centro = vista.punto(ANCHO_LOGICO / 2, ALTO_LOGICO / 2)
+
+    for tolerancia in args.tolerancias:
+        atlas_objetivos.obtener(tolerancia, vista.factor)
+        yield (f"objetivo/tol={tolerancia:g}/{etiqueta}",
+               lambda t=tolerancia: dibujar_objetivo(screen, *centro, t, vista.factor))
+
+    yield f"mira/{etiqueta}", lambda: dibujar_mira(screen, *centro, vista.factor)
+    yield f"botones/{etiqueta}", lambda: dibujar_botones(screen, fuente, btn_change_rect, btn_skip_rect)
+    yield f"ayuda/{etiqueta}", lambda: dibujar_ayuda(screen, fuente, vista)
+
+    for cantidad in args.tablas:
+        tabla = tabla_sintetica(cantidad, nombre_usuario)
+        yield (f"puntaje/tabla={cantidad}/{etiqueta}",
+               lambda t=tabla: dibujar_puntaje(screen, fuente, 1234, 5678, nombre_usuario, vista, t, (37, 1000)))
+
+        # Sin caché de texto: el costo de redibujar la tabla cuando cambian
+        # los puntajes (todas las cadenas se renderizan de nuevo)
+        def sin_cache(t=tabla):
+            cache_texto.limpiar()
+            dibujar_puntaje(screen, fuente, 1234, 5678, nombre_usuario, vista, t, (37, 1000))
+        yield f"puntaje_sin_cache/tabla={cantidad}/{etiqueta}", sin_cache
+
+    for ancho, alto in args.imagenes:
+        imagen, posicion = imagen_sintetica(ancho, alto, vista)
+        yield f"imagen/{ancho}x{alto}/{etiqueta}", lambda i=imagen, p=posicion: screen.blit(i, p)
+
+    # Frame de nivel completo como en el bucle del juego: capa estática con
+    # imagen, objetivo y tabla de 10, y encima la mira y el texto de estado
+    tabla = tabla_sintetica(10, nombre_usuario)
+    ancho, alto = args.imagenes[-1]
+    imagen = imagen_sintetica(ancho, alto, vista)
+    tolerancia = args.tolerancias[0]
+
+    def escena(superficie):
+        dibujar_escena_estatica(superficie, fuente, btn_change_rect, btn_skip_rect, vista, 1234, 5678,
+                                nombre_usuario, tabla, objetivo=(ANCHO_LOGICO / 2, ALTO_LOGICO / 2, tolerancia),
+                                imagen=imagen, posicion=(37, 1000))
+
+    yield f"escena_estatica/{etiqueta}", lambda: escena(screen)
+
+    for modo, completo in (("rects", False), ("completo", True)):
+        renderizador = RenderizadorCapas(screen, render_completo=completo)
+        escena(renderizador.crear_capa("con_imagen"))
+        estado = {"frame": 0}
+
+        def frame(renderizador=renderizador, estado=estado):
+            # La mira se mueve cada frame y el tiempo en objetivo cambia el texto
+            n = estado["frame"] = (estado["frame"] + 1) % 120
+            renderizador.restaurar("con_imagen")
+            x, y = vista.punto(ANCHO_LOGICO / 2 + n % 40 - 20, ALTO_LOGICO / 2 + n // 3 - 20)
+            renderizador.marcar(dibujar_mira(screen, x, y, vista.factor))
+            texto = renderizar_texto(fuente, f"Nivel 1  Tiempo: {n / 60:.2f}/2.00 seg", (255, 255, 255))
+            renderizador.marcar(screen.blit(texto, vista.punto(10, ALTO_LOGICO - 30)))
+            renderizador.presentar()
+        yield f"frame/{modo}/{etiqueta}", frame
+
+    # Frame en el que se rehace la capa estática (cambio de nivel, de
+    # puntajes o cuadro nuevo de una animación)
+    renderizador = RenderizadorCapas(screen)
+
+    def frame_capa():
+        renderizador.descartar_capa("con_imagen")
+        escena(renderizador.crear_capa("con_imagen"))
+        renderizador.restaurar("con_imagen")
+        renderizador.marcar(dibujar_mira(screen, *centro, vista.factor))
+        renderizador.presentar()
+    yield f"frame/capa/{etiqueta}", frame_capa
+
+
+def cargar_base(ruta):
+    try:
+        with open(ruta, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"umbral_predeterminado": UMBRAL_PREDETERMINADO, "resultados": {}}
+
+
+def comparar(resultados, base):
+    """
+    Compara con la base y devuelve la lista de (nombre, razón, umbral) que la superan.
+    """
+    umbral_predeterminado = base.get("umbral_predeterminado", UMBRAL_PREDETERMINADO)
+    regresiones = []
+    for nombre, resultado in resultados.items():
+        referencia = base.get("resultados", {}).get(nombre)
+        if referencia is None:
+            resultado["razon"] = None
+            continue
+        razon = resultado["mediana_us"] / referencia["mediana_us"]
+        umbral = referencia.get("umbral", umbral_predeterminado)
+        resultado["razon"] = round(razon, 3)
+        resultado["umbral"] = umbral
+        if razon > umbral:
+            regresiones.append((nombre, razon, umbral))
+    return regresiones
+
+
+def entorno():
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "sdl": ".".join(map(str, pygame.get_sdl_version())),
+        "plataforma": platform.platform(),
+        "driver": pygame.display.get_driver(),
+    }
+
+
+def guardar_json(ruta, datos):
+    temporal = ruta + ".tmp"
+    with open(temporal, "w") as f:
+        json.dump(datos, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(temporal, ruta)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las funciones de dibujo.")
+    parser.add_argument("--resoluciones", type=tamano, nargs="+", default=[(800, 600), (1920, 1080)])
+    parser.add_argument("--tolerancias", type=float, nargs="+", default=[2.0, 12.0, 24.0])
+    parser.add_argument("--tablas", type=int, nargs="+", default=[0, 10, 50],
+                        help="cantidad de filas de la tabla de puntajes")
+    parser.add_argument("--imagenes", type=tamano, nargs="+", default=[(320, 240), (1024, 768), (3840, 2160)],
+                        help="tamaño original de la imagen de recompensa")
+    parser.add_argument("--rondas", type=int, default=15)
+    parser.add_argument("--repeticiones", type=int, default=3,
+                        help="veces que se repite la serie completa; se toma la mediana de cada caso")
+    parser.add_argument("--filtro", default="", help="solo los casos cuyo nombre contiene este texto")
+    parser.add_argument("--salida", help="escribe los resultados en este JSON")
+    parser.add_argument("--base", help="compara con esta base y termina con código 1 si hay regresiones")
+    parser.add_argument("--guardar-base", metavar="RUTA",
+                        help="guarda los resultados como base (conserva los umbrales ya definidos)")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+
+    # Repetir la serie completa (y no cada caso seguido) reparte entre todos
+    # los casos las interferencias pasajeras de otros procesos
+    series = {}
+    for _ in range(max(1, args.repeticiones)):
+        for resolucion in args.resoluciones:
+            for nombre, funcion in casos_resolucion(resolucion, args):
+                if args.filtro in nombre:
+                    series.setdefault(nombre, []).append(medir(funcion, args.rondas))
+    resultados = {}
+    for nombre, medidas in series.items():
+        resultados[nombre] = {
+            "mediana_us": statistics.median(m["mediana_us"] for m in medidas),
+            "min_us": min(m["min_us"] for m in medidas),
+            "p95_us": max(m["p95_us"] for m in medidas),
+            "llamadas": medidas[0]["llamadas"],
+        }
+
+    regresiones = []
+    if args.base:
+        regresiones = comparar(resultados, cargar_base(args.base))
+
+    print(f"{'caso':44s} {'mediana µs':>11s} {'mín µs':>9s} {'p95 µs':>9s} {'vs base':>8s}")
+    for nombre, resultado in resultados.items():
+        razon = resultado.get("razon")
+        marca = ""
+        if razon is not None:
+            marca = f"{razon:7.2f}x" + (" REGRESIÓN" if razon > resultado["umbral"] else "")
+        print(f"{nombre:44s} {resultado['mediana_us']:11.1f} {resultado['min_us']:9.1f} "
+              f"{resultado['p95_us']:9.1f} {marca}")
+
+    if args.salida:
+        guardar_json(args.salida, {"entorno": entorno(), "resultados": resultados})
+
+    if args.guardar_base:
+        base = cargar_base(args.guardar_base)
+        base["entorno"] = entorno()
+        for nombre, resultado in resultados.items():
+            entrada = base["resultados"].setdefault(nombre, {})
+            entrada["mediana_us"] = resultado["mediana_us"]
+        guardar_json(args.guardar_base, base)
+        print(f"Base guardada en {args.guardar_base} ({len(resultados)} casos)")
+
+    pygame.quit()
+    if regresiones:
+        print(f"{len(regresiones)} casos más lentos que la base:")
+        for nombre, razon, umbral in regresiones:
+            print(f"  {nombre}: {razon:.2f}x (umbral {umbral:.2f}x)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+
+Benchmark del servicio de puntajes en localhost: cientos de estaciones
+simuladas envían récords a la vez y se mide cuánto tarda cada uno en volver
+como delta de la clasificación. Al final comprueba que un ClientePuntajes
+del juego recibe la tabla y vuelve a los puntajes locales si el servicio cae.
+
+    python benchmarks/bench_servicio.py --clientes 300
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from servicio_puntajes import ClientePuntajes, ServicioPuntajes  # noqa: E402
+
+
+async def conectar(puerto, usuario):
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    escritor.write((json.dumps({"tipo": "hola", "usuario": usuario}) + "\n").encode())
+    await lector.readline()
+    return lector, escritor
+
+
+def enviar(escritor, usuario, puntaje):
+    escritor.write((json.dumps({"tipo": "puntaje", "usuario": usuario, "puntaje": puntaje}) + "\n").encode())
+
+
+async def estacion(indice, puerto, records, rng, recibidos):
+    """
+    Estación de carga: envía récords aleatorios y lee todos los deltas.
+    """
+    usuario = f"estacion{indice}"
+    lector, escritor = await conectar(puerto, usuario)
+
+    async def leer():
+        while await lector.readline():
+            recibidos[0] += 1
+
+    lectura = asyncio.create_task(leer())
+    puntaje = 0
+    for _ in range(records):
+        await asyncio.sleep(rng.uniform(0.0, 0.5))
+        puntaje += rng.randint(1, 1000)
+        enviar(escritor, usuario, puntaje)
+        await escritor.drain()
+    escritor.close()
+    lectura.cancel()
+
+
+async def sonda(puerto, mediciones, latencias):
+    """
+    Estación que siempre bate el récord global y mide cuánto tarda en recibirlo como delta.
+    """
+    usuario = "sonda"
+    lector, escritor = await conectar(puerto, usuario)
+    for k in range(mediciones):
+        await asyncio.sleep(0.1)
+        puntaje = 10 ** 6 + k
+        inicio = time.perf_counter()
+        enviar(escritor, usuario, puntaje)
+        await escritor.drain()
+        while True:
+            mensaje = json.loads(await lector.readline())
+            if mensaje["tipo"] == "delta" and dict(mensaje["cambios"]).get(usuario) == puntaje:
+                break
+        latencias.append(time.perf_counter() - inicio)
+    escritor.close()
+
+
+def percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(p / 100.0 * len(valores)))]
+
+
+async def principal(args):
+    with tempfile.TemporaryDirectory() as directorio:
+        servicio = ServicioPuntajes(os.path.join(directorio, "score_global.json"),
+                                    os.path.join(directorio, "sesiones.jsonl"),
+                                    intervalo_lote=args.lote, intervalo_instantanea=1.0)
+        puerto = await servicio.iniciar("127.0.0.1", 0)
+
+        rng = random.Random(args.semilla)
+        latencias = []
+        recibidos = [0]
+        inicio = time.perf_counter()
+        await asyncio.gather(
+            sonda(puerto, args.mediciones, latencias),
+            *(estacion(i, puerto, args.records, random.Random(rng.random()), recibidos)
+              for i in range(args.clientes))
+        )
+        duracion = time.perf_counter() - inicio
+        print(f"{args.clientes} estaciones, {args.clientes * args.records} récords en {duracion:.2f} s: "
+              f"{servicio.lotes} lotes, {recibidos[0]} deltas entregados")
+        print(f"Latencia récord -> delta: p50 {percentil(latencias, 50) * 1000:.1f} ms  "
+              f"p95 {percentil(latencias, 95) * 1000:.1f} ms  máx {max(latencias) * 1000:.1f} ms "
+              f"(lote cada {args.lote * 1000:.0f} ms)")
+
+        # Cliente del juego: recibe la tabla global y la pierde si el servicio cae
+        cliente = ClientePuntajes(f"127.0.0.1:{puerto}", "jugador", reintento=0.2)
+        cliente.actualizar("jugador", 2 * 10 ** 6)
+        cliente.enviar_resumen({"puntaje": 2 * 10 ** 6, "nivel": 100})
+        limite = time.monotonic() + 5.0
+        while time.monotonic() < limite:
+            await asyncio.sleep(0.05)
+            clasificacion = cliente.clasificacion()
+            if clasificacion is not None and clasificacion[1][0] == 1:
+                break
+        print(f"ClientePuntajes: posición {clasificacion[1] if clasificacion else None}")
+
+        await servicio.cerrar()
+        await asyncio.sleep(0.5)
+        print(f"Tras cerrar el servicio: conectado={cliente.conectado}, clasificación={cliente.clasificacion()}")
+        cliente.detener()
+        with open(servicio.ruta) as f:
+            print(f"Instantánea: {len(json.load(f))} usuarios")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del servicio de puntajes.")
+    parser.add_argument("--clientes", type=int, default=300)
+    parser.add_argument("--records", type=int, default=10)
+    parser.add_argument("--mediciones", type=int, default=40)
+    parser.add_argument("--lote", type=float, default=0.25)
+    parser.add_argument("--semilla", type=int, default=0)
+    asyncio.run(principal(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+
+Estadísticas de precisión calculadas en línea mientras se juega.
+
+Cada nivel acumula, paso a paso y en memoria constante: la proporción del
+tiempo en objetivo, la media y la varianza de la distancia al centro
+(Welford), y la distribución de la duración de las rachas en objetivo y del
+tiempo que se tarda en volver al objetivo tras salir (bocetos de cuantiles
+con cubetas logarítmicas). Los bocetos de varios niveles se suman, así que
+las de la sesión salen de combinar las de sus niveles; una sesión de horas
+ocupa lo mismo que una de minutos.
+
+Al terminar, cada sesión se añade como una línea JSON a estadisticas.jsonl,
+junto a score.json:
+
+    python estadisticas.py                      # resumen de todas las sesiones
+    python estadisticas.py --usuario ana
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from array import array
+
+
+ARCHIVO_ESTADISTICAS = "estadisticas.jsonl"
+
+
+class Welford:
+    """
+    Media y varianza en una pasada (algoritmo de Welford), combinables
+    entre acumuladores con la fórmula de Chan.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.media = 0.0
+        self.m2 = 0.0
+
+    def agregar(self, x):
+        self.n += 1
+        delta = x - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (x - self.media)
+
+    def combinar(self, otro):
+        if otro.n == 0:
+            return
+        n = self.n + otro.n
+        delta = otro.media - self.media
+        self.media += delta * otro.n / n
+        self.m2 += otro.m2 + delta * delta * self.n * otro.n / n
+        self.n = n
+
+    @property
+    def varianza(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def desviacion(self):
+        return math.sqrt(self.varianza)
+
+    def a_lista(self):
+        return [self.n, self.media, self.m2]
+
+    @classmethod
+    def desde_lista(cls, datos):
+        acumulador = cls()
+        acumulador.n, acumulador.media, acumulador.m2 = int(datos[0]), float(datos[1]), float(datos[2])
+        return acumulador
+
+
+class BocetoCuantiles:
+    """
+    Cuantiles aproximados de valores positivos (duraciones en segundos) con
+    error relativo acotado: cada valor cuenta en la cubeta i tal que
+    minimo * gamma^(i-1) < valor <= minimo * gamma^i, con gamma = (1 + error)
+    / (1 - error). Las cubetas son un array fijo, así que la memoria no
+    depende de cuántos valores se agreguen; los menores que `minimo` caen
+    en la primera y los mayores que el rango, en la última.
+    """
+
+    def __init__(self, error=0.02, minimo=0.001, cubetas=512):
+        self.error = error
+        self.minimo = minimo
+        self.gamma = (1.0 + error) / (1.0 - error)
+        self._log_gamma = math.log(self.gamma)
+        self.conteos = array("Q", bytes(8 * cubetas))
+        self.n = 0
+        self.suma = 0.0
+        self.menor = math.inf
+        self.mayor = 0.0
+
+    def agregar(self, valor):
+        self.n += 1
+        self.suma += valor
+        if valor < self.menor:
+            self.menor = valor
+        if valor > self.mayor:
+            self.mayor = valor
+        if valor <= self.minimo:
+            i = 0
+        else:
+            i = min(math.ceil(math.log(valor / self.minimo) / self._log_gamma), len(self.conteos) - 1)
+        self.conteos[i] += 1
+
+    def combinar(self, otro):
+        if (otro.error, otro.minimo, len(otro.conteos)) != (self.error, self.minimo, len(self.conteos)):
+            raise ValueError("los bocetos tienen parámetros distintos")
+        for i, conteo in enumerate(otro.conteos):
+            if conteo:
+                self.conteos[i] += conteo
+        self.n += otro.n
+        self.suma += otro.suma
+        self.menor = min(self.menor, otro.menor)
+        self.mayor = max(self.mayor, otro.mayor)
+
+    @property
+    def media(self):
+        return self.suma / self.n if self.n else 0.0
+
+    def cuantil(self, q):
+        """
+        Valor aproximado del cuantil q (0..1), o 0.0 si no hay valores.
+        """
+        if self.n == 0:
+            return 0.0
+        rango = q * (self.n - 1)
+        acumulado = 0
+        for i, conteo in enumerate(self.conteos):
+            acumulado += conteo
+            if acumulado > rango:
+                break
+        # Punto de la cubeta con error relativo máximo `error` hacia ambos lados
+        valor = self.minimo * 2.0 * self.gamma ** i / (self.gamma + 1.0) if i else self.minimo
+        return min(max(valor, self.menor), self.mayor)
+
+    def a_dict(self):
+        """
+        Forma compacta para JSON: solo las cubetas con valores.
+        """
+        return {
+            "error": self.error,
+            "minimo": self.minimo,
+            "cubetas": len(self.conteos),
+            "n": self.n,
+            "suma": self.suma,
+            "menor": self.menor if self.n else 0.0,
+            "mayor": self.mayor,
+            "conteos": [[i, conteo] for i, conteo in enumerate(self.conteos) if conteo],
+        }
+
+    @classmethod
+    def desde_dict(cls, datos):
+        boceto = cls(datos["error"], datos["minimo"], datos["cubetas"])
+        for i, conteo in datos["conteos"]:
+            boceto.conteos[i] = conteo
+        boceto.n = datos["n"]
+        boceto.suma = datos["suma"]
+        boceto.menor = datos["menor"] if boceto.n else math.inf
+        boceto.mayor = datos["mayor"]
+        return boceto
+
+
+class EstadisticasPrecision:
+    """
+    Estadísticas de precisión de un nivel o de una sesión.
+
+    El motor llama a registrar_paso() en cada paso fijo y, en los cambios,
+    a racha_terminada() y objetivo_alcanzado() con el instante exacto en
+    que la mira salió o volvió a entrar (ver MotorNivel._seguir_entrada).
+    El tiempo de readquisición va desde que termina una racha hasta que
+    empieza la siguiente; el primer acierto del nivel no cuenta.
+    """
+
+    def __init__(self):
+        self.tiempo_total = 0.0
+        self.tiempo_en_objetivo = 0.0
+        self.distancia = Welford()
+        self.rachas = BocetoCuantiles()
+        self.readquisicion = BocetoCuantiles()
+        self._salida = None
+
+    def registrar_paso(self, duracion, dentro, distancia):
+        """
+        Suma un paso de `duracion` segundos, `dentro` de ellos en objetivo,
+        con la mira a `distancia` del centro al final del paso.
+        """
+        self.tiempo_total += duracion
+        self.tiempo_en_objetivo += dentro
+        if distancia != math.inf:
+            self.distancia.agregar(distancia)
+
+    def racha_terminada(self, duracion, instante):
+        self.rachas.agregar(duracion)
+        self._salida = instante
+
+    def objetivo_alcanzado(self, instante):
+        if self._salida is not None:
+            self.readquisicion.agregar(instante - self._salida)
+            self._salida = None
+
+    def terminar(self, racha_actual=0.0):
+        """
+        Cierra el nivel: la racha en curso (la que lo completó) cuenta como terminada.
+        """
+        if racha_actual > 0.0:
+            self.rachas.agregar(racha_actual)
+        self._salida = None
+
+    def combinar(self, otras):
+        self.tiempo_total += otras.tiempo_total
+        self.tiempo_en_objetivo += otras.tiempo_en_objetivo
+        self.distancia.combinar(otras.distancia)
+        self.rachas.combinar(otras.rachas)
+        self.readquisicion.combinar(otras.readquisicion)
+
+    @property
+    def proporcion_en_objetivo(self):
+        return self.tiempo_en_objetivo / self.tiempo_total if self.tiempo_total else 0.0
+
+    def resumen(self):
+        """
+        Cifras para mostrar o guardar (segundos y unidades lógicas, redondeadas).
+        """
+        return {
+            "segundos": round(self.tiempo_total, 3),
+            "en_objetivo": round(self.proporcion_en_objetivo, 4),
+            "distancia_media": round(self.distancia.media, 3),
+            "distancia_desviacion": round(self.distancia.desviacion, 3),
+            "rachas": self.rachas.n,
+            "racha_p50": round(self.rachas.cuantil(0.5), 3),
+            "racha_p90": round(self.rachas.cuantil(0.9), 3),
+            "racha_maxima": round(self.rachas.mayor, 3),
+            "readquisiciones": self.readquisicion.n,
+            "readquisicion_p50": round(self.readquisicion.cuantil(0.5), 3),
+            "readquisicion_p90": round(self.readquisicion.cuantil(0.9), 3),
+        }
+
+    def a_dict(self):
+        return {
+            "tiempo_total": self.tiempo_total,
+            "tiempo_en_objetivo": self.tiempo_en_objetivo,
+            "distancia": self.distancia.a_lista(),
+            "rachas": self.rachas.a_dict(),
+            "readquisicion": self.readquisicion.a_dict(),
+        }
+
+    @classmethod
+    def desde_dict(cls, datos):
+        estadisticas = cls()
+        estadisticas.tiempo_total = datos["tiempo_total"]
+        estadisticas.tiempo_en_objetivo = datos["tiempo_en_objetivo"]
+        estadisticas.distancia = Welford.desde_lista(datos["distancia"])
+        estadisticas.rachas = BocetoCuantiles.desde_dict(datos["rachas"])
+        estadisticas.readquisicion = BocetoCuantiles.desde_dict(datos["readquisicion"])
+        return estadisticas
+
+
+def guardar_sesion(usuario, inicio, sesion, ruta=ARCHIVO_ESTADISTICAS):
+    """
+    Añade a `ruta` una línea con las estadísticas de la sesión (Sesion con
+    estadísticas): las acumuladas, combinables con las de otras sesiones, y
+    el resumen de cada nivel.
+    """
+    registro = {
+        "usuario": usuario,
+        "inicio": inicio,
+        "duracion": round(time.time() - inicio, 3),
+        "puntaje": sesion.puntaje,
+        "sesion": sesion.estadisticas.a_dict(),
+        "niveles": sesion.estadisticas_niveles,
+    }
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.write(json.dumps(registro, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+
+def iterar_sesiones(ruta=ARCHIVO_ESTADISTICAS):
+    """
+    Registros guardados por guardar_sesion(), en orden; las líneas dañadas se saltan.
+    """
+    with open(ruta, encoding="utf-8") as f:
+        for linea in f:
+            try:
+                yield json.loads(linea)
+            except ValueError:
+                continue
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resume las estadísticas de precisión guardadas.")
+    parser.add_argument("archivo", nargs="?", default=ARCHIVO_ESTADISTICAS)
+    parser.add_argument("--usuario", help="solo las sesiones de este usuario")
+    args = parser.parse_args()
+    if not os.path.exists(args.archivo):
+        parser.error(f"no existe {args.archivo}")
+
+    total = EstadisticasPrecision()
+    sesiones = 0
+    for registro in iterar_sesiones(args.archivo):
+        if args.usuario is not None and registro.get("usuario") != args.usuario:
+            continue
+        total.combinar(EstadisticasPrecision.desde_dict(registro["sesion"]))
+        sesiones += 1
+    resumen = total.resumen()
+    print(f"{sesiones} sesiones, {resumen['segundos'] / 60:.1f} min de juego")
+    print(f"En objetivo: {100 * resumen['en_objetivo']:.1f}% del tiempo")
+    print(f"Distancia al centro: {resumen['distancia_media']:.2f} ± {resumen['distancia_desviacion']:.2f}")
+    print(f"Rachas: {resumen['rachas']}, mediana {resumen['racha_p50']:.2f} s, p90 {resumen['racha_p90']:.2f} s, "
+          f"máxima {resumen['racha_maxima']:.2f} s")
+    print(f"Readquisición: {resumen['readquisiciones']}, mediana {resumen['readquisicion_p50']:.2f} s, "
+          f"p90 {resumen['readquisicion_p90']:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
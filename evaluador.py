@@ -0,0 +1,243 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+
+Evaluación por lotes de curvas de dificultad con NumPy.
+
+Aplica las reglas de MotorNivel a muchas trazas de entrada a la vez, con
+dos simplificaciones para poder vectorizar: la mira se mira solo al final
+de cada paso fijo (MotorNivel integra el recorrido dentro del paso) y el
+retroceso horizontal se sortea con generadores propios, con la misma
+distribución que generar_patron() pero no los mismos valores. Las tasas de
+aprobación son por lo tanto estimaciones de las del juego, no una
+reproducción paso a paso de una partida concreta.
+
+Las sesiones se procesan en bloques de `bloque` sesiones para acotar la
+memoria, en serie o repartidos entre procesos:
+
+    python evaluador.py --trazas trazas.npy --procesos 4
+"""
+
+import argparse
+import math
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from motor import FACTOR_SHAKE, NIVELES_TOTALES, PASO_SIMULACION, calcular_parametros_nivel
+
+
+# Sesiones por bloque: cada sesión de 100 niveles y 10 s ocupa unos 5 MB de
+# arrays intermedios
+BLOQUE_SESIONES = 16
+
+# Columnas de la tabla de parámetros, en el orden de calcular_parametros_nivel
+COLUMNAS = ("tolerancia", "recoil_y", "recoil_x_lower", "recoil_x_upper", "tiempo_objetivo")
+
+
+def tabla_parametros(niveles_totales=NIVELES_TOTALES, diametro_inicial=None):
+    """
+    Devuelve la curva de dificultad actual como un array (niveles, 5) con las COLUMNAS.
+    """
+    return np.array([
+        calcular_parametros_nivel(nivel, niveles_totales, diametro_inicial)
+        for nivel in range(1, niveles_totales + 1)
+    ], dtype=np.float64)
+
+
+def evaluar(movimientos, parametros, botones=None, semilla=0, factor_shake=FACTOR_SHAKE,
+            paso=PASO_SIMULACION, procesos=1, bloque=BLOQUE_SESIONES, primera_sesion=0):
+    """
+    Evalúa una tabla de parámetros contra muchas trazas de entrada a la vez.
+
+    movimientos: array (sesiones, niveles, pasos, 2) con el movimiento del
+    mouse en cada paso fijo de simulación, o (sesiones, pasos, 2) para usar la
+    misma traza en todos los niveles.
+    parametros: array (niveles, 5) con las COLUMNAS de tabla_parametros().
+    botones: array booleano con la forma de movimientos sin el último eje
+    (None = botón siempre presionado).
+
+    El retroceso horizontal de cada sesión sale de su propio generador,
+    derivado de la semilla y del número de sesión (primera_sesion + i), así
+    que el resultado no depende de cómo se repartan las sesiones entre
+    bloques, procesos o llamadas.
+
+    Devuelve un diccionario con:
+      "tasa_aprobacion": (niveles,) fracción de sesiones que completan cada nivel
+      "aprobado": (sesiones, niveles) bool
+      "paso_completado": (sesiones, niveles) paso en el que se completó, o -1
+      "racha_maxima": (sesiones, niveles) racha más larga en pasos sobre el objetivo
+    """
+    parametros = np.asarray(parametros, dtype=np.float64)
+    sesiones = len(movimientos)
+    bloque = max(1, bloque)
+
+    def bloques():
+        # Cada bloque se convierte al usarse, así que movimientos puede ser
+        # un array mapeado (np.load(..., mmap_mode="r")) más grande que la memoria
+        for a in range(0, sesiones, bloque):
+            b = min(a + bloque, sesiones)
+            yield (np.asarray(movimientos[a:b], dtype=np.float64), parametros,
+                   None if botones is None else np.asarray(botones[a:b], dtype=bool),
+                   semillas_sesiones(semilla, primera_sesion + a, primera_sesion + b), factor_shake, paso)
+
+    if procesos <= 1 or sesiones <= bloque:
+        return combinar_resultados([_evaluar_bloque(*args) for args in bloques()])
+
+    # Como mucho dos bloques por proceso en vuelo
+    parciales = []
+    pendientes = deque()
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        for args in bloques():
+            if len(pendientes) >= 2 * procesos:
+                parciales.append(pendientes.popleft().result())
+            pendientes.append(ejecutor.submit(_evaluar_bloque, *args))
+        parciales.extend(futuro.result() for futuro in pendientes)
+    return combinar_resultados(parciales)
+
+
+def combinar_resultados(parciales):
+    """
+    Une los resultados de evaluar() de sesiones consecutivas.
+    """
+    resultado = {
+        clave: np.concatenate([p[clave] for p in parciales])
+        for clave in ("aprobado", "paso_completado", "racha_maxima")
+    }
+    resultado["tasa_aprobacion"] = resultado["aprobado"].mean(axis=0)
+    return resultado
+
+
+def semillas_sesiones(semilla, inicio, fin):
+    """
+    Semillas de las sesiones inicio..fin-1: los hijos de SeedSequence(semilla)
+    con esos índices, como los que daría spawn().
+    """
+    return [np.random.SeedSequence(semilla, spawn_key=(i,)) for i in range(inicio, fin)]
+
+
+def pasos_requeridos(tiempo_objetivo, paso=PASO_SIMULACION):
+    """
+    Número de pasos seguidos sobre el objetivo para completar el nivel, con
+    la racha sumada paso a paso en coma flotante: con 1/60 s puede necesitar
+    un paso más de lo que indica la división exacta.
+    """
+    acumulado = 0.0
+    pasos = 0
+    while acumulado < tiempo_objetivo:
+        acumulado += paso
+        pasos += 1
+    return pasos
+
+
+def _evaluar_bloque(movimientos, parametros, botones, semillas, factor_shake, paso):
+    niveles = parametros.shape[0]
+    pasos = movimientos.shape[-2]
+    tolerancia, recoil_y, recoil_x_lower, recoil_x_upper, tiempo_objetivo = parametros.T
+
+    # Retroceso: deriva vertical constante y horizontal uniforme por paso
+    azar = np.stack([np.random.default_rng(s).random((niveles, pasos)) for s in semillas])
+    ancho = (recoil_x_upper - recoil_x_lower)[None, :, None]
+    retroceso_x = np.cumsum((recoil_x_lower[None, :, None] + ancho * azar) * factor_shake, axis=2)
+    retroceso_y = recoil_y[None, :, None] * factor_shake * np.arange(1, pasos + 1)[None, None, :]
+
+    # Compensación acumulada del mouse; una traza por sesión se reutiliza en todos los niveles
+    compensacion = np.cumsum(movimientos, axis=-2)
+    if compensacion.ndim == 3:
+        compensacion = compensacion[:, None, :, :]
+
+    distancia = np.hypot(compensacion[..., 0] + retroceso_x, compensacion[..., 1] + retroceso_y)
+    en_objetivo = distancia <= tolerancia[None, :, None]
+    if botones is not None:
+        en_objetivo &= botones[:, None, :] if botones.ndim == 2 else botones
+
+    # Longitud de la racha actual en cada paso: pasos seguidos sobre el objetivo
+    indices = np.arange(1, pasos + 1)
+    ultimo_fallo = np.maximum.accumulate(np.where(en_objetivo, 0, indices), axis=2)
+    racha = np.where(en_objetivo, indices - ultimo_fallo, 0)
+
+    requeridos = np.array([pasos_requeridos(t, paso) for t in tiempo_objetivo], dtype=np.int64)
+    logrado = racha >= requeridos[None, :, None]
+    aprobado = logrado.any(axis=2)
+    paso_completado = np.where(aprobado, logrado.argmax(axis=2) + 1, -1)
+
+    return {
+        "aprobado": aprobado,
+        "paso_completado": paso_completado,
+        "racha_maxima": racha.max(axis=2),
+    }
+
+
+def trazas_sinteticas(sesiones, pasos, parametros, semilla=0, ganancia=1.0, ruido=1.0,
+                      factor_shake=FACTOR_SHAKE, primera_sesion=0):
+    """
+    Genera trazas de prueba (sesiones, niveles, pasos, 2) de un jugador que
+    contrarresta con cierta ganancia la deriva media del retroceso y tiembla
+    alrededor de su posición (desviación `ruido`, sin acumularse). Lo que
+    queda es la parte aleatoria del retroceso horizontal, que crece con el
+    nivel: los primeros niveles se aprueban y los últimos no. Sirven para
+    probar el evaluador cuando no hay trazas grabadas; cada sesión sale de su
+    propia semilla, como en evaluar().
+    """
+    niveles = parametros.shape[0]
+    deriva = np.zeros((niveles, 2))
+    deriva[:, 0] = -(parametros[:, 2] + parametros[:, 3]) / 2 * factor_shake * ganancia
+    deriva[:, 1] = -parametros[:, 1] * factor_shake * ganancia
+    trazas = np.empty((sesiones, niveles, pasos, 2))
+    for i, s in enumerate(semillas_sesiones(semilla, primera_sesion, primera_sesion + sesiones)):
+        # Posición temblorosa: el movimiento de cada paso es la diferencia
+        # entre dos desviaciones independientes
+        temblor = np.random.default_rng(s).normal(0.0, ruido, (niveles, pasos + 1, 2))
+        trazas[i] = deriva[:, None, :] + np.diff(temblor, axis=1)
+    return trazas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evalúa curvas de dificultad contra trazas de entrada.")
+    parser.add_argument("--trazas", help="archivo .npy con movimientos (sesiones, [niveles,] pasos, 2)")
+    parser.add_argument("--sintetico", type=int, default=200, help="sesiones sintéticas si no hay trazas")
+    parser.add_argument("--segundos", type=float, default=10.0, help="duración de cada traza sintética")
+    parser.add_argument("--niveles", type=int, default=NIVELES_TOTALES)
+    parser.add_argument("--diametro", type=float, default=None)
+    parser.add_argument("--procesos", type=int, default=1)
+    parser.add_argument("--bloque", type=int, default=BLOQUE_SESIONES, help="sesiones por bloque")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--ganancia", type=float, default=1.0, help="ganancia del jugador sintético")
+    parser.add_argument("--ruido", type=float, default=1.0, help="temblor del jugador sintético")
+    args = parser.parse_args()
+
+    parametros = tabla_parametros(args.niveles, args.diametro)
+    inicio = time.perf_counter()
+    if args.trazas:
+        # Mapeado: solo se leen las sesiones de los bloques en curso
+        movimientos = np.load(args.trazas, mmap_mode="r")
+        sesiones = movimientos.shape[0]
+        resultado = evaluar(movimientos, parametros, semilla=args.semilla, procesos=args.procesos,
+                            bloque=args.bloque)
+    else:
+        # Las trazas sintéticas se generan por tandas para no tenerlas todas en memoria
+        pasos = int(math.ceil(args.segundos / PASO_SIMULACION))
+        sesiones = args.sintetico
+        tanda = max(1, args.bloque) * max(1, args.procesos)
+        parciales = []
+        for a in range(0, sesiones, tanda):
+            movimientos = trazas_sinteticas(min(tanda, sesiones - a), pasos, parametros, semilla=args.semilla,
+                                            ganancia=args.ganancia, ruido=args.ruido, primera_sesion=a)
+            parciales.append(evaluar(movimientos, parametros, semilla=args.semilla, procesos=args.procesos,
+                                     bloque=args.bloque, primera_sesion=a))
+        resultado = combinar_resultados(parciales)
+    duracion = time.perf_counter() - inicio
+
+    tasas = resultado["tasa_aprobacion"]
+    for nivel in range(0, len(tasas), 10):
+        tramo = tasas[nivel:nivel + 10]
+        print(f"Niveles {nivel + 1}-{nivel + len(tramo)}: "
+              + " ".join(f"{100.0 * t:5.1f}" for t in tramo))
+    print(f"{sesiones} sesiones x {len(tasas)} niveles evaluados en {duracion:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
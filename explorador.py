@@ -0,0 +1,129 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import os
+import string
+import threading
+
+from indice_imagenes import EXTENSIONES_VALIDAS
+
+
+def unidades_disponibles():
+    """
+    Devuelve las raíces de las unidades del sistema (C:\\, D:\\, ...) en
+    Windows; en el resto de sistemas solo existe "/".
+    """
+    if os.name != "nt":
+        return [os.sep]
+    if hasattr(os, "listdrives"):
+        return os.listdrives()
+    return [f"{letra}:\\" for letra in string.ascii_uppercase if os.path.exists(f"{letra}:\\")]
+
+
+def directorio_padre(directorio):
+    """
+    Directorio padre; "" representa la lista de unidades cuando ya se está
+    en la raíz de una unidad de Windows. None si no se puede subir más.
+    """
+    if not directorio:
+        return None
+    normalizado = os.path.normpath(directorio)
+    padre = os.path.dirname(normalizado)
+    if padre and padre != normalizado:
+        return padre
+    return "" if os.name == "nt" else None
+
+
+class ListadoDirectorio:
+    """
+    Lista los subdirectorios de un directorio en un hilo de fondo.
+    Las entradas se van publicando por lotes a medida que scandir las
+    devuelve, así que el explorador puede dibujar las primeras sin esperar a
+    que termine un directorio con miles de entradas. Cuenta además las
+    imágenes que hay directamente en él.
+
+    Con directorio "" se listan las unidades del sistema.
+    """
+
+    def __init__(self, directorio, lote=64):
+        self.directorio = directorio
+        self.lote = lote
+        self.imagenes = 0
+        self.terminado = False
+        self.error = None
+        self._entradas = []
+        self._lock = threading.Lock()
+        self._cancelado = threading.Event()
+        self._hilo = threading.Thread(target=self._listar, name="listado-directorio", daemon=True)
+        self._hilo.start()
+
+    def nuevas(self, desde):
+        """
+        Devuelve los nombres de subdirectorio publicados a partir de la posición desde.
+        """
+        with self._lock:
+            return self._entradas[desde:]
+
+    def cancelar(self):
+        """
+        Pide al hilo que deje de listar; no espera a que termine.
+        """
+        self._cancelado.set()
+
+    def _publicar(self, pendientes, imagenes):
+        with self._lock:
+            self._entradas.extend(pendientes)
+            self.imagenes += imagenes
+
+    def _listar(self):
+        if not self.directorio:
+            self._publicar(unidades_disponibles(), 0)
+            self.terminado = True
+            return
+
+        pendientes = []
+        imagenes = 0
+        try:
+            with os.scandir(self.directorio) as entradas:
+                for entrada in entradas:
+                    if self._cancelado.is_set():
+                        return
+                    try:
+                        if entrada.is_dir():
+                            if not entrada.name.startswith("."):
+                                pendientes.append(entrada.name)
+                        elif entrada.name.lower().endswith(EXTENSIONES_VALIDAS):
+                            imagenes += 1
+                    except OSError:
+                        continue
+                    if len(pendientes) >= self.lote:
+                        self._publicar(pendientes, imagenes)
+                        pendientes, imagenes = [], 0
+        except OSError as e:
+            self.error = e
+        self._publicar(pendientes, imagenes)
+        self.terminado = True
+
+
+class TareaFondo:
+    """
+    Ejecuta una función en un hilo de fondo y guarda su resultado, para que
+    el bucle del juego pueda consultar si terminó sin bloquearse.
+    """
+
+    def __init__(self, funcion, *args):
+        self.resultado = None
+        self.error = None
+        self.terminada = False
+        self._hilo = threading.Thread(target=self._ejecutar, args=(funcion, args), daemon=True)
+        self._hilo.start()
+
+    def _ejecutar(self, funcion, args):
+        try:
+            self.resultado = funcion(*args)
+        except Exception as e:
+            self.error = e
+        self.terminada = True
@@ -0,0 +1,206 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from collections import namedtuple
+
+
+# Cabecera de 32 bytes: firma, versión, tamaño de registro, niveles totales,
+# diámetro inicial (0 = por defecto) y hora de inicio (epoch)
+FIRMA = b"AIMREC\x00\x01"
+CABECERA = struct.Struct("<8sHHHxxfd4x")
+
+# Registro de 24 bytes por frame: tiempo desde el inicio, movimiento del
+# mouse, desplazamiento por retroceso, nivel y banderas (botón, en objetivo)
+REGISTRO = struct.Struct("<dhhffHBx")
+
+BOTON = 0x01
+EN_OBJETIVO = 0x02
+
+Registro = namedtuple("Registro", "tiempo dx dy retroceso_x retroceso_y nivel boton en_objetivo")
+
+DIRECTORIO_GRABACIONES = "grabaciones"
+
+
+def _limitar_int16(valor):
+    return max(-32768, min(32767, int(valor)))
+
+
+class GrabadorSesion:
+    """
+    Graba un registro binario de tamaño fijo por frame en un archivo de solo
+    anexado. Los registros se empaquetan en un buffer preasignado y, cuando
+    se llena, un hilo de fondo lo escribe a disco mientras se usa otro buffer,
+    así que registrar() solo cuesta un struct.pack_into.
+    """
+
+    def __init__(self, ruta, niveles_totales, diametro_inicial=None, registros_por_bloque=4096):
+        self.ruta = ruta
+        self.registros = 0
+        self._inicio = time.perf_counter()
+        self._capacidad = registros_por_bloque
+        self._buffer = bytearray(REGISTRO.size * registros_por_bloque)
+        self._libres = queue.Queue()
+        self._pendientes = queue.Queue()
+        self._usados = 0
+
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        self._archivo = open(ruta, "ab")
+        if self._archivo.tell() == 0:
+            self._archivo.write(CABECERA.pack(FIRMA, 1, REGISTRO.size, niveles_totales,
+                                              float(diametro_inicial or 0), time.time()))
+
+        self._hilo = threading.Thread(target=self._escribir, name="grabador", daemon=True)
+        self._hilo.start()
+
+    def registrar(self, dx, dy, retroceso_x, retroceso_y, nivel, boton, en_objetivo):
+        """
+        Añade el registro de un frame.
+        """
+        banderas = (BOTON if boton else 0) | (EN_OBJETIVO if en_objetivo else 0)
+        REGISTRO.pack_into(self._buffer, self._usados * REGISTRO.size,
+                           time.perf_counter() - self._inicio,
+                           _limitar_int16(dx), _limitar_int16(dy),
+                           retroceso_x, retroceso_y, nivel, banderas)
+        self._usados += 1
+        self.registros += 1
+        if self._usados == self._capacidad:
+            self._entregar()
+
+    def cerrar(self):
+        """
+        Escribe lo que quede en el buffer y cierra el archivo.
+        """
+        if self._archivo is None:
+            return
+        if self._usados:
+            self._entregar()
+        self._pendientes.put(None)
+        self._hilo.join()
+        self._archivo.close()
+        self._archivo = None
+
+    def _entregar(self):
+        self._pendientes.put((self._buffer, self._usados * REGISTRO.size))
+        try:
+            self._buffer = self._libres.get_nowait()
+        except queue.Empty:
+            self._buffer = bytearray(REGISTRO.size * self._capacidad)
+        self._usados = 0
+
+    def _escribir(self):
+        while True:
+            bloque = self._pendientes.get()
+            if bloque is None:
+                break
+            buffer, longitud = bloque
+            try:
+                self._archivo.write(memoryview(buffer)[:longitud])
+                self._archivo.flush()
+            except OSError as e:
+                print(f"Error al escribir la grabación: {e}")
+            self._libres.put(buffer)
+
+
+class ReproductorSesion:
+    """
+    Acceso aleatorio a una grabación mediante un mapa en memoria: los
+    registros se leen directamente del archivo sin cargarlo completo.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        tamano = os.fstat(self._archivo.fileno()).st_size
+        if tamano < CABECERA.size:
+            self._archivo.close()
+            raise ValueError(f"{ruta} no es una grabación válida")
+        self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        firma, _version, tamano_registro, niveles, diametro, inicio = CABECERA.unpack_from(self._mapa, 0)
+        if firma != FIRMA or tamano_registro != REGISTRO.size:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es una grabación válida")
+        self.niveles_totales = niveles
+        self.diametro_inicial = diametro or None
+        self.inicio = inicio
+        self._n = (tamano - CABECERA.size) // REGISTRO.size
+
+        # Primer registro de cada nivel, para reconstruir la compensación al saltar
+        self.inicios_nivel = {}
+        nivel_anterior = None
+        for i in range(self._n):
+            nivel = self._campo_nivel(i)
+            if nivel != nivel_anterior:
+                self.inicios_nivel.setdefault(nivel, i)
+                nivel_anterior = nivel
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, indice):
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError(indice)
+        tiempo, dx, dy, rx, ry, nivel, banderas = REGISTRO.unpack_from(self._mapa, CABECERA.size + indice * REGISTRO.size)
+        return Registro(tiempo, dx, dy, rx, ry, nivel, bool(banderas & BOTON), bool(banderas & EN_OBJETIVO))
+
+    @property
+    def duracion(self):
+        return self[-1].tiempo if self._n else 0.0
+
+    def tiempo(self, indice):
+        return struct.unpack_from("<d", self._mapa, CABECERA.size + indice * REGISTRO.size)[0]
+
+    def buscar(self, tiempo):
+        """
+        Índice del último registro con marca de tiempo <= tiempo (búsqueda binaria).
+        """
+        bajo, alto = 0, self._n
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self.tiempo(medio) <= tiempo:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return max(0, bajo - 1)
+
+    def compensacion(self, indice):
+        """
+        Movimiento acumulado del mouse desde el inicio del nivel hasta el registro indicado.
+        """
+        inicio = self.inicio_de_nivel(indice)
+        x = y = 0
+        for i in range(inicio, indice + 1):
+            _t, dx, dy, _rx, _ry, _n, _b = REGISTRO.unpack_from(self._mapa, CABECERA.size + i * REGISTRO.size)
+            x += dx
+            y += dy
+        return x, y
+
+    def inicio_de_nivel(self, indice):
+        """
+        Índice del primer registro del tramo de nivel que contiene al registro indicado.
+        """
+        nivel = self._campo_nivel(indice)
+        inicio = indice
+        while inicio > 0 and self._campo_nivel(inicio - 1) == nivel:
+            inicio -= 1
+        return inicio
+
+    def cerrar(self):
+        self._mapa.close()
+        self._archivo.close()
+
+    def _campo_nivel(self, indice):
+        return struct.unpack_from("<H", self._mapa, CABECERA.size + indice * REGISTRO.size + 20)[0]
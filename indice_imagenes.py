@@ -0,0 +1,189 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import hashlib
+import json
+import os
+from array import array
+
+
+EXTENSIONES_VALIDAS = (".png", ".jpg", ".jpeg", ".bmp", ".gif")
+
+# Directorio donde se guardan los índices persistentes, uno por directorio raíz
+DIRECTORIO_INDICES = os.path.join("cache", "indices")
+
+VERSION_INDICE = 2
+
+
+class ListaRutas:
+    """
+    Lista compacta de rutas de imágenes.
+    Las rutas relativas se guardan concatenadas en un único bloque de bytes y
+    se localizan con dos arrays de enteros, en lugar de mantener cientos de
+    miles de cadenas de Python. Admite len(), indexado, iteración y
+    random.choice(); descartar() elimina una ruta por su posición en O(1).
+    """
+
+    def __init__(self, rutas=(), raiz=""):
+        self.raiz = raiz
+        self._datos = bytearray()
+        self._inicios = array("Q")
+        self._longitudes = array("I")
+        for ruta in rutas:
+            self.agregar(ruta)
+
+    def agregar(self, ruta_relativa):
+        codificada = os.fsencode(ruta_relativa)
+        self._inicios.append(len(self._datos))
+        self._longitudes.append(len(codificada))
+        self._datos += codificada
+
+    def __len__(self):
+        return len(self._inicios)
+
+    def __getitem__(self, indice):
+        inicio = self._inicios[indice]
+        relativa = os.fsdecode(bytes(self._datos[inicio:inicio + self._longitudes[indice]]))
+        return os.path.join(self.raiz, relativa) if self.raiz else relativa
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def descartar(self, indice, ruta):
+        """
+        Elimina la ruta de la posición indicada (intercambiándola con la
+        última) si sigue siendo `ruta`: otro descarte pudo moverla desde que
+        se leyó. Devuelve True si la eliminó.
+        """
+        if not 0 <= indice < len(self) or self[indice] != ruta:
+            return False
+        ultimo = len(self) - 1
+        self._inicios[indice] = self._inicios[ultimo]
+        self._longitudes[indice] = self._longitudes[ultimo]
+        self._inicios.pop()
+        self._longitudes.pop()
+        return True
+
+
+def ruta_indice(raiz):
+    """
+    Devuelve la ruta del archivo de índice persistente para el directorio raíz.
+    """
+    clave = hashlib.sha1(os.fsencode(os.path.abspath(raiz))).hexdigest()[:16]
+    return os.path.join(DIRECTORIO_INDICES, f"indice_{clave}.json")
+
+
+class IndiceImagenes:
+    """
+    Índice recursivo y persistente de las imágenes bajo un directorio.
+
+    Por cada directorio se guarda su mtime, sus subdirectorios y sus imágenes
+    (nombre, tamaño, mtime). Al reabrir el índice solo se vuelve a
+    listar un directorio si su mtime cambió; el resto se reutiliza, así que el
+    coste es un stat por directorio en lugar de uno por archivo.
+    """
+
+    def __init__(self, raiz, archivo=None):
+        self.raiz = raiz
+        self.archivo = archivo or ruta_indice(raiz)
+        self.directorios = {}
+        self.reutilizados = 0
+        self.escaneados = 0
+
+    def cargar(self):
+        """
+        Carga el índice guardado en disco, si existe y es válido.
+        """
+        try:
+            with open(self.archivo, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+            if datos.get("version") == VERSION_INDICE and datos.get("raiz") == os.path.abspath(self.raiz):
+                return datos["directorios"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def guardar(self):
+        """
+        Guarda el índice en disco de forma atómica.
+        """
+        datos = {
+            "version": VERSION_INDICE,
+            "raiz": os.path.abspath(self.raiz),
+            "directorios": self.directorios,
+        }
+        try:
+            os.makedirs(os.path.dirname(self.archivo), exist_ok=True)
+            temporal = self.archivo + ".tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(datos, f, separators=(",", ":"))
+            os.replace(temporal, self.archivo)
+        except OSError as e:
+            print(f"Error al guardar el índice de imágenes: {e}")
+
+    def actualizar(self):
+        """
+        Sincroniza el índice con el disco, lo guarda y devuelve la ListaRutas de candidatas.
+        """
+        previos = self.cargar()
+        self.directorios = {}
+        self.reutilizados = 0
+        self.escaneados = 0
+
+        pendientes = [""]
+        while pendientes:
+            relativo = pendientes.pop()
+            absoluto = os.path.join(self.raiz, relativo) if relativo else self.raiz
+            try:
+                mtime = os.stat(absoluto).st_mtime_ns
+            except OSError:
+                continue
+
+            previo = previos.get(relativo)
+            if previo is not None and previo["mtime"] == mtime:
+                entrada = previo
+                self.reutilizados += 1
+            else:
+                entrada = self._escanear(absoluto, mtime)
+                self.escaneados += 1
+
+            self.directorios[relativo] = entrada
+            for sub in entrada["subdirs"]:
+                pendientes.append(os.path.join(relativo, sub) if relativo else sub)
+
+        if self.escaneados or len(previos) != len(self.directorios):
+            self.guardar()
+        return self.candidatas()
+
+    def candidatas(self):
+        """
+        Devuelve una ListaRutas con todas las imágenes indexadas.
+        """
+        lista = ListaRutas(raiz=self.raiz)
+        for relativo, entrada in self.directorios.items():
+            for nombre, _tamano, _mtime in entrada["archivos"]:
+                lista.agregar(os.path.join(relativo, nombre) if relativo else nombre)
+        return lista
+
+    def _escanear(self, absoluto, mtime):
+        subdirs = []
+        archivos = []
+        try:
+            with os.scandir(absoluto) as entradas:
+                for entrada in entradas:
+                    try:
+                        if entrada.is_dir(follow_symlinks=False):
+                            subdirs.append(entrada.name)
+                        elif entrada.name.lower().endswith(EXTENSIONES_VALIDAS) and entrada.is_file():
+                            st = entrada.stat()
+                            archivos.append([entrada.name, st.st_size, st.st_mtime_ns])
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"No se pudo leer el directorio {absoluto}: {e}")
+
+        return {"mtime": mtime, "subdirs": subdirs, "archivos": archivos}
@@ -0,0 +1,193 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import hashlib
+import os
+import threading
+
+import pygame
+
+# Pillow es opcional: permite decodificar JPEG directamente a una resolución
+# reducida (escalado DCT 1/2, 1/4, 1/8). Sin él se decodifica con pygame.
+# Se importa en la primera decodificación para no retrasar el arranque.
+_Image = None
+_pillow_buscado = False
+
+
+def cargar_pillow():
+    """
+    Devuelve el módulo PIL.Image, o None si Pillow no está instalado.
+    """
+    global _Image, _pillow_buscado
+    if not _pillow_buscado:
+        try:
+            from PIL import Image
+            _Image = Image
+        except ImportError:
+            pass
+        _pillow_buscado = True
+    return _Image
+
+
+# Directorio de las copias ya escaladas de las imágenes de recompensa
+DIRECTORIO_MINIATURAS = os.path.join("cache", "miniaturas")
+
+
+def tamano_ajustado(img_w, img_h, width, height):
+    """
+    Devuelve el tamaño (ancho, alto) que ocupa una imagen escalada proporcionalmente para caber en width x height.
+    """
+    ratio = min(width / img_w, height / img_h)
+    return max(1, int(img_w * ratio)), max(1, int(img_h * ratio))
+
+
+def decodificar_ajustada(ruta, width, height):
+    """
+    Decodifica una imagen ya escalada para caber en width x height.
+    Con Pillow, los JPEG se decodifican cerca del tamaño final en vez de a
+    resolución completa; si Pillow no está o no reconoce el archivo se usa
+    pygame.image.load y después se escala.
+    """
+    Image = cargar_pillow()
+    if Image is not None:
+        try:
+            return _decodificar_pillow(Image, ruta, width, height)
+        except (OSError, ValueError, SyntaxError, Image.DecompressionBombError):
+            pass
+
+    imagen = pygame.image.load(ruta)
+    nuevo = tamano_ajustado(*imagen.get_size(), width, height)
+    return pygame.transform.scale(imagen, nuevo)
+
+
+def _decodificar_pillow(Image, ruta, width, height):
+    with Image.open(ruta) as img:
+        nuevo = tamano_ajustado(img.width, img.height, width, height)
+        # draft() solo afecta a JPEG: elige la mayor reducción DCT que no baje de "nuevo"
+        img.draft("RGB", nuevo)
+        if img.mode not in ("RGB", "RGBA"):
+            con_alfa = "A" in img.mode or "transparency" in img.info
+            img = img.convert("RGBA" if con_alfa else "RGB")
+        if img.size != nuevo:
+            img = img.resize(nuevo, Image.BILINEAR)
+        return pygame.image.frombuffer(img.tobytes(), img.size, img.mode)
+
+
+class CacheMiniaturas:
+    """
+    Caché en disco de imágenes de recompensa ya escaladas.
+    La clave combina ruta, tamaño, mtime y resolución destino, así que un
+    archivo modificado o una resolución distinta generan una entrada nueva.
+    Al superar el límite de tamaño se eliminan las entradas usadas hace más
+    tiempo (cada acierto actualiza el mtime de la entrada).
+    """
+
+    def __init__(self, directorio=DIRECTORIO_MINIATURAS, limite_bytes=256 * 1024 * 1024):
+        self.directorio = directorio
+        self.limite_bytes = limite_bytes
+        self.aciertos = 0
+        self.fallos = 0
+        # Varios hilos de precarga comparten la caché: uno protege los
+        # contadores y otro el tamaño total y el desalojo, que es más lento
+        self._lock_contadores = threading.Lock()
+        self._lock = threading.Lock()
+        self._total = None
+
+    def obtener(self, ruta, width, height):
+        """
+        Devuelve la imagen escalada para width x height, desde la caché si es posible.
+        """
+        st = os.stat(ruta)
+        archivo = self._ruta_entrada(ruta, st, width, height)
+
+        if os.path.exists(archivo):
+            try:
+                imagen = pygame.image.load(archivo)
+                os.utime(archivo)
+                with self._lock_contadores:
+                    self.aciertos += 1
+                return imagen
+            except (pygame.error, OSError):
+                self._eliminar(archivo)
+
+        with self._lock_contadores:
+            self.fallos += 1
+        imagen = decodificar_ajustada(ruta, width, height)
+        self._guardar(imagen, archivo)
+        return imagen
+
+    def _ruta_entrada(self, ruta, st, width, height):
+        clave = f"{os.path.abspath(ruta)}|{st.st_size}|{st.st_mtime_ns}|{width}x{height}"
+        nombre = hashlib.sha1(os.fsencode(clave)).hexdigest()
+        # PNG conserva la transparencia; el resto se guarda como JPEG, más compacto
+        return os.path.join(self.directorio, nombre[:2], nombre)
+
+    def _guardar(self, imagen, archivo):
+        extension = ".png" if imagen.get_flags() & pygame.SRCALPHA else ".jpg"
+        try:
+            os.makedirs(os.path.dirname(archivo), exist_ok=True)
+            # Nombre temporal propio de cada hilo: dos hilos pueden guardar la misma entrada a la vez
+            temporal = f"{archivo}.{os.getpid()}.{threading.get_ident()}.tmp{extension}"
+            pygame.image.save(imagen, temporal)
+        except (pygame.error, OSError) as e:
+            print(f"Error al guardar miniatura: {e}")
+            return
+
+        with self._lock:
+            try:
+                # Si otro hilo ya guardó la entrada, solo cuenta la diferencia
+                anterior = os.path.getsize(archivo) if os.path.exists(archivo) else 0
+                os.replace(temporal, archivo)
+                tamano = os.path.getsize(archivo)
+            except OSError as e:
+                print(f"Error al guardar miniatura: {e}")
+                return
+            if self._total is None:
+                self._total = self._medir()
+            else:
+                self._total += tamano - anterior
+            if self._total > self.limite_bytes:
+                self._desalojar()
+
+    def _medir(self):
+        total = 0
+        for _ruta, tamano, _mtime in self._entradas():
+            total += tamano
+        return total
+
+    def _entradas(self):
+        try:
+            subdirectorios = list(os.scandir(self.directorio))
+        except OSError:
+            return
+        for sub in subdirectorios:
+            if not sub.is_dir():
+                continue
+            try:
+                with os.scandir(sub.path) as entradas:
+                    for entrada in entradas:
+                        # Los temporales de un guardado en curso (o interrumpido) no son entradas
+                        if entrada.is_file() and ".tmp" not in entrada.name:
+                            st = entrada.stat()
+                            yield entrada.path, st.st_size, st.st_mtime
+            except OSError:
+                continue
+
+    def _desalojar(self):
+        # Eliminar las menos usadas hasta quedar en el 90 % del límite
+        objetivo = self.limite_bytes * 0.9
+        for ruta, tamano, _mtime in sorted(self._entradas(), key=lambda e: e[2]):
+            if self._total <= objetivo:
+                break
+            if self._eliminar(ruta):
+                self._total -= tamano
+
+    def _eliminar(self, archivo):
+        try:
+            os.remove(archivo)
+            return True
+        except OSError:
+            return False
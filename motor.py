@@ -0,0 +1,601 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import argparse
+import math
+import random
+import time
+from collections import deque
+from operator import itemgetter
+
+from estadisticas import EstadisticasPrecision
+from retroceso import BibliotecaPatrones, generar_patron
+
+
+# La simulación (retroceso y tiempo en objetivo) avanza en pasos fijos de 1/60 s,
+# independientes de la frecuencia de dibujo, para que la dificultad no cambie
+# con los FPS. Un frame muy largo (p. ej. tras un diálogo) se recorta.
+PASO_SIMULACION = 1.0 / 60.0
+MAX_DT_FRAME = 0.25
+
+NIVELES_TOTALES = 100
+FACTOR_SHAKE = 2.0  # Factor de sacudida
+
+
+def calcular_parametros_nivel(nivel, niveles_totales, diametro_inicial=None):
+    """
+    Calcula los parámetros del nivel actual.
+    """
+    # Si no hay diámetro inicial especificado, usar el valor por defecto
+    if diametro_inicial is None:
+        diametro_inicial = 12
+        
+    tolerancia = diametro_inicial - ((diametro_inicial - 2) * (nivel - 1) / (niveles_totales - 1))
+    recoil_y = -0.3 - ((2.5 - 0.3) * (nivel - 1) / (niveles_totales - 1))
+    recoil_x_lower = -0.1 - ((1.0 - 0.1) * (nivel - 1) / (niveles_totales - 1))
+    recoil_x_upper = 0.1 + ((1.0 - 0.1) * (nivel - 1) / (niveles_totales - 1))
+    
+    # Tiempo objetivo: 2 -> 5
+    tiempo_objetivo = 2 + (5 - 2) * (nivel - 1) / (niveles_totales - 1)
+    
+    return tolerancia, recoil_y, recoil_x_lower, recoil_x_upper, tiempo_objetivo
+
+
+def puntos_por_nivel(nivel, niveles_totales):
+    """
+    Puntos que se obtienen al completar el nivel indicado.
+    """
+    return 100 + int(100 * ((nivel + 1) / niveles_totales))
+
+
+class MotorNivel:
+    """
+    Estado y reglas de un nivel, sin dependencias de pygame.
+
+    Las coordenadas son desplazamientos respecto al centro del objetivo:
+    compensacion es el movimiento acumulado del mouse y retroceso el
+    desplazamiento acumulado por el recoil. avanzar() consume el tiempo real
+    del frame en pasos fijos de PASO_SIMULACION.
+
+    La entrada del frame llega con mover() (todo el movimiento del frame,
+    repartido de forma uniforme a lo largo de él) o con registrar_movimiento()
+    y registrar_boton() (cada evento en su instante dentro del frame). Con
+    ella se arma el recorrido de la mira entre pasos, en tramos rectos, y el
+    tiempo en objetivo se calcula de forma exacta con la parte de cada tramo
+    que cae dentro del círculo: no depende de cuántos frames se dibujen ni de
+    la frecuencia de sondeo del mouse.
+
+    El retroceso sale de un PatronRetroceso consultado por tiempo
+    transcurrido: el indicado (p. ej. de una BibliotecaPatrones) o uno
+    generado al crear el nivel con rng y los parámetros recoil_*.
+
+    Si se le asigna un EstadisticasPrecision en `estadisticas`, cada paso
+    lo alimenta (ver Sesion.registrar_motor).
+    """
+
+    def __init__(self, tolerancia, recoil_y, recoil_x_lower, recoil_x_upper, tiempo_objetivo,
+                 rng, factor_shake=FACTOR_SHAKE, paso=PASO_SIMULACION, patron=None):
+        self.tolerancia = tolerancia
+        self.recoil_y = recoil_y
+        self.recoil_x_lower = recoil_x_lower
+        self.recoil_x_upper = recoil_x_upper
+        self.tiempo_objetivo = tiempo_objetivo
+        self.rng = rng
+        self.factor_shake = factor_shake
+        self.paso = paso
+        if patron is None:
+            patron = generar_patron(recoil_y, recoil_x_lower, recoil_x_upper, rng, factor_shake, paso)
+        self.patron = patron
+        # Con una muestra por paso cada paso lee la suya directamente, sin
+        # interpolar (ver _actualizar_retroceso)
+        self._directo = abs(patron.intervalo - paso) <= paso * 1e-6
+
+        self.compensacion = [0.0, 0.0]
+        # Compensación en el instante del último paso (la de arriba incluye
+        # la entrada del frame que aún no se simuló)
+        self.compensacion_paso = [0.0, 0.0]
+        self.retroceso = [0.0, 0.0]
+        self.retroceso_anterior = [0.0, 0.0]
+        self.distancia = 0.0
+        self.en_objetivo = False
+        self.tiempo_en_objetivo = 0.0
+        # Parte del último paso que la mira pasó en objetivo
+        self.tiempo_dentro_paso = 0.0
+        # Racha en curso al final del último paso (aún no pasada a racha_terminada())
+        self.racha_abierta = 0.0
+        self.tiempo_total = 0.0
+        self.pasos = 0
+        self.estadisticas = None
+        self.completado = False
+        self.reloj = 0.0
+        self.duracion_frame = self.paso
+        self._acumulador = 0.0
+
+        # Entrada del frame en curso: (fracción del frame, desde, dx, dy) y
+        # (fracción del frame, presionado). Al avanzar se convierte en puntos
+        # (t, x, y) del recorrido de la compensación y en cambios (t,
+        # presionado) del botón, que los pasos consumen en orden.
+        self._movimientos = []
+        self._eventos_boton = []
+        self._puntos = deque()
+        self._botones = deque()
+        self._boton = False
+
+    def mover(self, dx, dy):
+        """
+        Aplica un movimiento relativo del mouse hecho a lo largo del próximo frame.
+        """
+        self.compensacion[0] += dx
+        self.compensacion[1] += dy
+        if dx or dy:
+            self._movimientos.append((1.0, 0.0, dx, dy))
+
+    def registrar_movimiento(self, fraccion, dx, dy):
+        """
+        Aplica un evento de movimiento del mouse ocurrido en la fracción
+        indicada del próximo frame (0 = inicio, 1 = final de avanzar()). El
+        evento resume lo que se movió el mouse desde el evento anterior del
+        frame, o desde su inicio si es el primero.
+        """
+        self.compensacion[0] += dx
+        self.compensacion[1] += dy
+        self._movimientos.append((fraccion, None, dx, dy))
+
+    def registrar_boton(self, fraccion, presionado):
+        """
+        Registra que el botón se presionó o soltó en la fracción indicada del próximo frame.
+        """
+        self._eventos_boton.append((fraccion, presionado))
+
+    def paso_fijo(self, boton_presionado):
+        """
+        Avanza la simulación un paso fijo. boton_presionado es el estado del
+        botón al final del paso (dentro del paso mandan los cambios
+        registrados). Devuelve True si el nivel se completó.
+        """
+        self._actualizar_retroceso()
+        self._acumular_tiempo(boton_presionado)
+
+        self.pasos += 1
+        self.tiempo_total += self.paso
+        if self.tiempo_en_objetivo >= self.tiempo_objetivo:
+            self.completado = True
+        return self.completado
+
+    def retroceso_siguiente(self):
+        """
+        Retroceso acumulado al final del próximo paso.
+        """
+        return self.patron.muestra((self.pasos + 1) * self.paso)
+
+    def retroceso_en(self, tiempo):
+        """
+        Retroceso acumulado en el instante `tiempo` del reloj del nivel,
+        interpolado dentro de su paso como en el recorrido de la mira.
+        """
+        posicion = tiempo / self.paso
+        k = math.floor(posicion + 1e-9)
+        x0, y0 = self.patron.muestra(k * self.paso)
+        fraccion = posicion - k
+        if fraccion <= 1e-9:
+            return x0, y0
+        x1, y1 = self.patron.muestra((k + 1) * self.paso)
+        return x0 + (x1 - x0) * fraccion, y0 + (y1 - y0) * fraccion
+
+    def _actualizar_retroceso(self):
+        self.retroceso_anterior[0], self.retroceso_anterior[1] = self.retroceso
+        if self._directo:
+            patron = self.patron
+            # Un patrón generado se alarga en vez de repetirse
+            while self.pasos >= patron.cantidad and patron.extender():
+                pass
+            if self.pasos < patron.cantidad:
+                i = 2 * self.pasos
+                self.retroceso[0] = patron.muestras[i]
+                self.retroceso[1] = patron.muestras[i + 1]
+                return
+            # Pasado el final el patrón se repite desde la última posición
+            ciclos, i = divmod(self.pasos, patron.cantidad)
+            final_x, final_y = patron.final
+            self.retroceso[0] = ciclos * final_x + patron.muestras[2 * i]
+            self.retroceso[1] = ciclos * final_y + patron.muestras[2 * i + 1]
+        else:
+            self.retroceso[0], self.retroceso[1] = self.retroceso_siguiente()
+
+    def _acumular_tiempo(self, boton_presionado):
+        racha, maxima = self._seguir_entrada(boton_presionado, integrar=True)
+        self.racha_abierta = racha
+        self.en_objetivo = self._sobre_objetivo() and boton_presionado
+        # Si la racha alcanzó el tiempo objetivo dentro del paso el nivel se
+        # completa aunque la mira haya salido antes del final
+        self.tiempo_en_objetivo = maxima if maxima >= self.tiempo_objetivo else racha
+
+    def _seguir_entrada(self, boton_presionado, integrar=False):
+        """
+        Lleva la compensación y el botón hasta el final del paso actual por
+        el recorrido de la mira: tramos rectos entre los eventos, con el
+        retroceso interpolado dentro del paso.
+
+        Con integrar=True acumula además la racha en objetivo (SOLO en la
+        zona Y con el botón presionado): crece con la parte de cada tramo que
+        cae en el objetivo (ver _intervalos_dentro) y vuelve a 0 en cuanto la
+        mira sale o se suelta el botón, y avisa a `estadisticas` del instante
+        de cada entrada y salida.
+        Devuelve (racha al final del paso, racha máxima en el paso).
+        """
+        inicio = self.tiempo_total
+        fin = inicio + self.paso
+        if self._movimientos or self._eventos_boton:
+            # paso_fijo() llamado sin avanzar(): la entrada pendiente ocupa este paso
+            self._convertir_entrada(inicio, self.paso, boton_presionado)
+        puntos = self._puntos
+        botones = self._botones
+        if not botones or botones[0][0] > fin:
+            # Sin cambios registrados en este paso: el estado del botón es
+            # el indicado para todo el paso
+            self._boton = boton_presionado
+        rx0, ry0 = self.retroceso_anterior
+        vx = (self.retroceso[0] - rx0) / self.paso
+        vy = (self.retroceso[1] - ry0) / self.paso
+        racha = maxima = self.tiempo_en_objetivo
+        dentro_paso = 0.0
+        estadisticas = self.estadisticas
+
+        t = inicio
+        x, y = self.compensacion_paso
+        while True:
+            while puntos and puntos[0][0] <= t:
+                _, x, y = puntos.popleft()
+            while botones and botones[0][0] <= t:
+                self._boton = botones.popleft()[1]
+            if t >= fin:
+                break
+            siguiente = fin
+            if puntos and puntos[0][0] < siguiente:
+                siguiente = puntos[0][0]
+            if botones and botones[0][0] < siguiente:
+                siguiente = botones[0][0]
+            if puntos:
+                tp, xp, yp = puntos[0]
+                f = (siguiente - t) / (tp - t)
+                nx, ny = x + (xp - x) * f, y + (yp - y) * f
+            else:
+                nx, ny = x, y
+
+            if integrar:
+                intervalos = ()
+                if self._boton:
+                    intervalos = self._intervalos_dentro(t, x + rx0 + vx * (t - inicio), y + ry0 + vy * (t - inicio),
+                                                         siguiente, nx + rx0 + vx * (siguiente - inicio),
+                                                         ny + ry0 + vy * (siguiente - inicio))
+                duracion = siguiente - t
+                fuera = 0.0
+                for entrada, salida in intervalos:
+                    if entrada > fuera and racha > 0.0:
+                        # Salió (o se soltó el botón) antes de volver a entrar
+                        if estadisticas is not None:
+                            estadisticas.racha_terminada(racha, t + fuera * duracion)
+                        racha = 0.0
+                    if racha == 0.0 and estadisticas is not None:
+                        estadisticas.objetivo_alcanzado(t + entrada * duracion)
+                    racha += (salida - entrada) * duracion
+                    dentro_paso += (salida - entrada) * duracion
+                    if racha > maxima:
+                        maxima = racha
+                    fuera = salida
+                if fuera < 1.0 and racha > 0.0:
+                    if estadisticas is not None:
+                        estadisticas.racha_terminada(racha, t + fuera * duracion)
+                    racha = 0.0
+            t, x, y = siguiente, nx, ny
+        self.compensacion_paso[0], self.compensacion_paso[1] = x, y
+        if integrar:
+            self.tiempo_dentro_paso = dentro_paso
+        return racha, maxima
+
+    def _intervalos_dentro(self, t0, ax, ay, t1, bx, by):
+        """
+        Partes del tramo recto de la mira de A (instante t0) a B (t1), en
+        desplazamientos respecto al centro, que caen en el objetivo: lista
+        ordenada de (entrada, salida) en fracciones 0..1 del tramo.
+        """
+        dentro = interseccion_circulo(ax, ay, bx, by, self.tolerancia * self.tolerancia)
+        return (dentro,) if dentro is not None and dentro[1] > dentro[0] else ()
+
+    def _sobre_objetivo(self):
+        # Distancia al centro al final del paso
+        self.distancia = math.hypot(self.compensacion_paso[0] + self.retroceso[0],
+                                    self.compensacion_paso[1] + self.retroceso[1])
+        return self.distancia <= self.tolerancia
+
+    def avanzar(self, dt, boton_presionado):
+        """
+        Consume dt segundos de tiempo real en pasos fijos. boton_presionado es
+        el estado del botón al final del frame. Devuelve True si el nivel se completó.
+        """
+        dt = min(dt, MAX_DT_FRAME)
+        self.duracion_frame = dt
+        self._convertir_entrada(self.reloj, dt, boton_presionado)
+        self.reloj += dt
+        self._acumulador += dt
+        while self._acumulador >= self.paso and not self.completado:
+            self._acumulador -= self.paso
+            self.paso_fijo(self._boton_en(self.tiempo_total + self.paso) if self._botones else self._boton)
+            if self.estadisticas is not None:
+                self.estadisticas.registrar_paso(self.paso, self.tiempo_dentro_paso, self.distancia)
+        return self.completado
+
+    def _convertir_entrada(self, inicio, dt, boton_presionado):
+        # Pasa la entrada del frame [inicio, inicio + dt] a instantes del reloj del nivel
+        if self._eventos_boton:
+            self._eventos_boton.sort(key=itemgetter(0))
+            for fraccion, presionado in self._eventos_boton:
+                t = inicio + fraccion * dt
+                if self._botones and t < self._botones[-1][0]:
+                    t = self._botones[-1][0]
+                self._botones.append((t, presionado))
+            self._eventos_boton = []
+        elif boton_presionado != (self._boton_en(inicio + dt) if self._botones else self._boton):
+            self._botones.append((inicio, boton_presionado))
+
+        if self._movimientos:
+            if len(self._movimientos) > 1:
+                self._movimientos.sort(key=itemgetter(0))
+            anterior = inicio
+            for fraccion, desde, dx, dy in self._movimientos:
+                t = inicio + fraccion * dt
+                desde = inicio + desde * dt if desde is not None else anterior
+                anterior = t
+                ultimo_t, x, y = self._puntos[-1] if self._puntos else (self.tiempo_total, *self.compensacion_paso)
+                if t < ultimo_t:
+                    t = ultimo_t
+                if desde > ultimo_t:
+                    # El mouse estaba quieto hasta que empezó este movimiento
+                    self._puntos.append((desde, x, y))
+                self._puntos.append((t, x + dx, y + dy))
+            self._movimientos = []
+
+    def _boton_en(self, t):
+        # Estado del botón en el instante t según los cambios pendientes
+        estado = self._boton
+        for instante, presionado in self._botones:
+            if instante > t:
+                break
+            estado = presionado
+        return estado
+
+    def desplazamiento(self):
+        """
+        Desplazamiento de la mira respecto al centro para dibujar, con el
+        retroceso interpolado entre los dos últimos pasos.
+        """
+        alfa = self._acumulador / self.paso
+        return (
+            self.compensacion[0] + self.retroceso_anterior[0] + (self.retroceso[0] - self.retroceso_anterior[0]) * alfa,
+            self.compensacion[1] + self.retroceso_anterior[1] + (self.retroceso[1] - self.retroceso_anterior[1]) * alfa,
+        )
+
+
+def interseccion_circulo(ax, ay, bx, by, radio2):
+    """
+    Parte del segmento A-B (parámetros 0..1) dentro del círculo centrado en
+    el origen con radio al cuadrado radio2: (entrada, salida), o None si el
+    segmento no lo toca.
+    """
+    dx = bx - ax
+    dy = by - ay
+    a = dx * dx + dy * dy
+    c = ax * ax + ay * ay - radio2
+    if a == 0.0:
+        return (0.0, 1.0) if c <= 0.0 else None
+    b = ax * dx + ay * dy
+    discriminante = b * b - a * c
+    if discriminante < 0.0:
+        return None
+    raiz = math.sqrt(discriminante)
+    entrada = (-b - raiz) / a
+    salida = (-b + raiz) / a
+    if salida < 0.0 or entrada > 1.0:
+        return None
+    return max(entrada, 0.0), min(salida, 1.0)
+
+
+class Sesion:
+    """
+    Progresión de niveles y puntaje de una sesión de entrenamiento.
+    Todo el azar sale de un random.Random con semilla explícita, así que dos
+    sesiones con la misma semilla y las mismas entradas son idénticas.
+
+    Con estadisticas=True cada nivel acumula sus EstadisticasPrecision; al
+    terminarlo se suman a las de la sesión (`estadisticas`) y su resumen se
+    añade a `estadisticas_niveles`.
+    """
+
+    def __init__(self, semilla=None, niveles_totales=NIVELES_TOTALES, diametro_inicial=None,
+                 factor_shake=FACTOR_SHAKE, paso=PASO_SIMULACION, biblioteca=None, estadisticas=False):
+        self.semilla = semilla
+        self.rng = random.Random(semilla)
+        self.niveles_totales = niveles_totales
+        self.diametro_inicial = diametro_inicial
+        self.factor_shake = factor_shake
+        self.paso = paso
+        self.biblioteca = biblioteca
+        self.nivel = 1
+        self.puntaje = 0
+        self.estadisticas = EstadisticasPrecision() if estadisticas else None
+        self.estadisticas_niveles = []
+        self._motor = None
+
+    @property
+    def terminada(self):
+        return self.nivel > self.niveles_totales
+
+    def parametros(self, nivel=None):
+        """
+        Devuelve (tolerancia, recoil_y, recoil_x_lower, recoil_x_upper, tiempo_objetivo) del nivel.
+        """
+        return calcular_parametros_nivel(nivel or self.nivel, self.niveles_totales, self.diametro_inicial)
+
+    def patron(self, nivel=None):
+        """
+        Patrón de retroceso del nivel en la biblioteca, o None si no hay
+        biblioteca (el motor genera uno con el rng de la sesión).
+        """
+        if self.biblioteca is None:
+            return None
+        return self.biblioteca.para_nivel(nivel or self.nivel)
+
+    def iniciar_nivel(self):
+        """
+        Crea el MotorNivel del nivel actual.
+        """
+        return self.registrar_motor(MotorNivel(*self.parametros(), rng=self.rng, factor_shake=self.factor_shake,
+                                               paso=self.paso, patron=self.patron()))
+
+    def registrar_motor(self, motor):
+        """
+        Toma el motor como el del nivel actual: con estadísticas, le asigna
+        las del nivel. Devuelve el motor.
+        """
+        self.terminar_nivel()
+        if self.estadisticas is not None:
+            motor.estadisticas = EstadisticasPrecision()
+            self._motor = motor
+        return motor
+
+    def terminar_nivel(self):
+        """
+        Cierra las estadísticas del motor del nivel actual (si las hay) y
+        las suma a las de la sesión. completar_nivel() y saltar_nivel() la
+        llaman; llamarla de nuevo no hace nada.
+        """
+        motor, self._motor = self._motor, None
+        if motor is None or motor.estadisticas.tiempo_total == 0.0:
+            return
+        # Si la racha que completó el nivel ya terminó dentro del último
+        # paso, tiempo_en_objetivo la repite: solo se cierra la que sigue abierta
+        motor.estadisticas.terminar(motor.racha_abierta)
+        self.estadisticas.combinar(motor.estadisticas)
+        resumen = motor.estadisticas.resumen()
+        resumen["nivel"] = self.nivel
+        resumen["completado"] = motor.completado
+        self.estadisticas_niveles.append(resumen)
+
+    def completar_nivel(self):
+        """
+        Suma los puntos del nivel actual y pasa al siguiente. Devuelve los puntos obtenidos.
+        """
+        self.terminar_nivel()
+        puntos = puntos_por_nivel(self.nivel, self.niveles_totales)
+        self.puntaje += puntos
+        self.nivel += 1
+        return puntos
+
+    def saltar_nivel(self):
+        self.terminar_nivel()
+        self.nivel += 1
+
+
+def politica_perfecta(motor):
+    """
+    Entrada guionizada ideal: anula el desplazamiento que tendrá la mira por
+    el retroceso al final del próximo frame (de la misma duración que el
+    anterior), siempre con el botón presionado.
+    """
+    retroceso_x, retroceso_y = motor.retroceso_en(motor.reloj + motor.duracion_frame)
+    return -(motor.compensacion[0] + retroceso_x), -(motor.compensacion[1] + retroceso_y), True
+
+
+def crear_politica_humana(semilla=None, ganancia=0.5, ruido=1.0):
+    """
+    Crea una entrada guionizada aproximadamente humana: corrige solo una
+    fracción del error visible en cada frame y añade ruido gaussiano.
+    """
+    rng = random.Random(semilla)
+
+    def politica(motor):
+        dx, dy = motor.desplazamiento()
+        return -dx * ganancia + rng.gauss(0.0, ruido), -dy * ganancia + rng.gauss(0.0, ruido), True
+
+    return politica
+
+
+def ejecutar_sesion(politica, semilla=None, niveles_totales=NIVELES_TOTALES, diametro_inicial=None,
+                    dt=PASO_SIMULACION, max_segundos_nivel=30.0, biblioteca=None, estadisticas=False):
+    """
+    Juega una sesión completa sin pygame con frames de dt segundos.
+    politica(motor) devuelve (dx, dy, boton_presionado) para cada frame.
+    Un nivel que no se completa en max_segundos_nivel se salta.
+    Devuelve (sesion, resultados) con resultados = [(nivel, completado, segundos), ...].
+    """
+    sesion = Sesion(semilla=semilla, niveles_totales=niveles_totales, diametro_inicial=diametro_inicial,
+                    biblioteca=biblioteca, estadisticas=estadisticas)
+    resultados = []
+    while not sesion.terminada:
+        motor = sesion.iniciar_nivel()
+        while not motor.completado and motor.tiempo_total < max_segundos_nivel:
+            dx, dy, boton = politica(motor)
+            motor.mover(dx, dy)
+            motor.avanzar(dt, boton)
+        resultados.append((sesion.nivel, motor.completado, motor.tiempo_total))
+        if motor.completado:
+            sesion.completar_nivel()
+        else:
+            sesion.saltar_nivel()
+    return sesion, resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simula sesiones de entrenamiento sin interfaz gráfica.")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--sesiones", type=int, default=1)
+    parser.add_argument("--niveles", type=int, default=NIVELES_TOTALES)
+    parser.add_argument("--diametro", type=float, default=None)
+    parser.add_argument("--fps", type=float, default=60.0, help="frecuencia de frames simulada")
+    parser.add_argument("--politica", choices=("perfecta", "humana"), default="humana")
+    parser.add_argument("--ganancia", type=float, default=0.5)
+    parser.add_argument("--ruido", type=float, default=1.0)
+    parser.add_argument("--patrones", help="biblioteca .aimpat con el retroceso de cada nivel")
+    parser.add_argument("--estadisticas", action="store_true", help="muestra las estadísticas de precisión")
+    args = parser.parse_args()
+    biblioteca = BibliotecaPatrones(args.patrones) if args.patrones else None
+    total = EstadisticasPrecision()
+
+    completados = [0] * args.niveles
+    pasos = 0
+    inicio = time.perf_counter()
+    for i in range(args.sesiones):
+        if args.politica == "perfecta":
+            politica = politica_perfecta
+        else:
+            politica = crear_politica_humana(args.semilla + i, args.ganancia, args.ruido)
+        sesion, resultados = ejecutar_sesion(politica, semilla=args.semilla + i, niveles_totales=args.niveles,
+                                             diametro_inicial=args.diametro, dt=1.0 / args.fps,
+                                             biblioteca=biblioteca, estadisticas=args.estadisticas)
+        if args.estadisticas:
+            total.combinar(sesion.estadisticas)
+        for nivel, completado, segundos in resultados:
+            completados[nivel - 1] += completado
+            pasos += round(segundos / PASO_SIMULACION)
+        print(f"Sesión {i + 1}: puntaje {sesion.puntaje}, "
+              f"niveles completados {sum(c for _, c, _ in resultados)}/{args.niveles}")
+    duracion = time.perf_counter() - inicio
+
+    for nivel in range(0, args.niveles, 10):
+        tramo = completados[nivel:nivel + 10]
+        print(f"Niveles {nivel + 1}-{nivel + len(tramo)}: "
+              f"{100.0 * sum(tramo) / (len(tramo) * args.sesiones):.1f}% completados")
+    if args.estadisticas:
+        resumen = total.resumen()
+        print(f"En objetivo {100 * resumen['en_objetivo']:.1f}%, distancia {resumen['distancia_media']:.2f} "
+              f"± {resumen['distancia_desviacion']:.2f}, racha p50 {resumen['racha_p50']:.2f} s "
+              f"p90 {resumen['racha_p90']:.2f} s, readquisición p50 {resumen['readquisicion_p50']:.3f} s "
+              f"p90 {resumen['readquisicion_p90']:.3f} s")
+    print(f"{pasos} pasos simulados en {duracion:.2f} s ({pasos / duracion:.0f} pasos/s)")
+
+
+if __name__ == "__main__":
+    main()
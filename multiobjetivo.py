@@ -0,0 +1,316 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import math
+
+import numpy as np
+
+from motor import FACTOR_SHAKE, PASO_SIMULACION, MotorNivel, interseccion_circulo
+
+
+# Modos: "seguimiento" acumula tiempo sobre cualquier objetivo con el botón
+# presionado (como el modo clásico); "rapido" cuenta clics sobre objetivos,
+# que reaparecen en otro lugar al acertarles
+TIPOS = ("seguimiento", "rapido")
+
+# Patrones de movimiento de cada objetivo
+LINEAL, CIRCULAR, SENOIDAL = range(3)
+PATRONES = {"lineal": LINEAL, "circular": CIRCULAR, "senoidal": SENOIDAL}
+
+# El radio de los objetivos es la tolerancia del nivel por este factor: un
+# objetivo en movimiento de 2 unidades sería imposible de seguir
+ESCALA_RADIO = 2.0
+
+# Velocidad de los objetivos (unidades lógicas por segundo) en el primer y el último nivel
+VELOCIDAD_MINIMA = 40.0
+VELOCIDAD_MAXIMA = 220.0
+
+# En modo "rapido" se necesitan tiempo_objetivo * ACIERTOS_POR_SEGUNDO aciertos
+ACIERTOS_POR_SEGUNDO = 2.0
+
+
+class RejillaEspacial:
+    """
+    Rejilla uniforme sobre las posiciones de los objetivos para las
+    consultas de la mira.
+
+    Se reconstruye en cada paso con un conteo por celdas (O(N) vectorizado):
+    `orden` tiene los índices de los objetivos agrupados por celda e
+    `inicios[c]` la posición en `orden` donde empieza la celda c. Con celdas
+    de lado >= radio, una consulta solo mide la distancia a los objetivos de
+    las 3x3 celdas vecinas; las celdas de una fila son contiguas en `orden`,
+    así que son como mucho tres cortes del array.
+    """
+
+    def __init__(self, ancho, alto, celda):
+        self.celda = float(celda)
+        self.columnas = max(1, math.ceil(ancho / self.celda))
+        self.filas = max(1, math.ceil(alto / self.celda))
+        self.orden = np.empty(0, dtype=np.intp)
+        self.inicios = np.zeros(self.columnas * self.filas + 1, dtype=np.intp)
+
+    def reconstruir(self, posiciones):
+        cx = np.clip((posiciones[:, 0] // self.celda).astype(np.intp), 0, self.columnas - 1)
+        cy = np.clip((posiciones[:, 1] // self.celda).astype(np.intp), 0, self.filas - 1)
+        celdas = cy * self.columnas + cx
+        self.orden = np.argsort(celdas, kind="stable")
+        np.cumsum(np.bincount(celdas, minlength=self.columnas * self.filas), out=self.inicios[1:])
+
+    def candidatos(self, x, y):
+        """
+        Índices de los objetivos en las celdas vecinas a (x, y).
+        """
+        cx = int(x // self.celda)
+        cy = int(y // self.celda)
+        c0 = max(cx - 1, 0)
+        c1 = min(cx + 1, self.columnas - 1)
+        if c0 > c1:
+            return self.orden[:0]
+        cortes = []
+        for fila in range(max(cy - 1, 0), min(cy + 1, self.filas - 1) + 1):
+            base = fila * self.columnas
+            cortes.append(self.orden[self.inicios[base + c0]:self.inicios[base + c1 + 1]])
+        if not cortes:
+            return self.orden[:0]
+        return np.concatenate(cortes) if len(cortes) > 1 else cortes[0]
+
+
+class MotorMultiobjetivo(MotorNivel):
+    """
+    Nivel con muchos objetivos en movimiento, sin dependencias de pygame.
+
+    Reutiliza de MotorNivel el retroceso, los pasos fijos y el tiempo en
+    objetivo. Las posiciones de los objetivos (coordenadas lógicas) son
+    arrays de NumPy que se actualizan todos a la vez en cada paso; la mira
+    está en centro + compensacion + retroceso y se comprueba contra la
+    rejilla espacial en lugar de contra todos los objetivos.
+
+    Dentro de un paso cada objetivo va en línea recta de su posición
+    anterior a la nueva, así que el tiempo en objetivo se integra de forma
+    exacta como en MotorNivel: en coordenadas relativas a un objetivo cada
+    tramo de la mira también es recto (ver _intervalos_dentro).
+
+    Cada objetivo sigue un patrón: LINEAL rebota en los bordes, CIRCULAR
+    orbita alrededor de un punto fijo y SENOIDAL avanza en línea recta
+    oscilando de lado a lado.
+    """
+
+    def __init__(self, tolerancia, recoil_y, recoil_x_lower, recoil_x_upper, tiempo_objetivo,
+                 rng, cantidad=50, tipo="seguimiento", area=(800, 600), progreso=0.0,
+                 patrones=tuple(PATRONES), factor_shake=FACTOR_SHAKE, paso=PASO_SIMULACION, patron=None):
+        super().__init__(tolerancia, recoil_y, recoil_x_lower, recoil_x_upper, tiempo_objetivo,
+                         rng, factor_shake=factor_shake, paso=paso, patron=patron)
+        if tipo not in TIPOS:
+            raise ValueError(f"tipo de nivel desconocido: {tipo}")
+        self.tipo = tipo
+        self.area = area
+        self.centro = (area[0] / 2, area[1] / 2)
+        self.radio = tolerancia * ESCALA_RADIO
+        self.velocidad = VELOCIDAD_MINIMA + (VELOCIDAD_MAXIMA - VELOCIDAD_MINIMA) * progreso
+        self.aciertos = 0
+        self.aciertos_objetivo = max(1, round(tiempo_objetivo * ACIERTOS_POR_SEGUNDO))
+        self.indice_objetivo = -1
+        self.tiempo = 0.0
+        self._boton_anterior = False
+        self._patrones = np.array([PATRONES[p] for p in patrones], dtype=np.int8)
+        # El azar de los objetivos sale del rng de la sesión: misma semilla, mismos objetivos
+        self._generador = np.random.default_rng(rng.getrandbits(64))
+
+        self.movimientos = np.empty(cantidad, dtype=np.int8)
+        self.anclas = np.empty((cantidad, 2))
+        self.velocidades = np.empty((cantidad, 2))
+        self.ejes = np.empty((cantidad, 2))
+        self.amplitudes = np.empty(cantidad)
+        self.fases = np.empty(cantidad)
+        self.omegas = np.empty(cantidad)
+        self.margenes = np.empty(cantidad)
+        self.posiciones = np.empty((cantidad, 2))
+        self._area = np.array(area, dtype=np.float64)
+        self._generar(np.arange(cantidad))
+        self.posiciones_anteriores = self.posiciones.copy()
+        self._rejilla = RejillaEspacial(area[0], area[1], max(self.radio, 32.0))
+
+    def mira(self):
+        """
+        Posición lógica de la mira al final del último paso.
+        """
+        return (self.centro[0] + self.compensacion_paso[0] + self.retroceso[0],
+                self.centro[1] + self.compensacion_paso[1] + self.retroceso[1])
+
+    def posiciones_dibujo(self):
+        """
+        Posiciones de los objetivos para dibujar, interpoladas entre los dos últimos pasos.
+        """
+        alfa = self._acumulador / self.paso
+        return self.posiciones_anteriores + (self.posiciones - self.posiciones_anteriores) * alfa
+
+    def paso_fijo(self, boton_presionado):
+        if self.tipo == "seguimiento":
+            return super().paso_fijo(boton_presionado)
+
+        # Modo rápido: cuenta el flanco de presión del botón sobre un objetivo
+        self._actualizar_retroceso()
+        self._mover_objetivos()
+        self._seguir_entrada(boton_presionado)
+        sobre = self._sobre_objetivo()
+        self.en_objetivo = sobre and boton_presionado
+        if boton_presionado and not self._boton_anterior and sobre:
+            self.aciertos += 1
+            self._generar([self.indice_objetivo])
+            self.posiciones_anteriores[self.indice_objetivo] = self.posiciones[self.indice_objetivo]
+            self.indice_objetivo = -1
+            self.en_objetivo = False
+        self.tiempo_dentro_paso = self.paso if self.en_objetivo else 0.0
+        self._boton_anterior = boton_presionado
+        self.pasos += 1
+        self.tiempo_total += self.paso
+        if self.aciertos >= self.aciertos_objetivo:
+            self.completado = True
+        return self.completado
+
+    def _acumular_tiempo(self, boton_presionado):
+        # Los objetivos llegan primero al final del paso: la mira se integra
+        # contra su recorrido de posiciones_anteriores a posiciones
+        self._mover_objetivos()
+        super()._acumular_tiempo(boton_presionado)
+
+    def _mover_objetivos(self):
+        self.tiempo += self.paso
+        self.posiciones_anteriores, self.posiciones = self.posiciones, self.posiciones_anteriores
+        self._mover()
+        self._rejilla.reconstruir(self.posiciones)
+
+    def _intervalos_dentro(self, t0, ax, ay, t1, bx, by):
+        # Solo los objetivos cuyo recorrido en el paso pasa cerca del tramo
+        # se miden; la racha sigue mientras la mira esté sobre alguno
+        ax += self.centro[0]
+        ay += self.centro[1]
+        bx += self.centro[0]
+        by += self.centro[1]
+        radio = self.radio
+        anteriores = self.posiciones_anteriores
+        actuales = self.posiciones
+        cerca = np.flatnonzero(
+            (np.minimum(anteriores[:, 0], actuales[:, 0]) <= max(ax, bx) + radio)
+            & (np.maximum(anteriores[:, 0], actuales[:, 0]) >= min(ax, bx) - radio)
+            & (np.minimum(anteriores[:, 1], actuales[:, 1]) <= max(ay, by) + radio)
+            & (np.maximum(anteriores[:, 1], actuales[:, 1]) >= min(ay, by) - radio))
+        if not len(cerca):
+            return ()
+
+        f0 = (t0 - self.tiempo_total) / self.paso
+        f1 = (t1 - self.tiempo_total) / self.paso
+        intervalos = []
+        for i in cerca.tolist():
+            x0, y0 = anteriores[i]
+            dx, dy = actuales[i] - anteriores[i]
+            dentro = interseccion_circulo(ax - x0 - dx * f0, ay - y0 - dy * f0,
+                                          bx - x0 - dx * f1, by - y0 - dy * f1, radio * radio)
+            if dentro is not None and dentro[1] > dentro[0]:
+                intervalos.append(dentro)
+        if len(intervalos) < 2:
+            return intervalos
+        # Unión de los intervalos de los distintos objetivos
+        intervalos.sort()
+        unidos = [intervalos[0]]
+        for entrada, salida in intervalos[1:]:
+            if entrada <= unidos[-1][1]:
+                if salida > unidos[-1][1]:
+                    unidos[-1] = (unidos[-1][0], salida)
+            else:
+                unidos.append((entrada, salida))
+        return unidos
+
+    def _sobre_objetivo(self):
+        x, y = self.mira()
+        candidatos = self._rejilla.candidatos(x, y)
+        self.indice_objetivo = -1
+        self.distancia = math.inf
+        if len(candidatos):
+            distancias = np.hypot(self.posiciones[candidatos, 0] - x, self.posiciones[candidatos, 1] - y)
+            i = int(np.argmin(distancias))
+            self.distancia = float(distancias[i])
+            if self.distancia <= self.radio:
+                self.indice_objetivo = int(candidatos[i])
+        return self.indice_objetivo >= 0
+
+    def _generar(self, indices):
+        # (Re)coloca los objetivos indicados con un patrón, ancla y velocidad al azar
+        g = self._generador
+        n = len(indices)
+        patron = self._patrones[g.integers(len(self._patrones), size=n)]
+        amplitud = g.uniform(2.0, 6.0, size=n) * self.radio
+        margen = self.radio + np.where(patron == LINEAL, 0.0, amplitud)
+        margen = np.minimum(margen, min(self.area) / 2 - 1)
+        angulo = g.uniform(0.0, 2 * math.pi, size=n)
+        rapidez = self.velocidad * g.uniform(0.6, 1.4, size=n)
+        # Las órbitas giran a la rapidez del nivel; su ancla no se mueve
+        rapidez_ancla = np.where(patron == CIRCULAR, 0.0, rapidez)
+
+        self.movimientos[indices] = patron
+        self.amplitudes[indices] = np.where(patron == LINEAL, 0.0, amplitud)
+        self.margenes[indices] = margen
+        self.anclas[indices, 0] = g.uniform(margen, self.area[0] - margen)
+        self.anclas[indices, 1] = g.uniform(margen, self.area[1] - margen)
+        self.velocidades[indices, 0] = np.cos(angulo) * rapidez_ancla
+        self.velocidades[indices, 1] = np.sin(angulo) * rapidez_ancla
+        # El vaivén es perpendicular a la marcha inicial y no cambia al
+        # rebotar, para que el objetivo no salte
+        self.ejes[indices, 0] = -np.sin(angulo)
+        self.ejes[indices, 1] = np.cos(angulo)
+        self.fases[indices] = g.uniform(0.0, 2 * math.pi, size=n)
+        # Velocidad angular tal que la rapidez en la órbita o en el vaivén no
+        # supere la del nivel
+        self.omegas[indices] = rapidez / amplitud * np.where(patron == CIRCULAR, 1.0, g.uniform(0.5, 1.0, size=n))
+        self.omegas[indices] *= np.where(g.random(n) < 0.5, -1.0, 1.0)
+        self._mover(avanzar=False)
+
+    def _mover(self, avanzar=True):
+        if avanzar:
+            self.anclas += self.velocidades * self.paso
+            # Rebote en los bordes: la velocidad apunta de vuelta hacia dentro
+            minimo = self.margenes[:, None]
+            maximo = self._area - minimo
+            self.velocidades = np.where(self.anclas < minimo, np.abs(self.velocidades),
+                                        np.where(self.anclas > maximo, -np.abs(self.velocidades),
+                                                 self.velocidades))
+            np.clip(self.anclas, minimo, maximo, out=self.anclas)
+
+        # Desplazamiento respecto al ancla: órbita (CIRCULAR) o vaivén a lo
+        # largo del eje (SENOIDAL); los LINEAL tienen amplitud 0
+        theta = self.fases + self.omegas * self.tiempo
+        coseno = np.cos(theta)
+        seno = np.sin(theta)
+        circular = self.movimientos == CIRCULAR
+        dx = np.where(circular, coseno, seno * self.ejes[:, 0])
+        dy = np.where(circular, seno, seno * self.ejes[:, 1])
+        np.multiply(dx, self.amplitudes, out=dx)
+        np.multiply(dy, self.amplitudes, out=dy)
+        np.add(self.anclas[:, 0], dx, out=self.posiciones[:, 0])
+        np.add(self.anclas[:, 1], dy, out=self.posiciones[:, 1])
+
+
+def iniciar_nivel_multiobjetivo(sesion, cantidad, tipo="seguimiento", area=(800, 600), patrones=tuple(PATRONES)):
+    """
+    Crea el MotorMultiobjetivo del nivel actual de la sesión: la misma
+    progresión (calcular_parametros_nivel) y puntaje que el modo clásico, con
+    objetivos más rápidos a medida que sube el nivel.
+    """
+    progreso = (sesion.nivel - 1) / max(1, sesion.niveles_totales - 1)
+    return sesion.registrar_motor(MotorMultiobjetivo(
+        *sesion.parametros(), rng=sesion.rng, cantidad=cantidad, tipo=tipo, area=area, progreso=progreso,
+        patrones=patrones, factor_shake=sesion.factor_shake, paso=sesion.paso, patron=sesion.patron()))
+
+
+def coordenadas_blit(posiciones, vista, mitad):
+    """
+    Esquinas en píxeles (lista de tuplas) de los sprites de lado 2 * mitad
+    centrados en las posiciones lógicas, listas para Surface.blits().
+    """
+    pixeles = np.empty(posiciones.shape, dtype=np.int32)
+    np.rint(posiciones[:, 0] * vista.factor + (vista.origen_x - mitad), out=pixeles[:, 0], casting="unsafe")
+    np.rint(posiciones[:, 1] * vista.factor + (vista.origen_y - mitad), out=pixeles[:, 1], casting="unsafe")
+    return list(map(tuple, pixeles.tolist()))
@@ -0,0 +1,168 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import queue
+import random
+import threading
+
+import pygame
+
+from animacion import AnimacionRecompensa, es_animada
+from indice_imagenes import ListaRutas
+from miniaturas import decodificar_ajustada
+
+
+def cargar_imagen_ajustada(ruta, width, height, miniaturas=None):
+    """
+    Carga una imagen escalada proporcionalmente para que quepa en width x height,
+    desde la caché de miniaturas si se indica una.
+    Devuelve (superficie, (x, y)) con la posición que la centra en pantalla.
+    """
+    if miniaturas is not None:
+        imagen = miniaturas.obtener(ruta, width, height)
+    else:
+        imagen = decodificar_ajustada(ruta, width, height)
+    new_w, new_h = imagen.get_size()
+
+    # Convertir al formato de la pantalla para que el blit sea directo
+    if pygame.display.get_surface() is not None:
+        if imagen.get_flags() & pygame.SRCALPHA:
+            imagen = imagen.convert_alpha()
+        else:
+            imagen = imagen.convert()
+
+    return imagen, ((width - new_w) // 2, (height - new_h) // 2)
+
+
+def cargar_recompensa(ruta, width, height, miniaturas=None, cuadros_animacion=8):
+    """
+    Como cargar_imagen_ajustada, pero los GIF/APNG animados se devuelven
+    como AnimacionRecompensa (que decodifica el resto de cuadros en segundo
+    plano) en lugar de una superficie.
+    """
+    if es_animada(ruta):
+        animacion = AnimacionRecompensa(ruta, width, height, cuadros_animacion)
+        new_w, new_h = animacion.tamano
+        return animacion, ((width - new_w) // 2, (height - new_h) // 2)
+    return cargar_imagen_ajustada(ruta, width, height, miniaturas)
+
+
+def liberar_recompensa(recompensa):
+    """
+    Detiene la decodificación de una recompensa animada que ya no se va a mostrar.
+    """
+    if recompensa is not None and isinstance(recompensa[0], AnimacionRecompensa):
+        recompensa[0].cerrar()
+
+
+class PrecargadorImagenes:
+    """
+    Decodifica, escala y convierte imágenes de recompensa en hilos de fondo,
+    dejándolas en una cola acotada para que el cambio de nivel nunca espere
+    al disco ni al decodificador.
+
+    Las imágenes que no se pueden cargar se descartan de las candidatas sin
+    afectar al nivel en curso. Las animadas se entregan como
+    AnimacionRecompensa con a lo sumo `cuadros_animacion` cuadros en memoria.
+    """
+
+    def __init__(self, width, height, capacidad=4, hilos=2, semilla=None, miniaturas=None,
+                 cuadros_animacion=8):
+        self.width = width
+        self.height = height
+        self.miniaturas = miniaturas
+        self.cuadros_animacion = cuadros_animacion
+        self._cola = queue.Queue(maxsize=max(1, capacidad))
+        self._condicion = threading.Condition()
+        self._candidatas = ListaRutas()
+        self._generacion = 0
+        self._detener = threading.Event()
+        self._rng = random.Random(semilla)
+
+        self._hilos = []
+        for i in range(max(1, hilos)):
+            hilo = threading.Thread(target=self._trabajar, name=f"precarga-{i}", daemon=True)
+            hilo.start()
+            self._hilos.append(hilo)
+
+    def establecer_imagenes(self, rutas):
+        """
+        Reemplaza la lista de candidatas (p. ej. al cambiar de directorio) y
+        descarta lo que estuviera precargado de la lista anterior. Una
+        ListaRutas se comparte tal cual, así que las imágenes descartadas por
+        error también desaparecen de la lista de quien la pasó.
+        """
+        if not isinstance(rutas, ListaRutas):
+            rutas = ListaRutas(rutas)
+        with self._condicion:
+            self._candidatas = rutas
+            self._generacion += 1
+            self._condicion.notify_all()
+        self._vaciar_cola()
+
+    def obtener(self):
+        """
+        Devuelve (imagen, (x, y)) de la siguiente imagen lista, o None si
+        todavía no hay ninguna. imagen es una superficie o una
+        AnimacionRecompensa. Nunca bloquea.
+        """
+        while True:
+            try:
+                generacion, imagen, posicion = self._cola.get_nowait()
+            except queue.Empty:
+                return None
+            if generacion == self._generacion:
+                return imagen, posicion
+            liberar_recompensa((imagen, posicion))
+
+    def detener(self):
+        """
+        Detiene los hilos de precarga.
+        """
+        self._detener.set()
+        with self._condicion:
+            self._condicion.notify_all()
+        self._vaciar_cola()
+        for hilo in self._hilos:
+            hilo.join(timeout=1.0)
+
+    def _vaciar_cola(self):
+        while True:
+            try:
+                _generacion, imagen, posicion = self._cola.get_nowait()
+            except queue.Empty:
+                return
+            liberar_recompensa((imagen, posicion))
+
+    def _trabajar(self):
+        while not self._detener.is_set():
+            with self._condicion:
+                while not self._candidatas and not self._detener.is_set():
+                    self._condicion.wait(0.25)
+                if self._detener.is_set():
+                    return
+                indice = self._rng.randrange(len(self._candidatas))
+                ruta = self._candidatas[indice]
+                generacion = self._generacion
+
+            try:
+                imagen, posicion = cargar_recompensa(ruta, self.width, self.height, self.miniaturas,
+                                                     self.cuadros_animacion)
+            except (pygame.error, OSError, ValueError, EOFError) as e:
+                with self._condicion:
+                    if generacion == self._generacion and self._candidatas.descartar(indice, ruta):
+                        print(f"Error al cargar imagen {ruta}: {e}")
+                continue
+
+            # Esperar hueco en la cola; si mientras tanto cambió la lista, descartar
+            while not self._detener.is_set() and generacion == self._generacion:
+                try:
+                    self._cola.put((generacion, imagen, posicion), timeout=0.25)
+                    break
+                except queue.Full:
+                    pass
+            else:
+                liberar_recompensa((imagen, posicion))
@@ -0,0 +1,463 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import heapq
+import json
+import os
+import queue
+import re
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+
+# Bloqueo de archivos entre procesos: fcntl en Unix, msvcrt en Windows
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+ARCHIVO_PUNTAJES = "score.json"
+
+# Los récords nuevos no reescriben score.json: se añaden a su diario (ruta +
+# ".diario", una línea JSON [usuario, puntaje] por récord) y el diario se
+# compacta en score.json cuando supera este tamaño. Los lectores combinan
+# ambos, así que guardar un récord cuesta lo mismo con 10 usuarios que con
+# un millón.
+LIMITE_DIARIO = 256 * 1024
+
+
+def ruta_diario(ruta):
+    return ruta + ".diario"
+
+
+@contextmanager
+def bloqueo_archivo(ruta):
+    """
+    Bloqueo exclusivo entre procesos sobre ruta + ".lock", para que dos
+    instancias del juego no escriban los puntajes a la vez.
+    """
+    with open(ruta + ".lock", "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def leer_puntajes(ruta=ARCHIVO_PUNTAJES):
+    """
+    Lee el diccionario de puntajes (con los récords del diario). Si el
+    archivo está dañado se aparta como ruta + ".corrupto" para no perderlo y
+    solo quedan los del diario.
+    """
+    puntajes = {}
+    if os.path.exists(ruta):
+        try:
+            with open(ruta, "r") as f:
+                puntajes = json.load(f)
+        except ValueError as e:
+            _apartar_corrupto(ruta, e)
+    return fusionar_puntajes(puntajes, leer_diario(ruta))
+
+
+def leer_diario(ruta=ARCHIVO_PUNTAJES):
+    """
+    Mejor puntaje de cada usuario en el diario de ruta ({} si no hay). Las
+    líneas dañadas (p. ej. una cortada por un apagón) se ignoran.
+    """
+    mejores = {}
+    try:
+        with open(ruta_diario(ruta), "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    usuario, puntaje = json.loads(linea)
+                except (ValueError, TypeError):
+                    continue
+                if puntaje > mejores.get(usuario, float("-inf")):
+                    mejores[usuario] = puntaje
+    except FileNotFoundError:
+        pass
+    return mejores
+
+
+def _apartar_corrupto(ruta, error):
+    print(f"Archivo de puntajes dañado ({error}); se guarda una copia en {ruta}.corrupto")
+    try:
+        os.replace(ruta, ruta + ".corrupto")
+    except OSError:
+        pass
+
+
+# Un par "usuario": puntaje del objeto de score.json
+_PAR = re.compile(r'"((?:[^"\\]|\\.)*)"\s*:\s*(-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)')
+_RESTO_VALIDO = re.compile(r"[\s{},]*")
+
+
+def iterar_puntajes(ruta=ARCHIVO_PUNTAJES, tamano_bloque=1 << 20):
+    """
+    Recorre score.json devolviendo pares (usuario, puntaje) a medida que los
+    lee por bloques, sin construir el diccionario completo en memoria. Los
+    récords del diario se aplican al paso; cada usuario aparece una vez.
+    Lanza ValueError si el archivo está dañado.
+    """
+    return _fusionar_diario(_iterar_tabla(ruta, tamano_bloque), leer_diario(ruta))
+
+
+def _fusionar_diario(pares, diario):
+    # diario es un diccionario pequeño que se consume a medida que aparecen sus usuarios
+    for usuario, puntaje in pares:
+        nuevo = diario.pop(usuario, None)
+        yield usuario, nuevo if nuevo is not None and nuevo > puntaje else puntaje
+    yield from diario.items()
+
+
+def _iterar_tabla(ruta, tamano_bloque=1 << 20):
+    # Pares de score.json, sin el diario (vacío si el archivo aún no existe)
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, "r", encoding="utf-8") as f:
+        resto = ""
+        while True:
+            bloque = f.read(tamano_bloque)
+            fin_archivo = not bloque
+            buffer = resto + bloque
+            # Sólo se analiza hasta la última coma: un número al final del
+            # bloque podría estar cortado
+            limite = len(buffer) if fin_archivo else buffer.rfind(",") + 1
+            pos = 0
+            for par in _PAR.finditer(buffer, 0, limite):
+                if not _RESTO_VALIDO.fullmatch(buffer, pos, par.start()):
+                    raise ValueError(f"contenido inesperado en {ruta}")
+                usuario = par.group(1)
+                if "\\" in usuario:
+                    usuario = json.loads(f'"{usuario}"')
+                numero = par.group(2)
+                yield usuario, float(numero) if "." in numero or "e" in numero.lower() else int(numero)
+                pos = par.end()
+            resto = buffer[pos:]
+            if fin_archivo:
+                if not _RESTO_VALIDO.fullmatch(resto) or not resto.rstrip().endswith("}"):
+                    raise ValueError(f"{ruta} está incompleto")
+                return
+
+
+def fusionar_puntajes(base, nuevos):
+    """
+    Combina dos tablas de puntajes conservando el mejor puntaje de cada usuario.
+    """
+    resultado = dict(base)
+    for usuario, puntaje in nuevos.items():
+        if puntaje > resultado.get(usuario, float("-inf")):
+            resultado[usuario] = puntaje
+    return resultado
+
+
+def guardar_fusionado(puntajes, ruta=ARCHIVO_PUNTAJES):
+    """
+    Guarda los puntajes indicados (normalmente unos pocos récords) sin perder
+    los que otras instancias tengan en disco: bajo bloqueo, los añade al
+    diario de ruta, y si el diario superó LIMITE_DIARIO lo compacta en ruta.
+    El coste no depende del tamaño de la tabla salvo al compactar.
+    """
+    if not puntajes:
+        return
+    with bloqueo_archivo(ruta):
+        if not os.path.exists(ruta):
+            # Primera escritura: se crea score.json directamente
+            _compactar(ruta, puntajes)
+            return
+        with open(ruta_diario(ruta), "ab+") as f:
+            # Una línea cortada por un corte anterior no debe pegarse a la primera nueva
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            for usuario, puntaje in puntajes.items():
+                f.write(json.dumps([usuario, puntaje]).encode("utf-8") + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            tamano = f.tell()
+        if tamano > LIMITE_DIARIO:
+            _compactar(ruta)
+
+
+def compactar_puntajes(ruta=ARCHIVO_PUNTAJES):
+    """
+    Pasa el diario a score.json (bajo bloqueo) y lo elimina.
+    """
+    with bloqueo_archivo(ruta):
+        _compactar(ruta)
+
+
+def _compactar(ruta, extra=None):
+    # Reescribe ruta en streaming con los récords del diario (y extra), con
+    # reemplazo atómico: un corte a mitad de escritura nunca deja el archivo a medias
+    diario = fusionar_puntajes(leer_diario(ruta), extra or {})
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    try:
+        with open(temporal, "w", encoding="utf-8") as f:
+            try:
+                _escribir_tabla(f, _fusionar_diario(_iterar_tabla(ruta), diario))
+            except ValueError as e:
+                # score.json dañado: se aparta y se conserva al menos el diario
+                _apartar_corrupto(ruta, e)
+                f.seek(0)
+                f.truncate()
+                _escribir_tabla(f, fusionar_puntajes(leer_diario(ruta), extra or {}).items())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+    try:
+        os.remove(ruta_diario(ruta))
+    except FileNotFoundError:
+        pass
+
+
+def _escribir_tabla(f, pares):
+    f.write("{")
+    separador = ""
+    for usuario, puntaje in pares:
+        f.write(f"{separador}{json.dumps(usuario)}:{json.dumps(puntaje)}")
+        separador = ","
+    f.write("}")
+
+
+class EscritorPuntajes:
+    """
+    Guarda los puntajes en un hilo de fondo para que el frame en que se
+    completa un nivel no espere al disco. Las actualizaciones que llegan
+    juntas se agrupan en una sola escritura.
+    """
+
+    def __init__(self, ruta=ARCHIVO_PUNTAJES, intervalo=0.5):
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self.escrituras = 0
+        self._cola = queue.Queue()
+        self._hilo = threading.Thread(target=self._trabajar, name="puntajes", daemon=True)
+        self._hilo.start()
+
+    def actualizar(self, usuario, puntaje):
+        """
+        Encola el nuevo puntaje de un usuario. Nunca bloquea.
+        """
+        self._cola.put((usuario, puntaje))
+
+    def cerrar(self):
+        """
+        Escribe lo pendiente y detiene el hilo.
+        """
+        self._cola.put(None)
+        self._hilo.join()
+
+    def _trabajar(self):
+        terminar = False
+        while not terminar:
+            elemento = self._cola.get()
+            if elemento is None:
+                break
+            pendientes = dict([elemento])
+
+            # Agrupar lo que llegue durante el intervalo
+            limite = time.monotonic() + self.intervalo
+            while True:
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    elemento = self._cola.get(timeout=restante)
+                except queue.Empty:
+                    break
+                if elemento is None:
+                    terminar = True
+                    break
+                usuario, puntaje = elemento
+                pendientes = fusionar_puntajes(pendientes, {usuario: puntaje})
+
+            try:
+                guardar_fusionado(pendientes, self.ruta)
+                self.escrituras += 1
+            except OSError as e:
+                print(f"Error al guardar puntajes: {e}")
+
+
+class TablaPuntajes:
+    """
+    Tabla de clasificación incremental para tablas de puntajes muy grandes.
+
+    Guarda la cantidad de usuarios por puntaje en un árbol de Fenwick, así
+    que actualizar un puntaje y calcular la posición de un usuario cuestan
+    O(log P), con P el mayor puntaje. Además mantiene los `limite` mejores.
+    Del resto de usuarios solo se conservan los "seguidos" (p. ej. el usuario
+    actual): como los puntajes guardados son récords y solo suben, los
+    mejores siguen siendo exactos sin tener todo score.json en memoria.
+
+    Por lo mismo, una tabla leída de un archivo solo admite actualizar()
+    de usuarios seguidos o entre los mejores: de los demás no sabe si ya
+    están contados.
+    """
+
+    def __init__(self, limite=10, seguidos=()):
+        self.limite = limite
+        self._seguidos = set(seguidos)
+        # True si hay usuarios contados que no se conservan (desde_archivo)
+        self._parcial = False
+        self._conocidos = {}
+        self._orden = {}
+        self._mejores = []
+        self._total = 0
+        self._capacidad = 1024
+        self._arbol = array("q", bytes(8 * (self._capacidad + 1)))
+        self._conteos = array("q", bytes(8 * (self._capacidad + 1)))
+
+    @classmethod
+    def desde_archivo(cls, ruta=ARCHIVO_PUNTAJES, limite=10, seguidos=()):
+        """
+        Construye la tabla leyendo score.json en streaming.
+        """
+        tabla = cls(limite, seguidos)
+        if not os.path.exists(ruta):
+            return tabla
+        # Los mejores se seleccionan con un montículo de tamaño limite
+        # (clave: puntaje y, a igualdad, el que aparece antes en el archivo)
+        monticulo = []
+        try:
+            for orden, (usuario, puntaje) in enumerate(iterar_puntajes(ruta)):
+                puntaje = max(0, int(puntaje))
+                if puntaje > tabla._capacidad:
+                    tabla._ampliar(puntaje)
+                tabla._conteos[puntaje] += 1
+                tabla._total += 1
+                if usuario in tabla._seguidos:
+                    tabla._conocidos[usuario] = puntaje
+                    tabla._orden[usuario] = orden
+                elemento = (puntaje, -orden, usuario)
+                if len(monticulo) < limite:
+                    heapq.heappush(monticulo, elemento)
+                elif elemento > monticulo[0]:
+                    heapq.heapreplace(monticulo, elemento)
+        except (ValueError, TypeError) as e:
+            _apartar_corrupto(ruta, e)
+            return cls(limite, seguidos)
+
+        tabla._reconstruir()
+        tabla._parcial = True
+        for puntaje, orden, usuario in sorted(monticulo, reverse=True):
+            tabla._mejores.append((usuario, puntaje))
+            tabla._conocidos[usuario] = puntaje
+            tabla._orden[usuario] = -orden
+        return tabla
+
+    def __len__(self):
+        return self._total
+
+    def puntaje(self, usuario):
+        """
+        Puntaje de un usuario seguido o de los mejores; None si no se conoce.
+        """
+        return self._conocidos.get(usuario)
+
+    def mejores(self):
+        """
+        Lista de tuplas (nombre_usuario, puntaje) de los mejores, de mayor a menor.
+        """
+        return list(self._mejores)
+
+    def posicion(self, usuario):
+        """
+        Posición (1 = primero) del usuario; los empates comparten posición.
+        """
+        puntaje = self._conocidos.get(usuario)
+        if puntaje is None:
+            return None
+        return self._total - self._prefijo(puntaje) + 1
+
+    def actualizar(self, usuario, puntaje):
+        """
+        Fija el puntaje de un usuario en O(log P). Un usuario seguido que no
+        estaba en el archivo (o cualquiera desconocido en una tabla creada
+        vacía) se considera nuevo; en una tabla leída de un archivo, un
+        usuario que no está seguido ni entre los mejores lanza KeyError,
+        porque podría estar ya contado con otro puntaje.
+        """
+        puntaje = max(0, int(puntaje))
+        anterior = self._conocidos.get(usuario)
+        if anterior == puntaje:
+            return
+        if anterior is None and self._parcial and usuario not in self._seguidos:
+            raise KeyError(f"{usuario!r} no está seguido en la tabla leída del archivo")
+        if anterior is None:
+            self._orden[usuario] = self._total
+            self._total += 1
+        else:
+            self._sumar(anterior, -1)
+        self._sumar(puntaje, 1)
+        self._conocidos[usuario] = puntaje
+        self._seguidos.add(usuario)
+
+        # Reubicar al usuario entre los mejores (lista de tamaño limite)
+        mejores = [(u, p) for u, p in self._mejores if u != usuario]
+        mejores.append((usuario, puntaje))
+        mejores.sort(key=lambda x: (-x[1], self._orden[x[0]]))
+        for u, _p in mejores[self.limite:]:
+            if u not in self._seguidos:
+                del self._conocidos[u]
+        self._mejores = mejores[:self.limite]
+
+    def _sumar(self, puntaje, delta):
+        if puntaje > self._capacidad:
+            self._crecer(puntaje)
+        self._conteos[puntaje] += delta
+        i = puntaje + 1
+        while i <= self._capacidad + 1:
+            self._arbol[i - 1] += delta
+            i += i & -i
+
+    def _prefijo(self, puntaje):
+        # Cantidad de usuarios con puntaje <= puntaje
+        total = 0
+        i = min(puntaje, self._capacidad) + 1
+        while i > 0:
+            total += self._arbol[i - 1]
+            i -= i & -i
+        return total
+
+    def _crecer(self, puntaje):
+        self._ampliar(puntaje)
+        self._reconstruir()
+
+    def _ampliar(self, puntaje):
+        capacidad = self._capacidad
+        while capacidad < puntaje:
+            capacidad *= 2
+        self._conteos.extend(array("q", bytes(8 * (capacidad - self._capacidad))))
+        self._capacidad = capacidad
+
+    def _reconstruir(self):
+        # Construcción del árbol en O(P) a partir de los conteos
+        arbol = array("q", self._conteos)
+        n = len(arbol)
+        for i in range(1, n + 1):
+            padre = i + (i & -i)
+            if padre <= n:
+                arbol[padre - 1] += arbol[i - 1]
+        self._arbol = arbol
@@ -0,0 +1,198 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import json
+import os
+import time
+from array import array
+
+
+# Fases del bucle del nivel, en el orden en que ocurren dentro de un frame
+FASES = ("espera", "eventos", "simulacion", "capas", "dibujo", "presentacion")
+
+
+class MedidorFrames:
+    """
+    Mide cuánto tarda cada fase del bucle del nivel y guarda los últimos
+    frames en un buffer circular de tamaño fijo (un array por fase).
+
+    Uso por frame: iniciar_frame() -> marcar(fase) tras cada fase -> cerrar_frame().
+    Un frame se cuenta como perdido si dura más de 1.5 veces el presupuesto.
+    """
+
+    def __init__(self, capacidad=600, presupuesto=1.0 / 60.0):
+        self.capacidad = capacidad
+        self.presupuesto = presupuesto
+        self.frames = 0
+        self.perdidos = 0
+        self._totales = array("d", bytes(8 * capacidad))
+        self._fases = {fase: array("d", bytes(8 * capacidad)) for fase in FASES}
+        self._actual = dict.fromkeys(FASES, 0.0)
+        self._indice = 0
+        self._ultimo = None
+
+    def iniciar_frame(self):
+        for fase in self._actual:
+            self._actual[fase] = 0.0
+        self._ultimo = time.perf_counter()
+
+    def marcar(self, fase):
+        """
+        Atribuye a la fase el tiempo transcurrido desde la marca anterior.
+        """
+        ahora = time.perf_counter()
+        if self._ultimo is not None:
+            self._actual[fase] += ahora - self._ultimo
+        self._ultimo = ahora
+
+    def cerrar_frame(self):
+        total = 0.0
+        for fase, duracion in self._actual.items():
+            self._fases[fase][self._indice] = duracion
+            total += duracion
+        self._totales[self._indice] = total
+        self._indice = (self._indice + 1) % self.capacidad
+        self.frames += 1
+        if total > self.presupuesto * 1.5:
+            self.perdidos += 1
+        self._ultimo = None
+
+    def _validos(self):
+        # Índices del buffer con datos, del más antiguo al más reciente
+        n = min(self.frames, self.capacidad)
+        inicio = (self._indice - n) % self.capacidad
+        return [(inicio + i) % self.capacidad for i in range(n)]
+
+    def resumen(self):
+        """
+        Devuelve percentiles p50/p95/p99 del tiempo de frame (ms), la media de
+        cada fase (ms) y el número de frames medidos y perdidos.
+        """
+        indices = self._validos()
+        if not indices:
+            return None
+        totales = sorted(self._totales[i] for i in indices)
+
+        def percentil(p):
+            return totales[min(len(totales) - 1, int(p * len(totales)))] * 1000.0
+
+        return {
+            "frames": self.frames,
+            "perdidos": self.perdidos,
+            "p50_ms": percentil(0.50),
+            "p95_ms": percentil(0.95),
+            "p99_ms": percentil(0.99),
+            "fases_ms": {
+                fase: sum(self._fases[fase][i] for i in indices) * 1000.0 / len(indices)
+                for fase in FASES
+            },
+        }
+
+    def exportar(self, ruta):
+        """
+        Exporta los frames del buffer a CSV o JSON según la extensión de la ruta.
+        """
+        indices = self._validos()
+        filas = [
+            [round(self._totales[i] * 1000.0, 4)] + [round(self._fases[f][i] * 1000.0, 4) for f in FASES]
+            for i in indices
+        ]
+        try:
+            if ruta.lower().endswith(".json"):
+                with open(ruta, "w") as f:
+                    json.dump({
+                        "resumen": self.resumen(),
+                        "columnas": ["total_ms"] + [f"{fase}_ms" for fase in FASES],
+                        "frames": filas,
+                    }, f)
+            else:
+                import csv
+
+                with open(ruta, "w", newline="") as f:
+                    escritor = csv.writer(f)
+                    escritor.writerow(["total_ms"] + [f"{fase}_ms" for fase in FASES])
+                    escritor.writerows(filas)
+            print(f"Métricas de rendimiento exportadas a {ruta}")
+        except OSError as e:
+            print(f"Error al exportar métricas de rendimiento: {e}")
+
+
+class CapturaPerfil:
+    """
+    Inicia y detiene una captura de cProfile; al detenerla la vuelca a un archivo .prof.
+    """
+
+    def __init__(self, directorio="."):
+        self.directorio = directorio
+        self._perfil = None
+
+    @property
+    def activa(self):
+        return self._perfil is not None
+
+    def alternar(self):
+        """
+        Inicia la captura si no hay una activa; si la hay, la detiene y devuelve la ruta del volcado.
+        """
+        if self._perfil is None:
+            import cProfile
+
+            self._perfil = cProfile.Profile()
+            self._perfil.enable()
+            print("Captura de perfil iniciada")
+            return None
+        return self.detener()
+
+    def detener(self):
+        if self._perfil is None:
+            return None
+        self._perfil.disable()
+        ruta = os.path.join(self.directorio, time.strftime("perfil_%Y%m%d_%H%M%S.prof"))
+        try:
+            self._perfil.dump_stats(ruta)
+            print(f"Perfil guardado en {ruta}")
+        except OSError as e:
+            print(f"Error al guardar el perfil: {e}")
+            ruta = None
+        self._perfil = None
+        return ruta
+
+
+class TiemposInicio:
+    """
+    Mide la duración de cada fase del arranque (importación, configuración,
+    pantalla, fuentes, puntajes...) para el informe de --tiempos-inicio.
+
+    marcar(fase) guarda el tiempo transcurrido desde la marca anterior;
+    descontar() reinicia la referencia sin guardar nada, para excluir la
+    espera del usuario (p. ej. mientras escribe su nombre).
+    """
+
+    def __init__(self, inicio=None):
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self._anterior = self.inicio
+        self._pausas = 0.0
+        self.fases = []
+
+    def marcar(self, fase):
+        ahora = time.perf_counter()
+        self.fases.append((fase, ahora - self._anterior, ahora - self.inicio - self._pausas))
+        self._anterior = ahora
+
+    def descontar(self):
+        ahora = time.perf_counter()
+        self._pausas += ahora - self._anterior
+        self._anterior = ahora
+
+    def informe(self):
+        """
+        Devuelve el informe como texto: duración de cada fase y tiempo
+        acumulado desde el inicio (sin contar la espera del usuario).
+        """
+        lineas = ["Tiempos de arranque:"]
+        for fase, duracion, acumulado in self.fases:
+            lineas.append(f"  {fase:<14} {duracion * 1000.0:8.1f} ms  (acumulado {acumulado * 1000.0:8.1f} ms)")
+        return "\n".join(lineas)
@@ -0,0 +1,337 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+
+Patrones de retroceso precalculados.
+
+Un patrón es la secuencia del desplazamiento acumulado (x, y) que produce el
+retroceso, muestreada cada `intervalo` segundos. La simulación lo consulta
+por tiempo transcurrido en lugar de sortear el retroceso en cada paso, así
+que dos partidas con el mismo patrón tienen exactamente el mismo retroceso.
+Los patrones se generan a partir de una semilla o se leen de una biblioteca
+(.aimpat) que se abre con un mapa en memoria: los cuadros de cada patrón se
+usan directamente desde el archivo, sin analizarlo ni copiarlo.
+
+    python retroceso.py biblioteca.aimpat --procedural 100 --semilla 0
+    python retroceso.py biblioteca.aimpat --csv ak47.csv m4a1.csv --intervalo 0.1
+    python retroceso.py biblioteca.aimpat --info
+"""
+
+import argparse
+import csv
+import math
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from itertools import accumulate, islice, repeat
+
+
+# Cabecera de 16 bytes: firma, versión, cantidad de patrones
+FIRMA = b"AIMPAT\x00\x01"
+CABECERA = struct.Struct("<8sHxxI")
+
+# Entrada del índice, una por patrón: nombre, posición de sus muestras en el
+# archivo, cantidad de muestras y segundos entre muestras. Las muestras son
+# pares float32 (x, y) little-endian.
+ENTRADA = struct.Struct("<32sQIf")
+
+# Duración de los patrones generados; al llegar al final se alargan con
+# otro bloque igual de largo (ver PatronGenerado)
+DURACION_PATRON = 10.0
+
+
+class PatronRetroceso:
+    """
+    Retroceso acumulado muestreado cada `intervalo` segundos.
+
+    muestras es una secuencia plana x0, y0, x1, y1, ... de la posición tras
+    cada intervalo (en t = 0 el desplazamiento es 0). Entre muestras se
+    interpola linealmente. Pasado el final el patrón se alarga si puede
+    (extender()) y si no se repite a partir de la última posición, como una
+    ráfaga que no se detiene.
+    """
+
+    def __init__(self, muestras, intervalo, nombre=""):
+        if len(muestras) < 2:
+            raise ValueError(f"el patrón {nombre!r} no tiene muestras")
+        self.muestras = muestras
+        self.intervalo = intervalo
+        self.nombre = nombre
+        self.cantidad = len(muestras) // 2
+        self.final = (muestras[-2], muestras[-1])
+
+    @property
+    def duracion(self):
+        return self.cantidad * self.intervalo
+
+    def extender(self):
+        """
+        Alarga el patrón con más muestras. Los de longitud fija (grabados o
+        de una biblioteca) no se alargan: devuelven False y se repiten.
+        """
+        return False
+
+    def muestra(self, tiempo):
+        """
+        Desplazamiento (x, y) acumulado tras `tiempo` segundos.
+        """
+        while tiempo > self.duracion and self.extender():
+            pass
+        m = self.muestras
+        posicion = tiempo / self.intervalo
+        k = round(posicion)
+        if abs(posicion - k) < 1e-6:
+            # Tiempo justo sobre una muestra (el caso de la simulación cuando
+            # el intervalo es su paso fijo): sin interpolar
+            if k <= 0:
+                return 0.0, 0.0
+            ciclos, i = divmod(k - 1, self.cantidad)
+            return ciclos * self.final[0] + m[2 * i], ciclos * self.final[1] + m[2 * i + 1]
+
+        ciclos, posicion = divmod(posicion, self.cantidad)
+        i = int(posicion)
+        fraccion = posicion - i
+        if i:
+            x0, y0 = m[2 * i - 2], m[2 * i - 1]
+        else:
+            x0 = y0 = 0.0
+        x1, y1 = m[2 * i], m[2 * i + 1]
+        return (ciclos * self.final[0] + x0 + (x1 - x0) * fraccion,
+                ciclos * self.final[1] + y0 + (y1 - y0) * fraccion)
+
+
+class PatronGenerado(PatronRetroceso):
+    """
+    Patrón sorteado por generar_patron(). Al llegar al final no se repite:
+    sigue sorteando bloques del mismo largo con el mismo rng, así que un
+    nivel largo nunca vuelve a ver la misma ráfaga.
+    """
+
+    def __init__(self, muestras, intervalo, nombre, rng, base, ancho, vertical):
+        super().__init__(muestras, intervalo, nombre)
+        self._bloque = self.cantidad
+        self._aleatorio = rng.random
+        self._base = base
+        self._ancho = ancho
+        self._vertical = vertical
+
+    def extender(self):
+        self.muestras.extend(_sortear(self._bloque, self._aleatorio, self._base, self._ancho, self._vertical,
+                                      *self.final))
+        self.cantidad = len(self.muestras) // 2
+        self.final = (self.muestras[-2], self.muestras[-1])
+        return True
+
+
+def _sortear(pasos, aleatorio, base, ancho, vertical, x0=0.0, y0=0.0):
+    # Posiciones acumuladas de `pasos` pasos a partir de (x0, y0)
+    muestras = array("f", bytes(8 * pasos))
+    muestras[0::2] = array("f", islice(accumulate((base + ancho * aleatorio() for _ in range(pasos)), initial=x0),
+                                       1, None))
+    muestras[1::2] = array("f", islice(accumulate(repeat(vertical, pasos), initial=y0), 1, None))
+    return muestras
+
+
+def generar_patron(recoil_y, recoil_x_lower, recoil_x_upper, rng, factor_shake, paso,
+                   duracion=DURACION_PATRON, nombre=""):
+    """
+    Genera de una vez el retroceso que antes se sorteaba en cada paso: deriva
+    vertical constante y horizontal uniforme entre recoil_x_lower y
+    recoil_x_upper, ambas por factor_shake, una muestra por paso. El
+    patrón sigue sorteando con rng si se consulta pasado `duracion`.
+    """
+    pasos = max(1, round(duracion / paso))
+    base = recoil_x_lower * factor_shake
+    ancho = (recoil_x_upper - recoil_x_lower) * factor_shake
+    vertical = recoil_y * factor_shake
+    return PatronGenerado(_sortear(pasos, rng.random, base, ancho, vertical), paso, nombre, rng, base, ancho, vertical)
+
+
+class BibliotecaPatrones:
+    """
+    Biblioteca de patrones (.aimpat) abierta con un mapa en memoria. Cada
+    patrón es una vista sobre el archivo: abrir una biblioteca grande solo
+    lee su índice, y el sistema carga las páginas de los patrones que se usan.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            tamano = os.fstat(self._archivo.fileno()).st_size
+            if tamano < CABECERA.size:
+                raise ValueError(f"{ruta} no es una biblioteca de patrones")
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._archivo.close()
+            raise
+        self._vistas = []
+
+        firma, _version, cantidad = CABECERA.unpack_from(self._mapa, 0)
+        if firma != FIRMA or CABECERA.size + cantidad * ENTRADA.size > tamano:
+            self.cerrar()
+            raise ValueError(f"{ruta} no es una biblioteca de patrones")
+        self._entradas = []
+        self._por_nombre = {}
+        for i in range(cantidad):
+            nombre, desplazamiento, muestras, intervalo = ENTRADA.unpack_from(self._mapa, CABECERA.size + i * ENTRADA.size)
+            nombre = nombre.rstrip(b"\x00").decode("utf-8")
+            if desplazamiento % 4 or desplazamiento + 8 * muestras > tamano or muestras == 0 or intervalo <= 0:
+                self.cerrar()
+                raise ValueError(f"{ruta}: el patrón {nombre!r} está dañado")
+            self._entradas.append((nombre, desplazamiento, muestras, intervalo))
+            self._por_nombre[nombre] = i
+        self._patrones = {}
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def nombres(self):
+        return [entrada[0] for entrada in self._entradas]
+
+    def patron(self, clave):
+        """
+        Patrón por posición en la biblioteca o por nombre.
+        """
+        indice = self._por_nombre[clave] if isinstance(clave, str) else clave
+        patron = self._patrones.get(indice)
+        if patron is None:
+            nombre, desplazamiento, muestras, intervalo = self._entradas[indice]
+            vista = memoryview(self._mapa)[desplazamiento:desplazamiento + 8 * muestras]
+            self._vistas.append(vista)
+            if sys.byteorder == "little":
+                datos = vista.cast("f")
+                self._vistas.append(datos)
+            else:
+                datos = array("f", vista)
+                datos.byteswap()
+            patron = PatronRetroceso(datos, intervalo, nombre)
+            self._patrones[indice] = patron
+        return patron
+
+    def para_nivel(self, nivel):
+        """
+        Patrón del nivel indicado (1 = primero); si hay menos patrones que
+        niveles se reparten de forma cíclica.
+        """
+        return self.patron((nivel - 1) % len(self._entradas))
+
+    def cerrar(self):
+        # Las vistas deben liberarse antes de cerrar el mapa
+        self._patrones = {}
+        for vista in reversed(self._vistas):
+            vista.release()
+        self._vistas = []
+        self._mapa.close()
+        self._archivo.close()
+
+
+def guardar_biblioteca(ruta, patrones):
+    """
+    Escribe una biblioteca .aimpat con los patrones indicados (PatronRetroceso).
+    """
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(CABECERA.pack(FIRMA, 1, len(patrones)))
+        desplazamiento = CABECERA.size + len(patrones) * ENTRADA.size
+        for patron in patrones:
+            # Recortado a 32 bytes sin partir un carácter de varios bytes
+            nombre = patron.nombre.encode("utf-8")[:32].decode("utf-8", "ignore").encode("utf-8")
+            f.write(ENTRADA.pack(nombre, desplazamiento, patron.cantidad, patron.intervalo))
+            desplazamiento += 8 * patron.cantidad
+        for patron in patrones:
+            datos = array("f", patron.muestras)
+            if sys.byteorder != "little":
+                datos.byteswap()
+            datos.tofile(f)
+    os.replace(temporal, ruta)
+
+
+def leer_csv(ruta, intervalo):
+    """
+    Lee un patrón de un CSV con una fila "x,y" por disparo (en cuentas del
+    mouse), con `intervalo` segundos entre disparos. El primer disparo es el
+    de t = 0: las muestras son la posición de los siguientes respecto a él.
+    Las filas que no son números antes del primer disparo (p. ej. una
+    cabecera) y las vacías se ignoran; cualquier otra, o un CSV con menos de
+    dos disparos, lanza ValueError.
+    """
+    muestras = array("f")
+    origen = None
+    with open(ruta, newline="") as f:
+        for linea, fila in enumerate(csv.reader(f), 1):
+            if not any(campo.strip() for campo in fila):
+                continue
+            try:
+                x, y = float(fila[0]), float(fila[1])
+                if not (math.isfinite(x) and math.isfinite(y)):
+                    raise ValueError
+            except (IndexError, ValueError):
+                if origen is None:
+                    continue
+                raise ValueError(f"la fila {linea} no es un par x,y de números") from None
+            if origen is None:
+                origen = (x, y)
+                continue
+            muestras.extend((x - origen[0], y - origen[1]))
+    if not muestras:
+        raise ValueError("hacen falta al menos dos disparos")
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    return PatronRetroceso(muestras, intervalo, nombre)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crea o inspecciona bibliotecas de patrones de retroceso.")
+    parser.add_argument("biblioteca", help="archivo .aimpat")
+    parser.add_argument("--procedural", type=int, metavar="NIVELES",
+                        help="genera un patrón por nivel con la curva de dificultad del juego")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--diametro", type=float, default=None)
+    parser.add_argument("--duracion", type=float, default=DURACION_PATRON, help="segundos de cada patrón generado")
+    parser.add_argument("--csv", nargs="+", default=[], help="patrones de disparo x,y (uno por archivo)")
+    parser.add_argument("--intervalo", type=float, default=0.1, help="segundos entre disparos de los CSV")
+    parser.add_argument("--info", action="store_true", help="lista los patrones de la biblioteca")
+    args = parser.parse_args()
+
+    if args.info:
+        try:
+            biblioteca = BibliotecaPatrones(args.biblioteca)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        for i, nombre in enumerate(biblioteca.nombres()):
+            patron = biblioteca.patron(i)
+            x, y = patron.muestra(patron.duracion)
+            print(f"{i:4d} {nombre:32s} {patron.cantidad:6d} muestras cada {patron.intervalo * 1000:.1f} ms, "
+                  f"final ({x:.1f}, {y:.1f})")
+        biblioteca.cerrar()
+        return
+
+    from motor import FACTOR_SHAKE, PASO_SIMULACION, calcular_parametros_nivel
+
+    patrones = []
+    if args.procedural:
+        rng = random.Random(args.semilla)
+        for nivel in range(1, args.procedural + 1):
+            _tolerancia, recoil_y, recoil_x_lower, recoil_x_upper, _tiempo = calcular_parametros_nivel(
+                nivel, args.procedural, args.diametro)
+            patrones.append(generar_patron(recoil_y, recoil_x_lower, recoil_x_upper, rng, FACTOR_SHAKE,
+                                           PASO_SIMULACION, args.duracion, nombre=f"nivel{nivel}"))
+    for ruta in args.csv:
+        try:
+            patrones.append(leer_csv(ruta, args.intervalo))
+        except OSError as e:
+            parser.error(f"{ruta}: {e.strerror}")
+        except ValueError as e:
+            parser.error(f"{ruta}: {e}")
+    if not patrones:
+        parser.error("indique --procedural o --csv")
+    guardar_biblioteca(args.biblioteca, patrones)
+    print(f"{len(patrones)} patrones guardados en {args.biblioteca} ({os.path.getsize(args.biblioteca)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
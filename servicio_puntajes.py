@@ -0,0 +1,463 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+
+Servicio local que reúne los puntajes de varias estaciones de entrenamiento.
+
+Cada instancia del juego se conecta por TCP y envía sus récords y un resumen
+de cada sesión; el servicio los agrupa en lotes, mantiene la clasificación
+global en memoria, la guarda periódicamente en disco y envía a los clientes
+solo los cambios de la tabla de mejores.
+
+El protocolo es JSON, un mensaje por línea:
+
+    cliente -> servicio  {"tipo": "hola", "usuario": ...}
+                         {"tipo": "puntaje", "usuario": ..., "puntaje": ...}
+                         {"tipo": "resumen", "usuario": ..., ...}
+    servicio -> cliente  {"tipo": "tabla", "mejores": [[usuario, puntaje], ...], "total": N, "posicion": P}
+                         {"tipo": "delta", "cambios": [[usuario, puntaje], ...], "salen": [...],
+                          "total": N, "posicion": P}
+
+    python servicio_puntajes.py --puerto 8765
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+
+from puntajes import TablaPuntajes, fusionar_puntajes, guardar_fusionado, iterar_puntajes
+
+
+ARCHIVO_GLOBAL = "score_global.json"
+ARCHIVO_RESUMENES = "sesiones_global.jsonl"
+PUERTO_PREDETERMINADO = 8765
+
+# Un cliente que no lee lo que se le envía se desconecta al acumular este
+# volumen sin enviar, para que no retrase a los demás
+LIMITE_BUFFER_CLIENTE = 1 << 20
+
+# Las líneas más largas que esto se consideran un error del cliente
+LIMITE_LINEA = 64 * 1024
+
+# La clasificación cuenta usuarios por puntaje (TablaPuntajes), así que un
+# puntaje absurdo de un cliente haría crecer la tabla sin medida
+PUNTAJE_MAXIMO = 10 ** 7
+
+
+def separar_direccion(direccion, puerto=PUERTO_PREDETERMINADO):
+    """
+    Convierte "host:puerto" (o solo "host") en (host, puerto).
+    """
+    host, _, texto_puerto = str(direccion).rpartition(":")
+    if not host:
+        return texto_puerto or "127.0.0.1", puerto
+    return host, int(texto_puerto)
+
+
+def _linea(mensaje):
+    return (json.dumps(mensaje, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class ServicioPuntajes:
+    """
+    Clasificación global compartida por todas las estaciones.
+
+    Las actualizaciones que llegan se acumulan y se aplican en lotes cada
+    `intervalo_lote` segundos: un lote produce como mucho un mensaje por
+    cliente, aunque cientos de estaciones envíen récords a la vez. La tabla
+    se guarda en `ruta` cada `intervalo_instantanea` segundos si cambió, en
+    un hilo para no detener el bucle de eventos.
+    """
+
+    def __init__(self, ruta=ARCHIVO_GLOBAL, ruta_resumenes=ARCHIVO_RESUMENES, limite=10,
+                 intervalo_lote=0.25, intervalo_instantanea=30.0):
+        self.ruta = ruta
+        self.ruta_resumenes = ruta_resumenes
+        self.limite = limite
+        self.intervalo_lote = intervalo_lote
+        self.intervalo_instantanea = intervalo_instantanea
+        self.puntajes = {}
+        self.tabla = TablaPuntajes(limite)
+        self.lotes = 0
+        self.instantaneas = 0
+        self._pendientes = {}
+        self._resumenes = []
+        self._clientes = {}
+        # Récords aplicados desde la última instantánea (solo esos se escriben)
+        self._cambiados = {}
+        self._servidor = None
+        self._tareas = []
+        self._cargar()
+
+    def _cargar(self):
+        if not os.path.exists(self.ruta):
+            return
+        try:
+            for usuario, puntaje in iterar_puntajes(self.ruta):
+                if 0 <= puntaje <= PUNTAJE_MAXIMO:
+                    self._aplicar(usuario, int(puntaje))
+        except ValueError as e:
+            print(f"No se pudo leer {self.ruta}: {e}")
+        print(f"Clasificación global cargada: {len(self.puntajes)} usuarios")
+
+    def _aplicar(self, usuario, puntaje):
+        if puntaje <= self.puntajes.get(usuario, -1):
+            return False
+        self.puntajes[usuario] = puntaje
+        self.tabla.actualizar(usuario, puntaje)
+        return True
+
+    def _mensaje_tabla(self, usuario):
+        return {
+            "tipo": "tabla",
+            "mejores": [list(par) for par in self.tabla.mejores()],
+            "total": len(self.tabla),
+            "posicion": self.tabla.posicion(usuario) if usuario is not None else None,
+        }
+
+    async def iniciar(self, host="127.0.0.1", puerto=PUERTO_PREDETERMINADO):
+        """
+        Empieza a aceptar clientes y lanza las tareas de lotes e instantáneas.
+        Devuelve el puerto real (útil con puerto 0).
+        """
+        self._servidor = await asyncio.start_server(self._atender, host, puerto, limit=LIMITE_LINEA)
+        self._tareas = [
+            asyncio.create_task(self._procesar_lotes()),
+            asyncio.create_task(self._guardar_periodicamente()),
+        ]
+        return self._servidor.sockets[0].getsockname()[1]
+
+    async def cerrar(self):
+        """
+        Deja de aceptar clientes, aplica lo pendiente y guarda una última instantánea.
+        """
+        for tarea in self._tareas:
+            tarea.cancel()
+        await asyncio.gather(*self._tareas, return_exceptions=True)
+        self._procesar_lote()
+        if self._servidor is not None:
+            self._servidor.close()
+            # wait_closed espera a que se cierren también las conexiones abiertas
+            for escritor in list(self._clientes):
+                escritor.close()
+            await self._servidor.wait_closed()
+        await self._guardar()
+
+    async def _atender(self, lector, escritor):
+        self._clientes[escritor] = None
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except (asyncio.LimitOverrunError, ValueError, ConnectionError):
+                    break
+                if not linea:
+                    break
+                try:
+                    mensaje = json.loads(linea)
+                    tipo = mensaje["tipo"]
+                except (ValueError, KeyError, TypeError):
+                    continue
+
+                if tipo == "hola":
+                    usuario = str(mensaje.get("usuario", ""))
+                    self._clientes[escritor] = usuario
+                    escritor.write(_linea(self._mensaje_tabla(usuario)))
+                elif tipo == "puntaje":
+                    try:
+                        usuario = str(mensaje["usuario"])
+                        puntaje = int(mensaje["puntaje"])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    if not 0 <= puntaje <= PUNTAJE_MAXIMO:
+                        continue
+                    if puntaje > self._pendientes.get(usuario, -1):
+                        self._pendientes[usuario] = puntaje
+                elif tipo == "resumen":
+                    mensaje["recibido"] = time.time()
+                    self._resumenes.append(mensaje)
+        finally:
+            self._clientes.pop(escritor, None)
+            escritor.close()
+
+    async def _procesar_lotes(self):
+        while True:
+            await asyncio.sleep(self.intervalo_lote)
+            self._procesar_lote()
+
+    def _procesar_lote(self):
+        if not self._pendientes:
+            return
+        pendientes, self._pendientes = self._pendientes, {}
+        anteriores = dict(self.tabla.mejores())
+        cambiaron = False
+        for usuario, puntaje in pendientes.items():
+            if self._aplicar(usuario, puntaje):
+                self._cambiados[usuario] = puntaje
+                cambiaron = True
+        if not cambiaron:
+            return
+        self.lotes += 1
+
+        # Delta de la tabla de mejores respecto al lote anterior
+        mejores = self.tabla.mejores()
+        cambios = [[usuario, puntaje] for usuario, puntaje in mejores if anteriores.get(usuario) != puntaje]
+        actuales = {usuario for usuario, _ in mejores}
+        salen = [usuario for usuario in anteriores if usuario not in actuales]
+        total = len(self.tabla)
+        for escritor, usuario in list(self._clientes.items()):
+            if escritor.transport.get_write_buffer_size() > LIMITE_BUFFER_CLIENTE:
+                escritor.close()
+                continue
+            # Con la posición de cada estación cambiando, los que no ven
+            # cambios en la tabla también reciben su nueva posición
+            escritor.write(_linea({
+                "tipo": "delta",
+                "cambios": cambios,
+                "salen": salen,
+                "total": total,
+                "posicion": self.tabla.posicion(usuario) if usuario is not None else None,
+            }))
+
+    async def _guardar_periodicamente(self):
+        while True:
+            await asyncio.sleep(self.intervalo_instantanea)
+            await self._guardar()
+
+    async def _guardar(self):
+        if not self._cambiados and not self._resumenes:
+            return
+        puntajes, self._cambiados = self._cambiados, {}
+        resumenes, self._resumenes = self._resumenes, []
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, self._escribir, puntajes, resumenes)
+            self.instantaneas += 1
+        except OSError as e:
+            print(f"Error al guardar la clasificación global: {e}")
+            self._cambiados = fusionar_puntajes(puntajes, self._cambiados)
+            self._resumenes[:0] = resumenes
+
+    def _escribir(self, puntajes, resumenes):
+        if puntajes:
+            guardar_fusionado(puntajes, self.ruta)
+        if resumenes:
+            with open(self.ruta_resumenes, "a", encoding="utf-8") as f:
+                for resumen in resumenes:
+                    f.write(json.dumps(resumen, ensure_ascii=False) + "\n")
+
+
+class ClientePuntajes:
+    """
+    Conexión del juego con el servicio de puntajes.
+
+    Toda la red vive en un hilo con su propio bucle asyncio: actualizar() y
+    enviar_resumen() solo dejan el dato en memoria y clasificacion() devuelve
+    lo último recibido, así que el bucle del juego nunca espera a la red. Si
+    el servicio no responde se reintenta cada `reintento` segundos y, al
+    reconectar, se reenvían los mejores puntajes enviados hasta entonces.
+    """
+
+    def __init__(self, direccion, usuario, reintento=2.0, tiempo_conexion=2.0):
+        self.host, self.puerto = separar_direccion(direccion)
+        self.usuario = usuario
+        self.reintento = reintento
+        self.tiempo_conexion = tiempo_conexion
+        self.conectado = False
+        self._lock = threading.Lock()
+        self._enviados = {}
+        self._pendientes = {}
+        self._resumenes = []
+        self._mejores = []
+        self._total = 0
+        self._posicion = None
+        self._cambios = False
+        self._loop = None
+        self._despertar = None
+        self._detener = False
+        self._listo = threading.Event()
+        self._hilo = threading.Thread(target=self._ejecutar, name="cliente-puntajes", daemon=True)
+        self._hilo.start()
+
+    def actualizar(self, usuario, puntaje):
+        """
+        Encola un récord para el servicio. Nunca bloquea.
+        """
+        with self._lock:
+            if puntaje > self._pendientes.get(usuario, -1):
+                self._pendientes[usuario] = puntaje
+        self._avisar()
+
+    def enviar_resumen(self, resumen):
+        """
+        Encola el resumen de una sesión (un diccionario serializable). Nunca bloquea.
+        """
+        with self._lock:
+            self._resumenes.append(dict(resumen, tipo="resumen", usuario=self.usuario))
+        self._avisar()
+
+    def hay_cambios(self):
+        """
+        True si llegó algo nuevo del servicio (o cambió la conexión) desde la última llamada.
+        """
+        with self._lock:
+            cambios, self._cambios = self._cambios, False
+        return cambios
+
+    def clasificacion(self):
+        """
+        Devuelve (mejores, (posición, total)) globales, o None si no hay conexión.
+        """
+        with self._lock:
+            if not self.conectado:
+                return None
+            return [tuple(par) for par in self._mejores], (self._posicion, self._total)
+
+    def detener(self, espera=1.0):
+        """
+        Intenta enviar lo pendiente y cierra la conexión, esperando como mucho `espera` segundos.
+        """
+        self._detener = True
+        self._avisar()
+        self._hilo.join(timeout=espera)
+
+    def _avisar(self):
+        if self._listo.is_set():
+            try:
+                self._loop.call_soon_threadsafe(self._despertar.set)
+            except RuntimeError:
+                pass
+
+    def _ejecutar(self):
+        asyncio.run(self._principal())
+
+    async def _principal(self):
+        self._loop = asyncio.get_running_loop()
+        self._despertar = asyncio.Event()
+        self._listo.set()
+        while not self._detener:
+            try:
+                lector, escritor = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.puerto, limit=LIMITE_LINEA), self.tiempo_conexion)
+            except (OSError, asyncio.TimeoutError):
+                await self._esperar(self.reintento)
+                continue
+
+            tarea_lectura = asyncio.create_task(self._leer(lector))
+            try:
+                with self._lock:
+                    # Lo ya enviado se repite: la conexión anterior pudo caer antes de entregarlo
+                    for usuario, puntaje in self._enviados.items():
+                        if puntaje > self._pendientes.get(usuario, -1):
+                            self._pendientes[usuario] = puntaje
+                escritor.write(_linea({"tipo": "hola", "usuario": self.usuario}))
+                await self._escribir(escritor, tarea_lectura)
+            except (OSError, ConnectionError):
+                pass
+            finally:
+                tarea_lectura.cancel()
+                escritor.close()
+                with self._lock:
+                    if self.conectado:
+                        self.conectado = False
+                        self._cambios = True
+            if not self._detener:
+                await self._esperar(self.reintento)
+
+    async def _esperar(self, segundos):
+        self._despertar.clear()
+        try:
+            await asyncio.wait_for(self._despertar.wait(), segundos)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _escribir(self, escritor, tarea_lectura):
+        while True:
+            with self._lock:
+                pendientes, self._pendientes = self._pendientes, {}
+                resumenes, self._resumenes = self._resumenes, []
+            for usuario, puntaje in pendientes.items():
+                escritor.write(_linea({"tipo": "puntaje", "usuario": usuario, "puntaje": puntaje}))
+            for resumen in resumenes:
+                escritor.write(_linea(resumen))
+            try:
+                await escritor.drain()
+            except (OSError, ConnectionError):
+                # Devolver lo no confirmado para el próximo intento
+                with self._lock:
+                    for usuario, puntaje in pendientes.items():
+                        if puntaje > self._pendientes.get(usuario, -1):
+                            self._pendientes[usuario] = puntaje
+                    self._resumenes[:0] = resumenes
+                raise
+            with self._lock:
+                self._enviados.update(pendientes)
+            if self._detener or tarea_lectura.done():
+                return
+
+            self._despertar.clear()
+            espera = asyncio.create_task(self._despertar.wait())
+            await asyncio.wait({espera, tarea_lectura}, return_when=asyncio.FIRST_COMPLETED)
+            espera.cancel()
+
+    async def _leer(self, lector):
+        while True:
+            try:
+                linea = await lector.readline()
+            except (OSError, ConnectionError, ValueError):
+                return
+            if not linea:
+                return
+            try:
+                mensaje = json.loads(linea)
+            except ValueError:
+                continue
+            with self._lock:
+                if mensaje.get("tipo") == "tabla":
+                    self._mejores = [tuple(par) for par in mensaje["mejores"]]
+                    self.conectado = True
+                elif mensaje.get("tipo") == "delta":
+                    mejores = dict(self._mejores)
+                    for usuario in mensaje["salen"]:
+                        mejores.pop(usuario, None)
+                    mejores.update((usuario, puntaje) for usuario, puntaje in mensaje["cambios"])
+                    self._mejores = sorted(mejores.items(), key=lambda x: x[1], reverse=True)
+                else:
+                    continue
+                self._total = mensaje["total"]
+                self._posicion = mensaje["posicion"]
+                self._cambios = True
+
+
+async def _servir(args):
+    servicio = ServicioPuntajes(args.archivo, args.resumenes, intervalo_lote=args.lote,
+                                intervalo_instantanea=args.instantanea)
+    puerto = await servicio.iniciar(args.host, args.puerto)
+    print(f"Servicio de puntajes escuchando en {args.host}:{puerto}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await servicio.cerrar()
+        print(f"Clasificación guardada en {servicio.ruta}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio local de puntajes para varias estaciones")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=PUERTO_PREDETERMINADO)
+    parser.add_argument("--archivo", default=ARCHIVO_GLOBAL, help="instantánea de la clasificación global")
+    parser.add_argument("--resumenes", default=ARCHIVO_RESUMENES, help="resúmenes de sesión (JSON por línea)")
+    parser.add_argument("--lote", type=float, default=0.25, help="segundos entre lotes de actualizaciones")
+    parser.add_argument("--instantanea", type=float, default=30.0, help="segundos entre instantáneas en disco")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_servir(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+
+Telemetría en vivo para overlays y herramientas externas.
+
+El juego publica el estado de cada frame del nivel (nivel, puntaje, tiempo en
+objetivo, distancia al centro, duración del frame...) en un anillo de
+registros de tamaño fijo dentro de un archivo mapeado en memoria. Los
+lectores locales abren el mismo archivo y lo consultan sin bloqueos ni
+llamadas al juego: cada registro lleva un número de secuencia que el
+escritor pone impar mientras lo escribe y par al terminar, y el lector
+descarta lo que cambió mientras lo leía.
+
+    python telemetria.py                    # monitor con el último frame
+    python telemetria.py --todos            # cada frame como una línea JSON
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+from collections import namedtuple
+
+
+# Cabecera de 64 bytes: firma, versión, tamaño de registro, capacidad del
+# anillo, registros publicados, hora de inicio (epoch), pid y estado
+FIRMA = b"AIMTEL\x00\x01"
+CABECERA = struct.Struct("<8sHHIQdIB27x")
+POSICION_PUBLICADOS = 16
+POSICION_INICIO = 24
+POSICION_ESTADO = 36
+
+# Registro de 48 bytes: secuencia y datos del frame (segundos desde el
+# inicio, puntaje, nivel, banderas, tiempo en objetivo, tiempo objetivo,
+# distancia al centro, tolerancia y duración del frame en ms)
+SECUENCIA = struct.Struct("<Q")
+DATOS = struct.Struct("<dIHBxfffff4x")
+TAMANO_REGISTRO = SECUENCIA.size + DATOS.size
+
+BOTON = 0x01
+EN_OBJETIVO = 0x02
+
+CERRADO = 0
+ACTIVO = 1
+
+Telemetria = namedtuple("Telemetria", "secuencia tiempo puntaje nivel boton en_objetivo tiempo_en_objetivo "
+                                      "tiempo_objetivo distancia tolerancia frame_ms")
+
+# En Linux /dev/shm está en memoria: el archivo nunca llega a disco
+RUTA_PREDETERMINADA = os.path.join("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+                                   "aimtrainer.aimtel")
+
+
+class PublicadorTelemetria:
+    """
+    Escritor del anillo de telemetría (uno por archivo). publicar() solo
+    escribe en la memoria mapeada: no hay llamadas al sistema por frame.
+    """
+
+    def __init__(self, ruta=RUTA_PREDETERMINADA, capacidad=256):
+        self.ruta = ruta
+        self.capacidad = capacidad
+        self.publicados = 0
+        self._inicio = time.perf_counter()
+        tamano = CABECERA.size + capacidad * TAMANO_REGISTRO
+
+        # Un archivo del mismo tamaño se reutiliza en su sitio; si no, se
+        # crea otro y se reemplaza, para no recortar un archivo que un lector
+        # tenga mapeado
+        try:
+            reutilizar = os.path.getsize(ruta) == tamano
+        except OSError:
+            reutilizar = False
+        if reutilizar:
+            self._archivo = open(ruta, "r+b")
+        else:
+            directorio = os.path.dirname(ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            temporal = ruta + ".tmp"
+            with open(temporal, "wb") as f:
+                f.truncate(tamano)
+            os.replace(temporal, ruta)
+            self._archivo = open(ruta, "r+b")
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), tamano)
+        except (OSError, ValueError):
+            self._archivo.close()
+            raise
+        # Primero la cabecera (0 publicados) y después se borran las
+        # secuencias de la sesión anterior, que no deben pasar por válidas
+        CABECERA.pack_into(self._mapa, 0, FIRMA, 1, TAMANO_REGISTRO, capacidad, 0, time.time(), os.getpid(), ACTIVO)
+        self._mapa[CABECERA.size:] = bytes(capacidad * TAMANO_REGISTRO)
+
+    def publicar(self, nivel, puntaje, tiempo_en_objetivo, tiempo_objetivo, distancia, tolerancia, frame_ms,
+                 boton, en_objetivo):
+        """
+        Publica el estado de un frame.
+        """
+        n = self.publicados
+        posicion = CABECERA.size + (n % self.capacidad) * TAMANO_REGISTRO
+        mapa = self._mapa
+        SECUENCIA.pack_into(mapa, posicion, 2 * n + 1)
+        DATOS.pack_into(mapa, posicion + SECUENCIA.size, time.perf_counter() - self._inicio, puntaje, nivel,
+                        (BOTON if boton else 0) | (EN_OBJETIVO if en_objetivo else 0),
+                        tiempo_en_objetivo, tiempo_objetivo, distancia, tolerancia, frame_ms)
+        SECUENCIA.pack_into(mapa, posicion, 2 * n + 2)
+        SECUENCIA.pack_into(mapa, POSICION_PUBLICADOS, n + 1)
+        self.publicados = n + 1
+
+    def cerrar(self):
+        """
+        Marca la telemetría como cerrada (los lectores dejan de esperar frames) y libera el mapa.
+        """
+        if self._mapa is None:
+            return
+        self._mapa[POSICION_ESTADO] = CERRADO
+        self._mapa.close()
+        self._archivo.close()
+        self._mapa = None
+
+
+class LectorTelemetria:
+    """
+    Lector del anillo de telemetría. No escribe en el archivo ni se
+    coordina con el juego: si un registro se sobrescribe mientras se lee, la
+    lectura se descarta.
+    """
+
+    def __init__(self, ruta=RUTA_PREDETERMINADA):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            estado = os.fstat(self._archivo.fileno())
+            if estado.st_size < CABECERA.size:
+                raise ValueError(f"{ruta} no es un archivo de telemetría")
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._archivo.close()
+            raise
+        self._inodo = estado.st_ino
+        firma, _version, tamano_registro, self.capacidad, _publicados, _inicio, self.pid, _estado = \
+            CABECERA.unpack_from(self._mapa, 0)
+        if (firma != FIRMA or tamano_registro != TAMANO_REGISTRO
+                or estado.st_size < CABECERA.size + self.capacidad * TAMANO_REGISTRO):
+            self.cerrar()
+            raise ValueError(f"{ruta} no es un archivo de telemetría")
+
+    @property
+    def publicados(self):
+        return SECUENCIA.unpack_from(self._mapa, POSICION_PUBLICADOS)[0]
+
+    @property
+    def activo(self):
+        return self._mapa[POSICION_ESTADO] == ACTIVO
+
+    @property
+    def sesion(self):
+        """
+        Hora de inicio de la sesión que escribe el archivo; cambia si el juego se reinicia.
+        """
+        return struct.unpack_from("<d", self._mapa, POSICION_INICIO)[0]
+
+    def reemplazado(self):
+        """
+        True si el juego creó otro archivo en la misma ruta (hay que abrir un lector nuevo).
+        """
+        try:
+            return os.stat(self.ruta).st_ino != self._inodo
+        except OSError:
+            return True
+
+    def leer(self, secuencia):
+        """
+        Registro con el número de secuencia indicado (0 = primer frame), o
+        None si aún no se publicó, ya se sobrescribió o se estaba escribiendo.
+        """
+        posicion = CABECERA.size + (secuencia % self.capacidad) * TAMANO_REGISTRO
+        esperado = 2 * secuencia + 2
+        if SECUENCIA.unpack_from(self._mapa, posicion)[0] != esperado:
+            return None
+        datos = DATOS.unpack_from(self._mapa, posicion + SECUENCIA.size)
+        if SECUENCIA.unpack_from(self._mapa, posicion)[0] != esperado:
+            return None
+        tiempo, puntaje, nivel, banderas, tiempo_en_objetivo, tiempo_objetivo, distancia, tolerancia, frame_ms = datos
+        return Telemetria(secuencia, tiempo, puntaje, nivel, bool(banderas & BOTON), bool(banderas & EN_OBJETIVO),
+                          tiempo_en_objetivo, tiempo_objetivo, distancia, tolerancia, frame_ms)
+
+    def ultimo(self):
+        """
+        Último frame publicado, o None si todavía no hay ninguno.
+        """
+        for _ in range(3):
+            publicados = self.publicados
+            if publicados == 0:
+                return None
+            registro = self.leer(publicados - 1)
+            if registro is not None:
+                return registro
+        return None
+
+    def desde(self, secuencia):
+        """
+        Frames publicados a partir de `secuencia`. Devuelve (registros,
+        perdidos, siguiente): perdidos cuenta los que el anillo ya sobrescribió
+        y siguiente es la secuencia a pedir en la próxima consulta.
+        """
+        publicados = self.publicados
+        primero = max(secuencia, publicados - self.capacidad)
+        perdidos = primero - secuencia if publicados > secuencia else 0
+        registros = []
+        for n in range(primero, publicados):
+            registro = self.leer(n)
+            if registro is None:
+                perdidos += 1
+            else:
+                registros.append(registro)
+        return registros, perdidos, max(secuencia, publicados)
+
+    def cerrar(self):
+        self._mapa.close()
+        self._archivo.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monitor de la telemetría en vivo del juego.")
+    parser.add_argument("ruta", nargs="?", default=RUTA_PREDETERMINADA)
+    parser.add_argument("--intervalo", type=float, default=0.25, help="segundos entre consultas")
+    parser.add_argument("--todos", action="store_true", help="escribe cada frame como una línea JSON")
+    args = parser.parse_args()
+
+    lector = None
+    sesion = None
+    siguiente = 0
+    avisado = False
+    try:
+        while True:
+            if lector is None or lector.reemplazado():
+                if lector is not None:
+                    lector.cerrar()
+                    lector = None
+                try:
+                    lector = LectorTelemetria(args.ruta)
+                except (OSError, ValueError):
+                    if not avisado:
+                        print(f"Esperando telemetría en {args.ruta}...", file=sys.stderr)
+                        avisado = True
+                    time.sleep(1.0)
+                    continue
+            if lector.sesion != sesion:
+                sesion = lector.sesion
+                siguiente = lector.publicados
+                avisado = False
+            if not lector.activo:
+                if not avisado:
+                    print("\nEl juego cerró la telemetría; esperando la próxima sesión.", file=sys.stderr)
+                    avisado = True
+                time.sleep(1.0)
+                continue
+
+            if args.todos:
+                registros, perdidos, siguiente = lector.desde(siguiente)
+                for registro in registros:
+                    print(json.dumps(registro._asdict()))
+                if perdidos:
+                    print(f"{perdidos} frames perdidos (aumente la frecuencia de consulta)", file=sys.stderr)
+                sys.stdout.flush()
+            else:
+                registro = lector.ultimo()
+                if registro is not None:
+                    print(f"\rNivel {registro.nivel:3d}  puntaje {registro.puntaje:6d}  "
+                          f"objetivo {registro.tiempo_en_objetivo:5.2f}/{registro.tiempo_objetivo:4.2f} s  "
+                          f"distancia {registro.distancia:6.1f}/{registro.tolerancia:4.1f}  "
+                          f"{'EN OBJETIVO' if registro.en_objetivo else '           '}  "
+                          f"frame {registro.frame_ms:5.1f} ms", end="", flush=True)
+            time.sleep(args.intervalo)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        if lector is not None:
+            lector.cerrar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pytest
+
+from aimtrainer import registrar_entrada_mouse
+from motor import Sesion, politica_perfecta
+
+
+def jugar_con_eventos(fps, niveles=5, max_segundos_nivel=30.0):
+    # Como el bucle de aimtrainer: un MOUSEMOTION por frame, sin marca de tiempo de SDL
+    sesion = Sesion(semilla=0, niveles_totales=niveles)
+    frame_ms = 1000.0 / fps
+    completados = []
+    while not sesion.terminada:
+        motor = sesion.iniciar_nivel()
+        inicio = 0.0
+        while not motor.completado and motor.tiempo_total < max_segundos_nivel:
+            dx, dy, boton = politica_perfecta(motor)
+            eventos = [pygame.event.Event(pygame.MOUSEMOTION, rel=(dx, dy))]
+            if boton and not motor._boton:
+                eventos.insert(0, pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1))
+            registrar_entrada_mouse(motor, eventos, inicio, inicio + frame_ms)
+            motor.avanzar(frame_ms / 1000.0, boton)
+            inicio += frame_ms
+        completados.append(motor.completado)
+        if motor.completado:
+            sesion.completar_nivel()
+        else:
+            sesion.saltar_nivel()
+    return completados
+
+
+@pytest.mark.parametrize("fps", [60, 240])
+def test_politica_perfecta_con_un_evento_por_frame(fps):
+    assert all(jugar_con_eventos(fps))
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from estadisticas import BocetoCuantiles, Welford
+from motor import PASO_SIMULACION, MotorNivel, Sesion
+from retroceso import PatronRetroceso
+
+
+def test_racha_que_completa_y_termina_en_el_mismo_paso_cuenta_una_vez():
+    sesion = Sesion(semilla=0, estadisticas=True)
+    patron = PatronRetroceso([0.0, 0.0], PASO_SIMULACION)
+    motor = sesion.registrar_motor(MotorNivel(10.0, 0.0, 0.0, 0.0, 0.01, random.Random(0), patron=patron))
+    # Dentro hasta completar el nivel, fuera y de vuelta antes del final del paso
+    motor.registrar_boton(0.0, True)
+    motor.registrar_movimiento(0.6, 0, 0)
+    motor.registrar_movimiento(0.7, 100, 0)
+    motor.registrar_movimiento(0.9, -100, 0)
+    assert motor.avanzar(PASO_SIMULACION, True)
+    assert motor.racha_abierta < motor.tiempo_en_objetivo
+    sesion.completar_nivel()
+
+    estadisticas = sesion.estadisticas
+    assert estadisticas.rachas.n == 2
+    assert estadisticas.rachas.suma == pytest.approx(estadisticas.tiempo_en_objetivo)
+
+
+def test_boceto_cuantiles_con_error_acotado():
+    rng = random.Random(0)
+    valores = sorted(rng.expovariate(2.0) for _ in range(10000))
+    boceto = BocetoCuantiles()
+    for valor in valores:
+        boceto.agregar(valor)
+    for q in (0.1, 0.5, 0.9, 0.99):
+        exacto = valores[int(q * (len(valores) - 1))]
+        assert boceto.cuantil(q) == pytest.approx(exacto, rel=2.5 * boceto.error)
+    assert boceto.media == pytest.approx(sum(valores) / len(valores))
+
+
+def test_bocetos_combinados_igual_que_uno_solo():
+    rng = random.Random(1)
+    valores = [rng.uniform(0.01, 3.0) for _ in range(2000)]
+    todos, a, b = BocetoCuantiles(), BocetoCuantiles(), BocetoCuantiles()
+    for i, valor in enumerate(valores):
+        todos.agregar(valor)
+        (a if i % 2 else b).agregar(valor)
+    a.combinar(BocetoCuantiles.desde_dict(b.a_dict()))
+    assert list(a.conteos) == list(todos.conteos)
+    assert (a.n, a.menor, a.mayor) == (todos.n, todos.menor, todos.mayor)
+    with pytest.raises(ValueError):
+        a.combinar(BocetoCuantiles(error=0.05))
+
+
+def test_welford_combinado():
+    rng = random.Random(2)
+    valores = [rng.gauss(5.0, 2.0) for _ in range(1000)]
+    a, b = Welford(), Welford()
+    for valor in valores[:300]:
+        a.agregar(valor)
+    for valor in valores[300:]:
+        b.agregar(valor)
+    a.combinar(Welford.desde_lista(b.a_lista()))
+    media = sum(valores) / len(valores)
+    varianza = sum((v - media) ** 2 for v in valores) / (len(valores) - 1)
+    assert a.n == len(valores)
+    assert a.media == pytest.approx(media)
+    assert a.varianza == pytest.approx(varianza)
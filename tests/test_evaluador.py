@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+from evaluador import combinar_resultados, evaluar, tabla_parametros, trazas_sinteticas
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def assert_iguales(a, b):
+    assert a.keys() == b.keys()
+    for clave in a:
+        np.testing.assert_array_equal(a[clave], b[clave])
+
+
+def test_mismo_resultado_en_serie_y_con_procesos():
+    parametros = tabla_parametros(20)
+    trazas = trazas_sinteticas(10, 180, parametros, semilla=7)
+    serie = evaluar(trazas, parametros, semilla=7, bloque=3)
+    assert_iguales(serie, evaluar(trazas, parametros, semilla=7, bloque=3, procesos=2))
+    # Ni el tamaño de bloque ni partir las sesiones entre llamadas cambian el resultado
+    assert_iguales(serie, evaluar(trazas, parametros, semilla=7, bloque=16))
+    assert_iguales(serie, combinar_resultados([
+        evaluar(trazas[:4], parametros, semilla=7, bloque=3),
+        evaluar(trazas[4:], parametros, semilla=7, bloque=3, primera_sesion=4),
+    ]))
+    assert serie["tasa_aprobacion"][0] > serie["tasa_aprobacion"][-1]
+
+
+def test_cli_en_serie_y_con_procesos():
+    def ejecutar(*extra):
+        salida = subprocess.run(
+            [sys.executable, "evaluador.py", "--sintetico", "8", "--segundos", "2", "--niveles", "10",
+             "--bloque", "3", "--semilla", "5", *extra],
+            cwd=RAIZ, capture_output=True, text=True, check=True).stdout
+        # La última línea lleva el tiempo transcurrido
+        return salida.splitlines()[:-1]
+
+    serie = ejecutar()
+    assert serie and serie == ejecutar("--procesos", "2")
@@ -0,0 +1,86 @@
+import pytest
+
+from grabacion import REGISTRO, GrabadorSesion, ReproductorSesion
+
+
+def grabar(ruta, frames, registros_por_bloque=7):
+    grabador = GrabadorSesion(ruta, niveles_totales=100, diametro_inicial=80, registros_por_bloque=registros_por_bloque)
+    for i in range(frames):
+        grabador.registrar(i % 5 - 2, -(i % 3), 0.5 * i, -0.25 * i, 1 + i // 20, i % 2 == 0, i % 4 == 0)
+    grabador.cerrar()
+    return grabador
+
+
+def test_ida_y_vuelta(tmp_path):
+    ruta = str(tmp_path / "sesion.aimrec")
+    grabador = grabar(ruta, 50)
+    assert grabador.registros == 50
+
+    reproductor = ReproductorSesion(ruta)
+    try:
+        assert len(reproductor) == 50
+        assert (reproductor.niveles_totales, reproductor.diametro_inicial) == (100, 80)
+        for i in range(50):
+            registro = reproductor[i]
+            assert (registro.dx, registro.dy) == (i % 5 - 2, -(i % 3))
+            assert (registro.retroceso_x, registro.retroceso_y) == (0.5 * i, -0.25 * i)
+            assert registro.nivel == 1 + i // 20
+            assert (registro.boton, registro.en_objetivo) == (i % 2 == 0, i % 4 == 0)
+        tiempos = [reproductor.tiempo(i) for i in range(50)]
+        assert tiempos == sorted(tiempos)
+        assert reproductor[-1] == reproductor[49]
+        with pytest.raises(IndexError):
+            reproductor[50]
+
+        assert reproductor.inicios_nivel == {1: 0, 2: 20, 3: 40}
+        assert reproductor.inicio_de_nivel(33) == 20
+        assert reproductor.compensacion(22) == (sum(i % 5 - 2 for i in range(20, 23)),
+                                                 sum(-(i % 3) for i in range(20, 23)))
+    finally:
+        reproductor.cerrar()
+
+
+def test_buscar(tmp_path):
+    ruta = str(tmp_path / "sesion.aimrec")
+    grabar(ruta, 30)
+    reproductor = ReproductorSesion(ruta)
+    try:
+        for i in range(30):
+            indice = reproductor.buscar(reproductor.tiempo(i))
+            assert reproductor.tiempo(indice) == reproductor.tiempo(i)
+            assert indice >= i
+        assert reproductor.buscar(-1.0) == 0
+        assert reproductor.buscar(reproductor.duracion + 1.0) == 29
+    finally:
+        reproductor.cerrar()
+
+
+def test_movimiento_limitado_a_int16(tmp_path):
+    ruta = str(tmp_path / "sesion.aimrec")
+    grabador = GrabadorSesion(ruta, 10)
+    grabador.registrar(100000, -100000, 0.0, 0.0, 1, False, False)
+    grabador.cerrar()
+    reproductor = ReproductorSesion(ruta)
+    try:
+        assert (reproductor[0].dx, reproductor[0].dy) == (32767, -32768)
+    finally:
+        reproductor.cerrar()
+
+
+def test_grabacion_cortada_ignora_el_registro_incompleto(tmp_path):
+    ruta = tmp_path / "sesion.aimrec"
+    grabar(str(ruta), 10)
+    with open(ruta, "ab") as f:
+        f.write(bytes(REGISTRO.size // 2))
+    reproductor = ReproductorSesion(str(ruta))
+    try:
+        assert len(reproductor) == 10
+    finally:
+        reproductor.cerrar()
+
+
+def test_rechaza_otro_archivo(tmp_path):
+    ruta = tmp_path / "otro.aimrec"
+    ruta.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError):
+        ReproductorSesion(str(ruta))
@@ -0,0 +1,65 @@
+import os
+import random
+
+from indice_imagenes import IndiceImagenes, ListaRutas
+
+
+def test_descartar_por_posicion_mantiene_la_lista():
+    rng = random.Random(0)
+    esperadas = [os.path.join("sub", f"imagen_{i}.png") for i in range(200)]
+    lista = ListaRutas(esperadas, raiz="raiz")
+    esperadas = [os.path.join("raiz", ruta) for ruta in esperadas]
+    while esperadas:
+        indice = rng.randrange(len(lista))
+        ruta = lista[indice]
+        assert lista.descartar(indice, ruta)
+        esperadas.remove(ruta)
+        # Una lectura anterior al descarte ya no coincide con la posición
+        assert not lista.descartar(indice, ruta)
+        assert sorted(lista) == sorted(esperadas)
+        assert len(lista) == len(esperadas)
+    assert not lista.descartar(0, "raiz/x.png")
+
+
+def tocar(ruta, segundos):
+    os.utime(ruta, ns=(segundos * 10 ** 9, segundos * 10 ** 9))
+
+
+def crear_arbol(raiz):
+    for sub in ("a", "b", os.path.join("b", "c")):
+        os.makedirs(raiz / sub)
+    for ruta in ("uno.png", os.path.join("a", "dos.jpg"), os.path.join("b", "c", "tres.gif"), "notas.txt"):
+        (raiz / ruta).write_bytes(b"x")
+    for directorio in ("", "a", "b", os.path.join("b", "c")):
+        tocar(raiz / directorio, 1000)
+
+
+def test_indice_solo_relee_directorios_cambiados(tmp_path):
+    raiz = tmp_path / "imagenes"
+    crear_arbol(raiz)
+    archivo = str(tmp_path / "indice.json")
+
+    indice = IndiceImagenes(str(raiz), archivo)
+    candidatas = indice.actualizar()
+    assert sorted(os.path.relpath(ruta, raiz) for ruta in candidatas) == sorted(
+        ["uno.png", os.path.join("a", "dos.jpg"), os.path.join("b", "c", "tres.gif")])
+    assert (indice.escaneados, indice.reutilizados) == (4, 0)
+
+    indice = IndiceImagenes(str(raiz), archivo)
+    assert len(indice.actualizar()) == 3
+    assert (indice.escaneados, indice.reutilizados) == (0, 4)
+
+    (raiz / "a" / "cuatro.png").write_bytes(b"x")
+    tocar(raiz / "a", 2000)
+    indice = IndiceImagenes(str(raiz), archivo)
+    assert len(indice.actualizar()) == 4
+    assert (indice.escaneados, indice.reutilizados) == (1, 3)
+
+    # Quitar un subdirectorio cambia el mtime del padre y saca sus imágenes
+    os.remove(raiz / "b" / "c" / "tres.gif")
+    os.rmdir(raiz / "b" / "c")
+    tocar(raiz / "b", 3000)
+    indice = IndiceImagenes(str(raiz), archivo)
+    assert len(indice.actualizar()) == 3
+    assert (indice.escaneados, indice.reutilizados) == (1, 2)
+    assert sorted(indice.directorios) == ["", "a", "b"]
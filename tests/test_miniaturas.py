@@ -0,0 +1,31 @@
+import pygame
+
+from miniaturas import CacheMiniaturas
+
+
+def tamano_en_disco(cache):
+    return sum(tamano for _ruta, tamano, _mtime in cache._entradas())
+
+
+def test_sobrescribir_una_entrada_no_cuenta_dos_veces(tmp_path):
+    cache = CacheMiniaturas(str(tmp_path / "cache"))
+    archivo = str(tmp_path / "cache" / "ab" / "entrada")
+    imagen = pygame.Surface((64, 48))
+    imagen.fill((200, 30, 30))
+    cache._guardar(imagen, archivo)
+    for _ in range(3):
+        cache._guardar(imagen, archivo)
+    assert cache._total == tamano_en_disco(cache)
+
+    otra = pygame.Surface((32, 32))
+    cache._guardar(otra, archivo)
+    assert cache._total == tamano_en_disco(cache)
+
+
+def test_obtener_usa_la_cache(tmp_path):
+    ruta = str(tmp_path / "imagen.png")
+    pygame.image.save(pygame.Surface((200, 100)), ruta)
+    cache = CacheMiniaturas(str(tmp_path / "cache"))
+    assert cache.obtener(ruta, 100, 100).get_size() == (100, 50)
+    assert cache.obtener(ruta, 100, 100).get_size() == (100, 50)
+    assert (cache.fallos, cache.aciertos) == (1, 1)
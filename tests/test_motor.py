@@ -0,0 +1,30 @@
+from motor import PASO_SIMULACION, crear_politica_humana, ejecutar_sesion, politica_perfecta
+
+
+def test_politica_perfecta_completa_todos_los_niveles():
+    sesion, resultados = ejecutar_sesion(politica_perfecta, semilla=0, niveles_totales=10)
+    assert [completado for _, completado, _ in resultados] == [True] * 10
+    assert sesion.terminada
+    assert sesion.puntaje > 0
+
+
+def test_misma_semilla_misma_sesion():
+    a = ejecutar_sesion(crear_politica_humana(1), semilla=3, niveles_totales=5, max_segundos_nivel=5.0)
+    b = ejecutar_sesion(crear_politica_humana(1), semilla=3, niveles_totales=5, max_segundos_nivel=5.0)
+    assert a[1] == b[1]
+    assert a[0].puntaje == b[0].puntaje
+
+
+def test_el_resultado_no_depende_de_los_fps():
+    _, a = ejecutar_sesion(politica_perfecta, semilla=0, niveles_totales=5)
+    _, b = ejecutar_sesion(politica_perfecta, semilla=0, niveles_totales=5, dt=PASO_SIMULACION / 4)
+    assert [completado for _, completado, _ in a] == [completado for _, completado, _ in b]
+
+
+def test_estadisticas_de_la_sesion():
+    sesion, resultados = ejecutar_sesion(politica_perfecta, semilla=0, niveles_totales=5, estadisticas=True)
+    resumen = sesion.estadisticas.resumen()
+    assert len(sesion.estadisticas_niveles) == 5
+    assert resumen["segundos"] > 0
+    assert 0.0 < resumen["en_objetivo"] <= 1.0
+    assert resumen["rachas"] >= 5
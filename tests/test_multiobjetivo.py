@@ -0,0 +1,79 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from motor import PASO_SIMULACION, Sesion
+from multiobjetivo import MotorMultiobjetivo, RejillaEspacial, iniciar_nivel_multiobjetivo
+from retroceso import PatronRetroceso
+
+
+@pytest.mark.parametrize("celda", [16.0, 40.0, 900.0])
+def test_rejilla_igual_que_fuerza_bruta(celda):
+    generador = np.random.default_rng(0)
+    posiciones = generador.uniform((0.0, 0.0), (800.0, 600.0), size=(500, 2))
+    radio = 16.0
+    rejilla = RejillaEspacial(800, 600, celda)
+    rejilla.reconstruir(posiciones)
+    for x, y in generador.uniform((-50.0, -50.0), (850.0, 650.0), size=(300, 2)):
+        candidatos = rejilla.candidatos(x, y)
+        cerca = candidatos[np.hypot(posiciones[candidatos, 0] - x, posiciones[candidatos, 1] - y) <= radio]
+        esperado = np.flatnonzero(np.hypot(posiciones[:, 0] - x, posiciones[:, 1] - y) <= radio)
+        assert sorted(cerca.tolist()) == esperado.tolist()
+
+
+def seguir_objetivo(motor):
+    # Apunta al objetivo más cercano donde estará al final del próximo paso
+    if motor.indice_objetivo < 0:
+        x, y = motor.mira()
+        motor.indice_objetivo = int(np.argmin(np.hypot(motor.posiciones[:, 0] - x, motor.posiciones[:, 1] - y)))
+    i = motor.indice_objetivo
+    destino = 2 * motor.posiciones[i] - motor.posiciones_anteriores[i]
+    retroceso_x, retroceso_y = motor.retroceso_siguiente()
+    return (destino[0] - motor.centro[0] - motor.compensacion[0] - retroceso_x,
+            destino[1] - motor.centro[1] - motor.compensacion[1] - retroceso_y)
+
+
+def jugar(tipo, max_segundos=30.0):
+    sesion = Sesion(semilla=0, niveles_totales=10)
+    motor = iniciar_nivel_multiobjetivo(sesion, 30, tipo=tipo)
+    boton = False
+    while not motor.completado and motor.tiempo_total < max_segundos:
+        dx, dy = seguir_objetivo(motor)
+        # En modo rápido cada acierto necesita un nuevo clic
+        boton = not boton if tipo == "rapido" else True
+        motor.mover(dx, dy)
+        motor.avanzar(motor.paso, boton)
+    return motor
+
+
+def test_seguimiento_completa_el_nivel():
+    motor = jugar("seguimiento")
+    assert motor.completado
+    assert motor.tiempo_total < 2 * motor.tiempo_objetivo
+
+
+def test_rapido_completa_el_nivel():
+    motor = jugar("rapido")
+    assert motor.completado
+    assert motor.aciertos == motor.aciertos_objetivo
+
+
+def test_tiempo_exacto_sobre_un_objetivo_en_movimiento():
+    sesion = Sesion(semilla=0, estadisticas=True)
+    motor = sesion.registrar_motor(MotorMultiobjetivo(
+        10.0, 0.0, 0.0, 0.0, 10.0, random.Random(0), cantidad=1, patrones=("lineal",),
+        patron=PatronRetroceso([0.0, 0.0], PASO_SIMULACION)))
+    # El objetivo cruza la mira quieta a 100 unidades/s, a 6 unidades de su centro
+    motor.anclas[0] = (motor.centro[0] - 100.0, motor.centro[1] + 6.0)
+    motor.velocidades[0] = (100.0, 0.0)
+    motor._mover(avanzar=False)
+    motor.posiciones_anteriores[:] = motor.posiciones
+    for _ in range(120):
+        motor.avanzar(PASO_SIMULACION, True)
+
+    cuerda = 2 * math.sqrt(motor.radio ** 2 - 6.0 ** 2)
+    estadisticas = motor.estadisticas
+    assert estadisticas.tiempo_en_objetivo == pytest.approx(cuerda / 100.0)
+    assert estadisticas.rachas.n == 1
@@ -0,0 +1,78 @@
+import time
+
+import pygame
+
+from indice_imagenes import ListaRutas
+from precarga import PrecargadorImagenes
+
+ROJO = (200, 0, 0)
+AZUL = (0, 0, 200)
+
+
+def crear_imagenes(directorio, color, cantidad):
+    rutas = []
+    for i in range(cantidad):
+        imagen = pygame.Surface((40, 30))
+        imagen.fill(color)
+        ruta = str(directorio / f"{color[0]}_{i}.png")
+        pygame.image.save(imagen, ruta)
+        rutas.append(ruta)
+    return rutas
+
+
+def esperar(condicion, limite=5.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "tiempo de espera agotado"
+        time.sleep(0.01)
+
+
+def test_cambiar_de_lista_descarta_lo_precargado(tmp_path):
+    rojas = crear_imagenes(tmp_path, ROJO, 3)
+    azules = crear_imagenes(tmp_path, AZUL, 3)
+    precargador = PrecargadorImagenes(80, 60, capacidad=2, hilos=2, semilla=0)
+    try:
+        precargador.establecer_imagenes(rojas)
+        # Cola llena de imágenes de la lista anterior antes de cambiarla
+        esperar(lambda: precargador._cola.full())
+        precargador.establecer_imagenes(azules)
+        for _ in range(6):
+            resultado = None
+
+            def lista():
+                nonlocal resultado
+                resultado = precargador.obtener()
+                return resultado is not None
+
+            esperar(lista)
+            imagen, posicion = resultado
+            assert imagen.get_at((0, 0))[:3] == AZUL
+            assert imagen.get_size() == (80, 60)
+            assert posicion == (0, 0)
+    finally:
+        precargador.detener()
+
+
+def test_generacion_anterior_no_se_entrega(tmp_path):
+    precargador = PrecargadorImagenes(80, 60, hilos=1)
+    try:
+        vieja = pygame.Surface((8, 8))
+        precargador._cola.put((precargador._generacion, vieja, (0, 0)))
+        precargador._generacion += 1
+        assert precargador.obtener() is None
+    finally:
+        precargador.detener()
+
+
+def test_imagen_ilegible_se_descarta_de_las_candidatas(tmp_path):
+    buenas = crear_imagenes(tmp_path, ROJO, 2)
+    rota = tmp_path / "rota.png"
+    rota.write_bytes(b"no es una imagen")
+    candidatas = ListaRutas([buenas[0], str(rota), buenas[1]])
+    precargador = PrecargadorImagenes(80, 60, capacidad=1, hilos=2, semilla=0)
+    try:
+        precargador.establecer_imagenes(candidatas)
+        esperar(lambda: len(candidatas) == 2)
+        assert sorted(candidatas) == sorted(buenas)
+    finally:
+        precargador.detener()
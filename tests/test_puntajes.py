@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from puntajes import TablaPuntajes, compactar_puntajes, guardar_fusionado, leer_puntajes, ruta_diario
+
+
+def test_posiciones_con_empates():
+    tabla = TablaPuntajes(limite=2)
+    for usuario, puntaje in [("ana", 50), ("beto", 80), ("caro", 50), ("dani", 10)]:
+        tabla.actualizar(usuario, puntaje)
+    assert len(tabla) == 4
+    assert tabla.mejores() == [("beto", 80), ("ana", 50)]
+    assert [tabla.posicion(u) for u in ("beto", "ana", "caro", "dani")] == [1, 2, 2, 4]
+
+    tabla.actualizar("dani", 5000)
+    assert tabla.posicion("dani") == 1
+    assert tabla.posicion("beto") == 2
+    assert tabla.mejores() == [("dani", 5000), ("beto", 80)]
+
+
+def test_tabla_desde_archivo(tmp_path):
+    ruta = str(tmp_path / "score.json")
+    with open(ruta, "w") as f:
+        json.dump({f"u{i}": i for i in range(100)}, f)
+    tabla = TablaPuntajes.desde_archivo(ruta, limite=3, seguidos=["u10"])
+    assert len(tabla) == 100
+    assert tabla.mejores() == [("u99", 99), ("u98", 98), ("u97", 97)]
+    assert tabla.posicion("u10") == 90
+
+    tabla.actualizar("u10", 200)
+    assert tabla.posicion("u10") == 1
+    assert len(tabla) == 100
+    with pytest.raises(KeyError):
+        tabla.actualizar("u20", 300)
+    with pytest.raises(KeyError):
+        TablaPuntajes.desde_archivo(ruta).actualizar("u5", 6)
+
+
+def test_diario_conserva_el_mejor_puntaje(tmp_path):
+    ruta = str(tmp_path / "score.json")
+    guardar_fusionado({"ana": 10, "beto": 20}, ruta)
+    guardar_fusionado({"ana": 30}, ruta)
+    guardar_fusionado({"beto": 5}, ruta)
+    assert leer_puntajes(ruta) == {"ana": 30, "beto": 20}
+
+    compactar_puntajes(ruta)
+    assert not (tmp_path / ruta_diario(ruta)).exists()
+    with open(ruta) as f:
+        assert json.load(f) == {"ana": 30, "beto": 20}
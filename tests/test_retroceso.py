@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from retroceso import BibliotecaPatrones, generar_patron, guardar_biblioteca, leer_csv
+
+
+def test_biblioteca_conserva_los_patrones(tmp_path):
+    rng = random.Random(0)
+    patrones = [generar_patron(-1.0, -1.0, 1.0, rng, 2.0, 1 / 60, nombre=f"p{i}", duracion=1.0) for i in range(3)]
+    ruta = str(tmp_path / "patrones.aimpat")
+    guardar_biblioteca(ruta, patrones)
+
+    biblioteca = BibliotecaPatrones(ruta)
+    try:
+        assert len(biblioteca) == 3
+        assert biblioteca.nombres() == ["p0", "p1", "p2"]
+        for original in patrones:
+            leido = biblioteca.patron(original.nombre)
+            assert leido.cantidad == original.cantidad
+            assert leido.intervalo == pytest.approx(original.intervalo)
+            assert list(leido.muestras) == pytest.approx(list(original.muestras))
+        assert biblioteca.para_nivel(4) is biblioteca.patron(0)
+    finally:
+        biblioteca.cerrar()
+
+
+def test_nombre_largo_se_recorta_sin_partir_caracteres(tmp_path):
+    nombre = "ráfaga larga con retroceso en ñandú"
+    assert len(nombre.encode("utf-8")) > 32
+    ruta = str(tmp_path / "patrones.aimpat")
+    guardar_biblioteca(ruta, [generar_patron(-1.0, -1.0, 1.0, random.Random(0), 2.0, 1 / 60, nombre=nombre,
+                                             duracion=0.5)])
+    biblioteca = BibliotecaPatrones(ruta)
+    try:
+        recortado = biblioteca.nombres()[0]
+        assert nombre.startswith(recortado)
+        assert len(recortado.encode("utf-8")) <= 32
+        assert biblioteca.patron(recortado).cantidad == 30
+    finally:
+        biblioteca.cerrar()
+
+
+def test_biblioteca_rechaza_otro_archivo(tmp_path):
+    ruta = tmp_path / "otro.aimpat"
+    ruta.write_bytes(b"no es una biblioteca de patrones")
+    with pytest.raises(ValueError):
+        BibliotecaPatrones(str(ruta))
+
+
+def test_patron_generado_sigue_sin_repetirse():
+    patron = generar_patron(-1.0, -1.0, 1.0, random.Random(0), 2.0, 1 / 60, duracion=1.0)
+    primero = [patron.muestra(k / 60) for k in range(1, 61)]
+    segundo = [patron.muestra(k / 60) for k in range(61, 121)]
+    assert patron.cantidad == 120
+    assert segundo[-1][1] == pytest.approx(2 * primero[-1][1])
+    saltos = [b[0] - a[0] for a, b in zip(primero, primero[1:])]
+    assert saltos != [b[0] - a[0] for a, b in zip(segundo, segundo[1:])]
+
+
+def test_csv_empieza_en_el_origen(tmp_path):
+    ruta = tmp_path / "ak47.csv"
+    ruta.write_text("x,y\n5,5\n6,3\n8,0\n")
+    patron = leer_csv(str(ruta), 0.1)
+    assert patron.nombre == "ak47"
+    assert list(patron.muestras) == [1.0, -2.0, 3.0, -5.0]
+    assert patron.muestra(0.0) == (0.0, 0.0)
+    assert patron.muestra(0.05) == pytest.approx((0.5, -1.0))
+
+
+@pytest.mark.parametrize("contenido", ["x,y\n5,5\n", "x,y\n5,5\n6,3\n7,abc\n", ""])
+def test_csv_invalido(tmp_path, contenido):
+    ruta = tmp_path / "malo.csv"
+    ruta.write_text(contenido)
+    with pytest.raises(ValueError):
+        leer_csv(str(ruta), 0.1)
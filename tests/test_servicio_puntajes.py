@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+
+from puntajes import leer_puntajes
+from servicio_puntajes import ClientePuntajes, ServicioPuntajes, _linea
+
+
+async def esperar(condicion, limite=5.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        assert time.monotonic() < fin, "tiempo de espera agotado"
+        await asyncio.sleep(0.02)
+
+
+def crear_servicio(tmp_path, nombre="score_global.json", **opciones):
+    return ServicioPuntajes(str(tmp_path / nombre), str(tmp_path / "sesiones_global.jsonl"),
+                            intervalo_lote=0.05, **opciones)
+
+
+def test_dos_estaciones_comparten_la_clasificacion(tmp_path):
+    async def probar():
+        servicio = crear_servicio(tmp_path, intervalo_instantanea=0.1)
+        puerto = await servicio.iniciar("127.0.0.1", 0)
+        ana = ClientePuntajes(f"127.0.0.1:{puerto}", "ana", reintento=0.1)
+        beto = ClientePuntajes(f"127.0.0.1:{puerto}", "beto", reintento=0.1)
+        try:
+            await esperar(lambda: ana.conectado and beto.conectado)
+            ana.actualizar("ana", 120)
+            beto.actualizar("beto", 80)
+            beto.enviar_resumen({"puntaje": 80, "niveles": 3})
+            await esperar(lambda: len(ana.clasificacion()[0]) == 2 and len(beto.clasificacion()[0]) == 2)
+            assert ana.clasificacion() == ([("ana", 120), ("beto", 80)], (1, 2))
+            assert beto.clasificacion() == ([("ana", 120), ("beto", 80)], (2, 2))
+
+            # La instantánea periódica escribe la tabla global sin esperar al cierre
+            await esperar(lambda: servicio.instantaneas > 0 and not servicio._resumenes)
+            assert leer_puntajes(servicio.ruta) == {"ana": 120, "beto": 80}
+        finally:
+            ana.detener()
+            beto.detener()
+            await servicio.cerrar()
+        with open(servicio.ruta_resumenes, encoding="utf-8") as f:
+            resumenes = [json.loads(linea) for linea in f]
+        assert [(r["usuario"], r["puntaje"], r["niveles"]) for r in resumenes] == [("beto", 80, 3)]
+
+    asyncio.run(probar())
+
+
+def test_lote_envia_solo_los_cambios_de_los_mejores(tmp_path):
+    async def probar():
+        servicio = crear_servicio(tmp_path, limite=2, intervalo_instantanea=60.0)
+        puerto = await servicio.iniciar("127.0.0.1", 0)
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        try:
+            escritor.write(_linea({"tipo": "hola", "usuario": "caro"}))
+            tabla = json.loads(await lector.readline())
+            assert tabla == {"tipo": "tabla", "mejores": [], "total": 0, "posicion": None}
+
+            # Varias actualizaciones dentro de un lote producen un solo mensaje
+            for usuario, puntaje in [("ana", 10), ("beto", 20), ("ana", 30), ("ana", 5)]:
+                escritor.write(_linea({"tipo": "puntaje", "usuario": usuario, "puntaje": puntaje}))
+            await escritor.drain()
+            delta = json.loads(await asyncio.wait_for(lector.readline(), 5.0))
+            assert delta == {"tipo": "delta", "cambios": [["ana", 30], ["beto", 20]], "salen": [],
+                             "total": 2, "posicion": None}
+            assert servicio.lotes == 1
+
+            escritor.write(_linea({"tipo": "puntaje", "usuario": "caro", "puntaje": 25}))
+            await escritor.drain()
+            delta = json.loads(await asyncio.wait_for(lector.readline(), 5.0))
+            assert delta == {"tipo": "delta", "cambios": [["caro", 25]], "salen": ["beto"],
+                             "total": 3, "posicion": 2}
+        finally:
+            escritor.close()
+            await servicio.cerrar()
+        assert leer_puntajes(servicio.ruta) == {"ana": 30, "beto": 20, "caro": 25}
+
+    asyncio.run(probar())
+
+
+def test_cliente_reenvia_al_reconectar(tmp_path):
+    async def probar():
+        servicio = crear_servicio(tmp_path, "primero.json", intervalo_instantanea=60.0)
+        puerto = await servicio.iniciar("127.0.0.1", 0)
+        cliente = ClientePuntajes(f"127.0.0.1:{puerto}", "ana", reintento=0.1)
+        try:
+            await esperar(lambda: cliente.conectado)
+            cliente.actualizar("ana", 70)
+            await esperar(lambda: servicio.puntajes.get("ana") == 70)
+            await servicio.cerrar()
+            await esperar(lambda: not cliente.conectado)
+
+            # Un servicio nuevo (sin la tabla anterior) recibe de nuevo el récord
+            servicio = crear_servicio(tmp_path, "segundo.json", intervalo_instantanea=60.0)
+            await servicio.iniciar("127.0.0.1", puerto)
+            await esperar(lambda: cliente.conectado and servicio.puntajes.get("ana") == 70)
+            await esperar(lambda: cliente.clasificacion() == ([("ana", 70)], (1, 1)))
+        finally:
+            cliente.detener()
+            await servicio.cerrar()
+
+    asyncio.run(probar())
@@ -0,0 +1,40 @@
+from telemetria import LectorTelemetria, PublicadorTelemetria
+
+
+def publicar(publicador, n):
+    for i in range(n):
+        publicador.publicar(1, i, 0.1 * i, 2.0, 3.0, 10.0, 16.7, i % 2 == 0, True)
+
+
+def test_lector_recibe_lo_publicado(tmp_path):
+    ruta = str(tmp_path / "telemetria.bin")
+    publicador = PublicadorTelemetria(ruta, capacidad=8)
+    lector = LectorTelemetria(ruta)
+    try:
+        assert lector.ultimo() is None
+        publicar(publicador, 3)
+        registros, perdidos, siguiente = lector.desde(0)
+        assert [r.puntaje for r in registros] == [0, 1, 2]
+        assert [r.boton for r in registros] == [True, False, True]
+        assert (perdidos, siguiente) == (0, 3)
+        assert lector.ultimo().secuencia == 2
+        assert lector.activo
+    finally:
+        publicador.cerrar()
+    assert not lector.activo
+    lector.cerrar()
+
+
+def test_anillo_cuenta_los_perdidos(tmp_path):
+    ruta = str(tmp_path / "telemetria.bin")
+    publicador = PublicadorTelemetria(ruta, capacidad=8)
+    lector = LectorTelemetria(ruta)
+    try:
+        publicar(publicador, 20)
+        registros, perdidos, siguiente = lector.desde(0)
+        assert [r.secuencia for r in registros] == list(range(12, 20))
+        assert (perdidos, siguiente) == (12, 20)
+        assert lector.leer(3) is None
+    finally:
+        publicador.cerrar()
+        lector.cerrar()
@@ -0,0 +1,75 @@
+"""
+Copyright (c) 2025 Fernando Aberto Velasquez Aguilera.
+Licensed under the MIT License with Commons Clause.
+See the LICENSE file for details.
+"""
+
+import pygame
+
+
+# Espacio lógico del juego: el diseño original de 800x600. El objetivo, el
+# retroceso y el movimiento del mouse se miden en estas unidades (una unidad
+# es una cuenta del mouse), así que la dificultad no depende de la resolución.
+ANCHO_LOGICO = 800
+ALTO_LOGICO = 600
+
+
+class Vista:
+    """
+    Convierte coordenadas lógicas en píxeles de la superficie de dibujo.
+
+    El espacio lógico se escala de forma uniforme hasta llenar la superficie
+    y se centra en ella (con bandas a los lados si la proporción es distinta
+    de 4:3). Los tamaños de fuente, sprites y márgenes se escalan con el
+    mismo factor.
+    """
+
+    def __init__(self, ancho, alto, ancho_logico=ANCHO_LOGICO, alto_logico=ALTO_LOGICO):
+        self.ancho = ancho
+        self.alto = alto
+        self.ancho_logico = ancho_logico
+        self.alto_logico = alto_logico
+        self.factor = min(ancho / ancho_logico, alto / alto_logico)
+        self.origen_x = (ancho - ancho_logico * self.factor) / 2
+        self.origen_y = (alto - alto_logico * self.factor) / 2
+
+    @property
+    def tamano(self):
+        return self.ancho, self.alto
+
+    def x(self, x):
+        return int(round(self.origen_x + x * self.factor))
+
+    def y(self, y):
+        return int(round(self.origen_y + y * self.factor))
+
+    def punto(self, x, y):
+        """
+        Posición en píxeles de un punto lógico.
+        """
+        return self.x(x), self.y(y)
+
+    def longitud(self, longitud):
+        """
+        Longitud en píxeles (sin redondear) de una longitud lógica.
+        """
+        return longitud * self.factor
+
+    def rect(self, x, y, ancho, alto):
+        """
+        Rectángulo en píxeles de un rectángulo lógico.
+        """
+        izquierda, arriba = self.punto(x, y)
+        return pygame.Rect(izquierda, arriba, self.x(x + ancho) - izquierda, self.y(y + alto) - arriba)
+
+    def a_logico(self, pos):
+        """
+        Posición lógica de un punto en píxeles (p. ej. la del mouse).
+        """
+        return (pos[0] - self.origen_x) / self.factor, (pos[1] - self.origen_y) / self.factor
+
+    def fuente(self, tamano):
+        """
+        Tamaño de fuente en píxeles para un tamaño lógico.
+        """
+        return max(1, int(round(tamano * self.factor)))